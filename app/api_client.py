@@ -0,0 +1,157 @@
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+# API URL from environment variable
+API_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+
+# (connect, read) timeouts in seconds; analysis runs the model on CPU and needs longer
+DEFAULT_TIMEOUT = (5, 30)
+ANALYSIS_TIMEOUT = (5, 600)
+# Retries on connection errors and 502/503/504 (e.g. while the backend wakes up);
+# read timeouts only for idempotent methods
+RETRIES = 3
+BACKOFF = 0.5
+RETRY_STATUSES = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+
+class APIError(Exception):
+    """Backend request failed; the message is the backend's error detail when it sent one"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class APIClient:
+    """
+    Backend client with one pooled keep-alive session, so calls reuse TCP/TLS
+    connections instead of opening a new one per click. Pages get the shared
+    instance with `api_client = get_client()`.
+    """
+
+    def __init__(self, base_url: str = API_URL, retries: int = RETRIES, backoff: float = BACKOFF,
+                 pool_size: int = 10):
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, retry: Optional[bool] = None,
+                timeout: Tuple[float, float] = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying with exponential backoff. Non-idempotent
+        methods are only retried when `retry=True` is passed, and never after
+        a read timeout: the backend may still be working on the request.
+        """
+        method = method.upper()
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.session.request(method, f"{self.base_url}{path}", timeout=timeout, **kwargs)
+            except requests.ReadTimeout as e:
+                if last_attempt or method not in IDEMPOTENT_METHODS:
+                    raise APIError(f"The backend did not answer in time: {str(e)}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise APIError(f"Could not reach the backend: {str(e)}")
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    break
+            time.sleep(self.backoff * 2 ** attempt)
+
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise APIError(str(detail), status_code=response.status_code)
+        return response
+
+    def get(self, path: str, **kwargs) -> Dict:
+        return self.request("GET", path, **kwargs).json()
+
+    def post(self, path: str, **kwargs) -> Dict:
+        return self.request("POST", path, **kwargs).json()
+
+    def patch(self, path: str, **kwargs) -> Dict:
+        return self.request("PATCH", path, **kwargs).json()
+
+    def delete(self, path: str, **kwargs) -> Dict:
+        return self.request("DELETE", path, **kwargs).json()
+
+    def stream(self, method: str, path: str, **kwargs) -> Iterator[Dict]:
+        """Yield events of a newline-delimited JSON response as they arrive"""
+        response = self.request(method, path, stream=True, **kwargs)
+        with response:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def health(self) -> Dict:
+        return self.get("/health")
+
+    # Endpoints used by the pages
+
+    def analyze_resume(self, file: Any, job_description: Optional[str] = None) -> Dict:
+        """Send resume to backend for analysis"""
+        # Send the bytes, not the file object, so a retry re-sends the whole file
+        files = {"file": (file.name, file.getvalue(), file.type)}
+        data = {"job_description": job_description} if job_description else {}
+        return self.post("/analyze-resume", files=files, data=data, retry=True, timeout=ANALYSIS_TIMEOUT)
+
+    def analyze_resume_stream(self, file_name: str, file_bytes: bytes, file_type: Optional[str] = None,
+                              job_description: Optional[str] = None,
+                              on_event: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Analyze a resume through the streaming endpoint. Progress events are
+        passed to `on_event` as they arrive; returns the final response data.
+        """
+        files = {"file": (file_name, file_bytes, file_type)}
+        data = {"job_description": job_description} if job_description else {}
+        for event in self.stream("POST", "/analyze-resume/stream", files=files, data=data, retry=True,
+                                 timeout=ANALYSIS_TIMEOUT):
+            if event["event"] == "error":
+                raise APIError(event.get("detail", "Analysis failed"))
+            if event["event"] == "result":
+                return event["data"]
+            if on_event is not None:
+                on_event(event)
+        raise APIError("Analysis stream ended without a result")
+
+    def generate_interview_questions(self, resume_analysis: Dict, limit: Optional[int] = None) -> Dict:
+        """Assemble interview questions for the resume from the backend question bank"""
+        params = {"limit": limit} if limit else {}
+        return self.post("/interview-questions", params=params, json=resume_analysis, retry=True,
+                         timeout=ANALYSIS_TIMEOUT)
+
+    def add_application(self, user_id: str, application: Dict) -> Dict:
+        return self.post("/applications", params={"user_id": user_id}, json=application)["application"]
+
+    def get_application_stats(self, user_id: str) -> Dict:
+        return self.get("/applications/stats", params={"user_id": user_id})
+
+    def list_applications(self, user_id: str, status: Optional[str] = None, page: int = 1,
+                          page_size: int = 20) -> Dict:
+        params = {"user_id": user_id, "page": page, "page_size": page_size}
+        if status:
+            params["status"] = status
+        return self.get("/applications", params=params)
+
+
+@st.cache_resource
+def get_client() -> APIClient:
+    """One client (and connection pool) shared by all sessions of the Streamlit server"""
+    return APIClient()
@@ -0,0 +1,103 @@
+from typing import Dict, Optional
+from datetime import datetime
+
+from app.core.storage import DEFAULT_PAGE_SIZE, SQLiteStore
+
+APPLICATION_STATUSES = ("Applied", "Phone Screen", "Interview", "Offer", "Rejected")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    company TEXT NOT NULL,
+    position TEXT NOT NULL,
+    status TEXT NOT NULL,
+    applied_on TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (user_id, status, applied_on DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_applications_date ON applications (user_id, applied_on DESC, id DESC);
+"""
+
+_UPDATABLE = ("company", "position", "status", "applied_on", "notes")
+
+
+def _application(row) -> Dict:
+    return {key: row[key] for key in row.keys() if key != "user_id"}
+
+
+class ApplicationStore(SQLiteStore):
+    """Job applications tracked per user, with status/date indexes for listing and counts"""
+
+    SCHEMA = SCHEMA
+
+    @staticmethod
+    def _validate(fields: Dict) -> None:
+        status = fields.get("status")
+        if status is not None and status not in APPLICATION_STATUSES:
+            raise ValueError(f"Unknown status '{status}', expected one of {', '.join(APPLICATION_STATUSES)}")
+        applied_on = fields.get("applied_on")
+        if applied_on is not None:
+            datetime.strptime(applied_on, "%Y-%m-%d")
+
+    def create(self, user_id: str, company: str, position: str, applied_on: str,
+               status: str = "Applied", notes: str = "") -> Dict:
+        self._validate({"status": status, "applied_on": applied_on})
+        with self._lock, self._conn:
+            application_id = self._conn.execute(
+                "INSERT INTO applications (user_id, company, position, status, applied_on, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, company, position, status, applied_on, notes or ""),
+            ).lastrowid
+        return self.get(user_id, application_id)
+
+    def get(self, user_id: str, application_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM applications WHERE id = ? AND user_id = ?", (application_id, user_id)
+            ).fetchone()
+        return _application(row) if row else None
+
+    def update(self, user_id: str, application_id: int, fields: Dict) -> Optional[Dict]:
+        """Update the given fields; returns None when the application doesn't exist"""
+        fields = {key: value for key, value in fields.items() if key in _UPDATABLE and value is not None}
+        self._validate(fields)
+        if fields:
+            assignments = ", ".join(f"{key} = ?" for key in fields)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"UPDATE applications SET {assignments}, updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ? AND user_id = ?",
+                    list(fields.values()) + [application_id, user_id],
+                )
+        return self.get(user_id, application_id)
+
+    def delete(self, user_id: str, application_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM applications WHERE id = ? AND user_id = ?", (application_id, user_id)
+            )
+        return cursor.rowcount > 0
+
+    def list(self, user_id: str, status: Optional[str] = None, page: int = 1,
+             page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Applications newest first, optionally filtered by status"""
+        query = "SELECT * FROM applications WHERE user_id = ?"
+        params = [user_id]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY applied_on DESC, id DESC"
+        return self._paginate(query, params, page, page_size, _application)
+
+    def stats(self, user_id: str) -> Dict:
+        """Application count in total and per status, counted in the database"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM applications WHERE user_id = ? GROUP BY status", (user_id,)
+            ).fetchall()
+        by_status = {status: 0 for status in APPLICATION_STATUSES}
+        by_status.update({row[0]: row[1] for row in rows})
+        return {"total": sum(by_status.values()), "by_status": by_status}
@@ -0,0 +1,46 @@
+from typing import List
+import os
+import threading
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class Embedder:
+    """Sentence embedding model returning L2-normalised float32 vectors"""
+
+    def __init__(self, model_name: str = None):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name or os.getenv("HIREFIT_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+        logger.info(f"Loading embedding model {self.model_name}")
+        self.model = SentenceTransformer(self.model_name, device="cpu")
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        vectors = self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True,
+                                    convert_to_numpy=True, show_progress_bar=False)
+        return vectors.astype(np.float32, copy=False)
+
+    def encode_one(self, text: str) -> np.ndarray:
+        return self.encode([text])[0]
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder() -> Embedder:
+    """Process-wide embedder, loaded on first use"""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = Embedder()
+    return _embedder
@@ -0,0 +1,201 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+
+from app.core.resume_parser import ResumeDocument, Section
+from app.core.rule_extractor import DATE_RANGE_PATTERN, DEGREE_PATTERN
+from app.core.skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+MONTHS = {name: number for number, names in enumerate(
+    (("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",), ("jun", "june"),
+     ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"),
+     ("nov", "november"), ("dec", "december")), 1) for name in names}
+DATE_PATTERN = re.compile(r"(?:([A-Za-z]{3,9})\.?\s+|(\d{1,2})/)?((?:19|20)\d{2})")
+PRESENT_PATTERN = re.compile(r"present|current|now", re.IGNORECASE)
+RANGE_SPLIT_PATTERN = re.compile(r"\s*(?:-|–|—|\bto\b)\s*", re.IGNORECASE)
+
+# Highest first; the first pattern that matches a degree names its level
+DEGREE_LEVELS = [
+    ("doctorate", re.compile(r"\b(?:Ph\.?D|Doctor(?:ate)?|D\.?Phil|Ed\.?D)\b", re.IGNORECASE)),
+    ("master", re.compile(r"\b(?:M\.?S\.?c?|M\.?A|MBA|M\.?Eng|M\.?Tech|Master(?:'s)?)(?![A-Za-z])", re.IGNORECASE)),
+    ("bachelor", re.compile(r"\b(?:B\.?S\.?c?|B\.?A|B\.?Eng|B\.?Tech|Bachelor(?:'s)?)(?![A-Za-z])", re.IGNORECASE)),
+    # Not "Associate Engineer": only the degree itself
+    ("associate", re.compile(r"\bAssociate(?:'s)?\s+(?:degree|of|in)\b|\bA\.?A\.?S\.?(?![A-Za-z])", re.IGNORECASE)),
+]
+DEGREE_RANK = {level: rank for rank, (level, _) in enumerate(reversed(DEGREE_LEVELS), 1)}
+# Words that mark the title part of "Title, Employer" (in either order)
+TITLE_PATTERN = re.compile(
+    r"\b(?:engineer|developer|programmer|architect|manager|director|lead|head|analyst|scientist|designer|"
+    r"consultant|specialist|administrator|admin|intern|assistant|associate|officer|coordinator|technician|"
+    r"nurse|teacher|accountant|researcher|owner|founder|president|vp|cto|ceo|devops|sre|support)\b",
+    re.IGNORECASE,
+)
+INSTITUTION_PATTERN = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic)\b", re.IGNORECASE)
+HEADER_SPLIT_PATTERN = re.compile(r"\s*(?:\||·|•|,|\s@\s|\sat\s|\s[-–—]\s)\s*")
+
+
+def _month_index(year: int, month: int) -> int:
+    return year * 12 + month - 1
+
+
+def parse_date(text: str, today: Optional[date] = None, end: bool = False) -> Optional[int]:
+    """
+    Month index of "Jan 2019", "01/2019", "2019" or "Present" (this month).
+    A bare year is January, or as the `end` of a range December (this month
+    for the current year), so "2015 - 2018" spans four years.
+    """
+    today = today or date.today()
+    if PRESENT_PATTERN.fullmatch(text.strip()):
+        return _month_index(today.year, today.month)
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return None
+    name, number, year = match.groups()
+    year = int(year)
+    if name:
+        month = MONTHS.get(name.lower(), 1)
+    elif number:
+        month = int(number)
+    elif end:
+        month = today.month if year == today.year else 12
+    else:
+        month = 1
+    return _month_index(year, min(max(month, 1), 12))
+
+
+def parse_range(text: str, today: Optional[date] = None) -> Optional[Tuple[int, int]]:
+    """(start, end) month indexes of a date range; both months count"""
+    parts = RANGE_SPLIT_PATTERN.split(text.strip(), maxsplit=1)
+    if len(parts) != 2:
+        return None
+    start, end = parse_date(parts[0], today), parse_date(parts[1], today, end=True)
+    if start is None or end is None or end < start:
+        return None
+    return start, end
+
+
+def total_months(ranges: Iterable[Tuple[int, int]]) -> int:
+    """Months covered by the ranges, counting overlapping jobs once"""
+    months = 0
+    current = None
+    for start, end in sorted(ranges):
+        if current and start <= current[1] + 1:
+            current = (current[0], max(current[1], end))
+            continue
+        if current:
+            months += current[1] - current[0] + 1
+        current = (start, end)
+    if current:
+        months += current[1] - current[0] + 1
+    return months
+
+
+def degree_level(text: str) -> Optional[str]:
+    for level, pattern in DEGREE_LEVELS:
+        if pattern.search(text):
+            return level
+    return None
+
+
+def years_from_experience(experience: Iterable[str], today: Optional[date] = None) -> Optional[float]:
+    """
+    Total years from the date ranges in experience strings, e.g. a stored
+    profile's "Engineer, Acme (Jan 2019 - Present)"; None when none has dates
+    """
+    ranges = [r for entry in experience if isinstance(entry, str)
+              for r in (parse_range(m.group(0), today) for m in DATE_RANGE_PATTERN.finditer(entry)) if r]
+    return round(total_months(ranges) / 12, 1) if ranges else None
+
+
+def highest_degree(education: Iterable[str]) -> Optional[str]:
+    levels = [level for entry in education if isinstance(entry, str) for level in [degree_level(entry)] if level]
+    return max(levels, key=DEGREE_RANK.get) if levels else None
+
+
+class ExperienceExtractor:
+    """
+    Positions, degrees and tenure from a parsed resume with compiled
+    patterns and date arithmetic: total years of experience (overlapping
+    jobs counted once) and years per skill, from the skills mentioned in
+    each position
+    """
+
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None):
+        self.taxonomy = taxonomy or get_taxonomy()
+
+    @staticmethod
+    def _split_header(lines: List[str]) -> Tuple[str, str]:
+        """(title, employer) from an entry's header lines"""
+        parts = []
+        for line in lines:
+            line = DATE_RANGE_PATTERN.sub("", line)
+            parts.extend(p.strip(" ()") for p in HEADER_SPLIT_PATTERN.split(line))
+        parts = [p for p in parts if p and not p.isdigit()]
+        if not parts:
+            return "", ""
+        title = next((p for p in parts if TITLE_PATTERN.search(p)), parts[0])
+        employer = next((p for p in parts if p != title), "")
+        return title, employer
+
+    @staticmethod
+    def _entry_sections(document: ResumeDocument, name: str) -> List[Section]:
+        sections = [s for s in document.sections if s.name == name]
+        # Without the heading, fall back to any dated entries
+        return sections or [s for s in document.sections if any(e.dates for e in s.entries)]
+
+    def positions(self, document: ResumeDocument, today: Optional[date] = None) -> List[Dict]:
+        positions = []
+        for section in self._entry_sections(document, "experience"):
+            for entry in section.entries:
+                ranges = [r for r in (parse_range(d.text, today) for d in entry.dates) if r]
+                if not ranges:
+                    continue
+                start, end = min(r[0] for r in ranges), max(r[1] for r in ranges)
+                title, employer = self._split_header([line.text for line in entry.lines])
+                body = document.text[entry.start:entry.end]
+                positions.append({
+                    "title": title,
+                    "employer": employer,
+                    "start": f"{start // 12}-{start % 12 + 1:02d}",
+                    "end": None if any(PRESENT_PATTERN.search(d.text) for d in entry.dates)
+                    else f"{end // 12}-{end % 12 + 1:02d}",
+                    "months": end - start + 1,
+                    "skills": [self.taxonomy.name(i) for i in self.taxonomy.find_in_text(body)],
+                    "_range": (start, end),
+                })
+        return positions
+
+    def degrees(self, document: ResumeDocument) -> List[Dict]:
+        degrees = []
+        sections = [s for s in document.sections if s.name == "education"] or document.sections
+        for section in sections:
+            for entry in section.entries:
+                text = " ".join(line.text for line in entry.lines)
+                match = DEGREE_PATTERN.search(text)
+                if not match:
+                    continue
+                parts = [p.strip() for p in re.split(r"\s*[,|]\s*", text) if p.strip()]
+                years = [int(d.text[-4:]) for d in entry.dates if d.text[-4:].isdigit()]
+                degrees.append({
+                    "degree": match.group(0).strip(" ,"),
+                    "level": degree_level(text),
+                    "institution": next((p for p in parts if INSTITUTION_PATTERN.search(p)), ""),
+                    "year": max(years) if years else None,
+                })
+        return degrees
+
+    def extract(self, document: ResumeDocument, today: Optional[date] = None) -> Dict:
+        positions = self.positions(document, today)
+        degrees = self.degrees(document)
+        skill_ranges: Dict[str, List[Tuple[int, int]]] = {}
+        for position in positions:
+            for skill in position["skills"]:
+                skill_ranges.setdefault(skill, []).append(position["_range"])
+        levels = [d["level"] for d in degrees if d["level"]]
+        return {
+            "positions": [{k: v for k, v in p.items() if k != "_range"} for p in positions],
+            "degrees": degrees,
+            "years_experience": round(total_months(p["_range"] for p in positions) / 12, 1) if positions else None,
+            "skill_years": {skill: round(total_months(ranges) / 12, 1) for skill, ranges in skill_ranges.items()},
+            "highest_degree": max(levels, key=DEGREE_RANK.get) if levels else None,
+        }
@@ -0,0 +1,509 @@
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from collections import deque
+import os
+import threading
+import time
+import logging
+
+import numpy as np
+from langchain_community.llms import CTransformers
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.llms import LLM
+
+logger = logging.getLogger(__name__)
+
+# Number of tokens the draft model proposes per verification step
+DEFAULT_DRAFT_TOKENS = 4
+
+
+def default_threads() -> int:
+    """Thread count used for CPU inference"""
+    return max(4, os.cpu_count() - 2) if os.cpu_count() else 4
+
+
+class SpeculativeDecoder:
+    """
+    Greedy speculative decoding: a small draft model proposes a few tokens,
+    the target model verifies all of them in a single forward pass and keeps
+    the longest agreeing prefix plus its own next token.
+
+    Because acceptance is exact-match against the target's greedy choice, the
+    output is identical to plain greedy decoding with the target model.
+    """
+
+    def __init__(self, target_path: str, draft_path: str, n_ctx: int = 1024,
+                 threads: Optional[int] = None, num_draft_tokens: int = DEFAULT_DRAFT_TOKENS):
+        from llama_cpp import Llama
+
+        threads = threads or default_threads()
+        logger.info(f"Loading speculative decoder (target={target_path}, draft={draft_path})")
+        # The target needs logits for every position to verify a whole draft at once
+        self.target = Llama(model_path=target_path, n_ctx=n_ctx, n_threads=threads,
+                            logits_all=True, verbose=False)
+        self.draft = Llama(model_path=draft_path, n_ctx=n_ctx, n_threads=threads,
+                           verbose=False)
+        if self.target.n_vocab() != self.draft.n_vocab():
+            raise ValueError(
+                f"Draft model vocabulary ({self.draft.n_vocab()}) does not match "
+                f"target vocabulary ({self.target.n_vocab()})"
+            )
+        self.n_ctx = n_ctx
+        self.num_draft_tokens = max(1, num_draft_tokens)
+        self._lock = threading.Lock()
+        self.stats = {"proposed": 0, "accepted": 0, "target_passes": 0, "generated": 0}
+
+    @staticmethod
+    def _eval_to(model: Any, tokens: List[int]) -> None:
+        """Bring the model's KV cache to exactly `tokens`, reusing the common prefix"""
+        cached = model.input_ids[:model.n_tokens].tolist()
+        prefix = 0
+        for a, b in zip(cached, tokens):
+            if a != b:
+                break
+            prefix += 1
+        # Always re-evaluate at least the last token so its logits are fresh
+        prefix = min(prefix, len(tokens) - 1)
+        model.n_tokens = prefix
+        model.eval(tokens[prefix:])
+
+    def _tokenize(self, prompt: str) -> List[int]:
+        return self.target.tokenize(prompt.encode("utf-8"), add_bos=False, special=True)
+
+    def _detokenize(self, tokens: List[int]) -> str:
+        return self.target.detokenize(tokens).decode("utf-8", errors="ignore")
+
+    def _budget(self, prompt_tokens: List[int], max_new_tokens: int) -> int:
+        # Leave room for a full draft on top of the generated tokens
+        return max(0, min(max_new_tokens, self.n_ctx - len(prompt_tokens) - self.num_draft_tokens - 1))
+
+    def _finish(self, generated: List[int], stop: Optional[List[str]]) -> Tuple[str, bool]:
+        """Detokenize and cut at the first stop sequence; returns (text, stopped)"""
+        text = self._detokenize(generated)
+        if stop:
+            positions = [text.find(s) for s in stop if s and s in text]
+            if positions:
+                return text[:min(positions)], True
+        return text, False
+
+    def generate(self, prompt: str, max_new_tokens: int = 256,
+                 stop: Optional[List[str]] = None) -> str:
+        """Generate a completion using draft proposals verified by the target"""
+        with self._lock:
+            tokens = self._tokenize(prompt)
+            budget = self._budget(tokens, max_new_tokens)
+            eos = self.target.token_eos()
+            generated: List[int] = []
+
+            while len(generated) < budget:
+                # Draft proposes up to k tokens greedily
+                k = min(self.num_draft_tokens, budget - len(generated))
+                proposal: List[int] = []
+                context = tokens + generated
+                for _ in range(k):
+                    self._eval_to(self.draft, context + proposal)
+                    token = int(np.argmax(self.draft.scores[self.draft.n_tokens - 1]))
+                    proposal.append(token)
+                    if token == eos:
+                        break
+
+                # Target scores the whole proposal in one pass
+                self._eval_to(self.target, context + proposal)
+                self.stats["target_passes"] += 1
+                self.stats["proposed"] += len(proposal)
+                base = len(context) - 1
+                accepted: List[int] = []
+                for j, token in enumerate(proposal):
+                    expected = int(np.argmax(self.target.scores[base + j]))
+                    if expected != token:
+                        accepted.append(expected)
+                        break
+                    accepted.append(token)
+                    self.stats["accepted"] += 1
+                    if token == eos:
+                        break
+                else:
+                    if proposal[-1] != eos:
+                        # Every draft token agreed: the target's next token comes for free
+                        accepted.append(int(np.argmax(self.target.scores[base + len(proposal)])))
+
+                accepted = accepted[:budget - len(generated)]
+                if eos in accepted:
+                    generated.extend(accepted[:accepted.index(eos)])
+                    break
+                generated.extend(accepted)
+                if stop and self._finish(generated, stop)[1]:
+                    break
+
+            self.stats["generated"] += len(generated)
+            return self._finish(generated, stop)[0]
+
+    def generate_plain(self, prompt: str, max_new_tokens: int = 256,
+                       stop: Optional[List[str]] = None) -> str:
+        """Plain greedy decoding with the target model, used as the reference output"""
+        with self._lock:
+            tokens = self._tokenize(prompt)
+            budget = self._budget(tokens, max_new_tokens)
+            eos = self.target.token_eos()
+            generated: List[int] = []
+            while len(generated) < budget:
+                self._eval_to(self.target, tokens + generated)
+                token = int(np.argmax(self.target.scores[self.target.n_tokens - 1]))
+                if token == eos:
+                    break
+                generated.append(token)
+                if stop and self._finish(generated, stop)[1]:
+                    break
+            return self._finish(generated, stop)[0]
+
+    def acceptance_rate(self) -> float:
+        """Fraction of draft tokens accepted by the target so far"""
+        if not self.stats["proposed"]:
+            return 0.0
+        return self.stats["accepted"] / self.stats["proposed"]
+
+
+class SpeculativeLLM(LLM):
+    """LangChain wrapper so a SpeculativeDecoder can back an LLMChain"""
+
+    decoder: Any
+    max_new_tokens: int = 256
+
+    @property
+    def _llm_type(self) -> str:
+        return "speculative-llama-cpp"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {
+            "max_new_tokens": self.max_new_tokens,
+            "num_draft_tokens": self.decoder.num_draft_tokens,
+        }
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        start = time.perf_counter()
+        text = self.decoder.generate(prompt, max_new_tokens=self.max_new_tokens, stop=stop)
+        logger.debug(f"Speculative generation took {time.perf_counter() - start:.2f}s "
+                     f"(acceptance rate {self.decoder.acceptance_rate():.2f})")
+        return text
+
+
+class _Sequence:
+    """One generation request inside the batching engine"""
+
+    __slots__ = ("pending", "n_past", "generated", "max_new_tokens", "stop", "seq_id",
+                 "text", "error", "done")
+
+    def __init__(self, prompt_tokens: List[int], max_new_tokens: int, stop: Optional[List[str]]):
+        self.pending = prompt_tokens  # tokens still to be fed to the model
+        self.n_past = 0
+        self.generated: List[int] = []
+        self.max_new_tokens = max_new_tokens
+        self.stop = stop
+        self.seq_id = -1
+        self.text = ""
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+class BatchedEngine:
+    """
+    Continuous batching on top of llama.cpp's batch API. Prompts submitted
+    from any thread join a shared decode loop: every step feeds the next
+    token of each running sequence, plus prompt tokens of newly admitted
+    ones, to a single llama_decode call. Sequences own a slice of the KV
+    cache (their seq_id) and leave the batch as soon as they hit EOS, a
+    stop sequence or their token budget, making room for waiting prompts.
+    """
+
+    def __init__(self, model_path: str, n_ctx: int = 1024, max_sequences: int = 4, n_batch: int = 512,
+                 threads: Optional[int] = None, temperature: float = 0.0, top_k: int = 0,
+                 top_p: float = 1.0, seed: Optional[int] = None):
+        import llama_cpp
+        from llama_cpp import Llama
+
+        self._llama_cpp = llama_cpp
+        threads = threads or default_threads()
+        logger.info(f"Loading batched engine ({model_path}, {max_sequences} sequences)")
+        # One KV cache split between the sequences, n_ctx positions each
+        self.model = Llama(model_path=model_path, n_ctx=n_ctx * max_sequences, n_batch=n_batch,
+                           n_threads=threads, verbose=False)
+        self.n_ctx = n_ctx
+        self.max_sequences = max(1, max_sequences)
+        self.n_batch = n_batch
+        self.n_vocab = self.model.n_vocab()
+        self.eos = self.model.token_eos()
+        self.temperature = temperature
+        self.top_k = top_k
+        self.top_p = top_p
+        self._rng = np.random.default_rng(seed)
+        self._batch = llama_cpp.llama_batch_init(n_batch, 0, 1)
+
+        self._cond = threading.Condition()
+        self._waiting: Deque[_Sequence] = deque()
+        self._active: List[_Sequence] = []
+        self._free_ids = list(range(self.max_sequences))
+        self.stats = {"steps": 0, "generated": 0, "prompt_tokens": 0, "sequences_per_step": 0}
+        # The decode thread starts on first use, in the process that uses the
+        # engine: threads don't survive fork (gunicorn preload_app)
+        self._loop_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self) -> None:
+        pid = os.getpid()
+        if self._loop_pid == pid:
+            return
+        with self._start_lock:
+            if self._loop_pid == pid:
+                return
+            if self._loop_pid is not None:
+                # Forked after the loop started: the parent's thread and its sequences are gone
+                self._cond = threading.Condition()
+                self._waiting, self._active = deque(), []
+                self._free_ids = list(range(self.max_sequences))
+                self._llama_cpp.llama_kv_cache_clear(self.model.ctx)
+            threading.Thread(target=self._loop, name="batched-engine", daemon=True).start()
+            self._loop_pid = pid
+
+    def generate(self, prompt: str, max_new_tokens: int = 256, stop: Optional[List[str]] = None) -> str:
+        """Queue a prompt and wait for its completion"""
+        tokens = self.model.tokenize(prompt.encode("utf-8"), add_bos=False, special=True)
+        if not tokens or len(tokens) >= self.n_ctx:
+            raise ValueError(f"Prompt of {len(tokens)} tokens does not fit the {self.n_ctx} token context")
+        seq = _Sequence(tokens, min(max_new_tokens, self.n_ctx - len(tokens)), stop)
+        self._ensure_loop()
+        with self._cond:
+            self._waiting.append(seq)
+            self._cond.notify()
+        seq.done.wait()
+        if seq.error is not None:
+            raise seq.error
+        return seq.text
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._waiting and not self._active:
+                    self._cond.wait()
+                while self._waiting and self._free_ids:
+                    seq = self._waiting.popleft()
+                    seq.seq_id = self._free_ids.pop()
+                    self._active.append(seq)
+            try:
+                self._step()
+            except Exception as e:
+                logger.error(f"Batched decode failed: {str(e)}")
+                self._llama_cpp.llama_kv_cache_clear(self.model.ctx)
+                for seq in list(self._active):
+                    seq.error = e
+                    self._finish(seq)
+
+    def _step(self) -> None:
+        """Fill one batch from the running sequences and decode it"""
+        batch = self._batch
+        batch.n_tokens = 0
+        outputs: List[Tuple[_Sequence, int]] = []
+        # Sequences that are generating need one slot each; prompts fill the
+        # rest of the batch and may take several steps to be read in
+        for seq in sorted(self._active, key=lambda s: len(s.pending)):
+            room = self.n_batch - batch.n_tokens
+            if room <= 0:
+                break
+            tokens = seq.pending[:room]
+            for token in tokens:
+                i = batch.n_tokens
+                batch.token[i] = token
+                batch.pos[i] = seq.n_past
+                batch.n_seq_id[i] = 1
+                batch.seq_id[i][0] = seq.seq_id
+                batch.logits[i] = False
+                batch.n_tokens += 1
+                seq.n_past += 1
+            seq.pending = seq.pending[len(tokens):]
+            if not seq.pending:
+                batch.logits[batch.n_tokens - 1] = True
+                outputs.append((seq, batch.n_tokens - 1))
+            if not seq.generated:
+                self.stats["prompt_tokens"] += len(tokens)
+
+        status = self._llama_cpp.llama_decode(self.model.ctx, batch)
+        if status != 0:
+            raise RuntimeError(f"llama_decode returned {status}")
+        self.stats["steps"] += 1
+        self.stats["sequences_per_step"] += len(outputs)
+
+        for seq, index in outputs:
+            logits = np.ctypeslib.as_array(
+                self._llama_cpp.llama_get_logits_ith(self.model.ctx, index), shape=(self.n_vocab,)
+            )
+            token = self._sample(logits)
+            if token == self.eos:
+                self._finish(seq)
+                continue
+            seq.generated.append(token)
+            self.stats["generated"] += 1
+            seq.text = self.model.detokenize(seq.generated).decode("utf-8", errors="ignore")
+            if seq.stop:
+                positions = [seq.text.find(s) for s in seq.stop if s and s in seq.text]
+                if positions:
+                    seq.text = seq.text[:min(positions)]
+                    self._finish(seq)
+                    continue
+            if len(seq.generated) >= seq.max_new_tokens:
+                self._finish(seq)
+                continue
+            seq.pending = [token]
+
+    def _sample(self, logits: np.ndarray) -> int:
+        if self.temperature <= 0:
+            return int(np.argmax(logits))
+        logits = logits.astype(np.float64) / self.temperature
+        candidates = np.arange(len(logits))
+        if 0 < self.top_k < len(logits):
+            candidates = np.argpartition(-logits, self.top_k)[:self.top_k]
+        probs = np.exp(logits[candidates] - logits[candidates].max())
+        probs /= probs.sum()
+        if self.top_p < 1.0:
+            order = np.argsort(-probs)
+            keep = order[:int(np.searchsorted(np.cumsum(probs[order]), self.top_p)) + 1]
+            candidates, probs = candidates[keep], probs[keep] / probs[keep].sum()
+        return int(self._rng.choice(candidates, p=probs))
+
+    def _finish(self, seq: _Sequence) -> None:
+        """Release the sequence's KV cache and batch slot, and wake its caller"""
+        self._llama_cpp.llama_kv_cache_seq_rm(self.model.ctx, seq.seq_id, -1, -1)
+        with self._cond:
+            self._active.remove(seq)
+            self._free_ids.append(seq.seq_id)
+        seq.done.set()
+
+    def average_batch(self) -> float:
+        """Mean number of sequences producing a token per decode step"""
+        if not self.stats["steps"]:
+            return 0.0
+        return self.stats["sequences_per_step"] / self.stats["steps"]
+
+
+class BatchedLLM(LLM):
+    """LangChain wrapper so concurrent LLMChain calls share a BatchedEngine"""
+
+    engine: Any
+    max_new_tokens: int = 256
+
+    @property
+    def _llm_type(self) -> str:
+        return "batched-llama-cpp"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {
+            "max_new_tokens": self.max_new_tokens,
+            "max_sequences": self.engine.max_sequences,
+        }
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        return self.engine.generate(prompt, max_new_tokens=self.max_new_tokens, stop=stop)
+
+
+def batch_sequences() -> int:
+    """Sequences decoded together ($HIREFIT_BATCH_SEQUENCES); 1 disables batching"""
+    return max(1, int(os.getenv("HIREFIT_BATCH_SEQUENCES", "1")))
+
+
+def load_batched_llm(model_path: str, config: Dict[str, Any]) -> LLM:
+    engine = BatchedEngine(
+        model_path,
+        n_ctx=config.get("context_length", 1024),
+        max_sequences=batch_sequences(),
+        threads=config.get("threads"),
+        temperature=config.get("temperature", 0.0),
+        top_k=config.get("top_k", 0),
+        top_p=config.get("top_p", 1.0),
+    )
+    return BatchedLLM(engine=engine, max_new_tokens=config.get("max_new_tokens", 256))
+
+
+def load_llm(model_path: str, config: Dict[str, Any]) -> LLM:
+    """
+    Load the target model. When HIREFIT_DRAFT_MODEL_PATH points to a local
+    draft model, generation goes through speculative decoding instead of
+    plain CTransformers sampling; with HIREFIT_BATCH_SEQUENCES > 1, through
+    the continuous batching engine.
+    """
+    draft_path = os.getenv("HIREFIT_DRAFT_MODEL_PATH")
+    if draft_path and batch_sequences() > 1:
+        raise ValueError("Speculative decoding (HIREFIT_DRAFT_MODEL_PATH) and batching "
+                         "(HIREFIT_BATCH_SEQUENCES) can't be combined")
+    if batch_sequences() > 1:
+        return load_batched_llm(model_path, config)
+    if draft_path:
+        if not os.path.exists(draft_path):
+            raise FileNotFoundError(f"Draft model not found: {draft_path}")
+        decoder = SpeculativeDecoder(
+            target_path=model_path,
+            draft_path=draft_path,
+            n_ctx=config.get("context_length", 1024),
+            threads=config.get("threads"),
+            num_draft_tokens=int(os.getenv("HIREFIT_DRAFT_TOKENS", DEFAULT_DRAFT_TOKENS)),
+        )
+        return SpeculativeLLM(decoder=decoder, max_new_tokens=config.get("max_new_tokens", 256))
+
+    return CTransformers(model=model_path, model_type="mistral", config=config)
+
+
+# Which model tier serves each analyzer task. "large" is the 7B target model,
+# "small" a small quantized model and "rules" the regex based extractor.
+MODEL_TIERS = ("large", "small", "rules")
+DEFAULT_TASK_TIERS = {
+    "extraction": "small",
+    "merge": "rules",
+    "match": "large",
+    "questions": "small",
+}
+# Tasks that have a rule based implementation
+RULE_TASKS = {"extraction", "merge"}
+
+
+def resolve_task_tiers(overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Build the task -> tier routing table from the defaults, the
+    HIREFIT_MODEL_TIERS variable ("extraction=rules,match=large") and
+    explicit overrides, in that order of precedence.
+    """
+    tiers = dict(DEFAULT_TASK_TIERS)
+    env_spec = os.getenv("HIREFIT_MODEL_TIERS", "")
+    for item in filter(None, (part.strip() for part in env_spec.split(","))):
+        task, _, tier = item.partition("=")
+        tiers[task.strip()] = tier.strip()
+    tiers.update(overrides or {})
+
+    for task, tier in tiers.items():
+        if task not in DEFAULT_TASK_TIERS:
+            raise ValueError(f"Unknown analyzer task: {task}")
+        if tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model tier for {task}: {tier}")
+        if tier == "rules" and task not in RULE_TASKS:
+            raise ValueError(f"Task {task} has no rule based implementation")
+
+    if not os.getenv("HIREFIT_SMALL_MODEL_PATH"):
+        for task, tier in tiers.items():
+            if tier == "small":
+                logger.info(f"HIREFIT_SMALL_MODEL_PATH not set, routing {task} to the large model")
+                tiers[task] = "large"
+    return tiers
+
+
+def load_small_llm(config: Dict[str, Any]) -> LLM:
+    """Load the small quantized model used for cheap tasks"""
+    model_path = os.getenv("HIREFIT_SMALL_MODEL_PATH")
+    if not model_path or not os.path.exists(model_path):
+        raise FileNotFoundError(f"Small model not found: {model_path}")
+    if batch_sequences() > 1:
+        # Concurrent analyses call every model at once; only the engine is thread-safe
+        return load_batched_llm(model_path, config)
+    return CTransformers(
+        model=model_path,
+        model_type=os.getenv("HIREFIT_SMALL_MODEL_TYPE", "llama"),
+        config=config,
+    )
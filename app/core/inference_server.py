@@ -0,0 +1,226 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from multiprocessing.connection import Client, Connection, Listener
+import argparse
+import logging
+import os
+import threading
+
+from app.core.match_scorer import JobInput, resume_seniority
+from app.core.scheduler import DEFAULT_PRIORITY, DEFAULT_TENANT, ScheduledAnalyzer
+from app.utils.file_processor import FileProcessor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADDRESS = "127.0.0.1:6100"
+
+# Analyzer methods the inference process serves; STREAMING_METHODS return
+# an iterator whose items are sent as they are produced
+REMOTE_METHODS = {"analyze_resume", "analyze_match", "generate_interview_questions",
+                  "generate_questions_for_items", "scheduler_metrics", "match_stats"}
+STREAMING_METHODS = {"analyze_resume_iter"}
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(address: str) -> Address:
+    """"host:port" for TCP, anything else is a Unix socket path"""
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit() and "/" not in address:
+        return host, int(port)
+    return address
+
+
+def authkey() -> bytes:
+    """
+    Shared secret; connections from processes without it are rejected.
+    Required: the connection unpickles what it receives, so anyone holding
+    the key can run code in the inference process.
+    """
+    key = os.getenv("HIREFIT_INFERENCE_AUTHKEY", "")
+    if not key:
+        raise RuntimeError("HIREFIT_INFERENCE_AUTHKEY must be set to a secret shared by API workers "
+                           "and the inference process")
+    return key.encode()
+
+
+class InferenceServer:
+    """
+    Owns the only ResumeAnalyzer (and model) on the host and serves API
+    workers over multiprocessing.connection. Each client connection gets a
+    thread; the analyzer's scheduler decides which of them uses the model.
+    """
+
+    def __init__(self, analyzer: ScheduledAnalyzer, address: str = DEFAULT_ADDRESS):
+        self.analyzer = analyzer
+        self.address = parse_address(address)
+        self.authkey = authkey()
+
+    def _listen(self) -> Listener:
+        if not isinstance(self.address, str):
+            return Listener(self.address, authkey=self.authkey)
+        if os.path.exists(self.address):
+            os.unlink(self.address)  # stale socket from a previous run
+        # Create the socket owner-only (0600) rather than chmod it after bind
+        umask = os.umask(0o177)
+        try:
+            return Listener(self.address, authkey=self.authkey)
+        finally:
+            os.umask(umask)
+
+    def serve_forever(self) -> None:
+        with self._listen() as listener:
+            logger.info(f"Inference server listening on {self.address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # Failed handshakes (wrong authkey, port scans) must not stop the server
+                    logger.warning(f"Rejected connection: {str(e)}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if method in STREAMING_METHODS:
+                        for item in getattr(self.analyzer, method)(*args, **kwargs):
+                            conn.send(("item", item))
+                        conn.send(("done", None))
+                    elif method in REMOTE_METHODS:
+                        result = getattr(self.analyzer, method)(*args, **kwargs)
+                        conn.send(("ok", result))
+                    else:
+                        conn.send(("error", f"Unknown method: {method}"))
+                except (EOFError, OSError):
+                    return
+                except Exception as e:
+                    logger.exception(f"Error in {method}")
+                    conn.send(("error", str(e)))
+
+
+class RemoteAnalyzer:
+    """
+    Drop-in for ResumeAnalyzer in API workers that forwards model calls to
+    the inference process, so workers don't load a model of their own
+    """
+
+    infer_seniority = staticmethod(resume_seniority)
+
+    def __init__(self, address: str = DEFAULT_ADDRESS):
+        self.address = parse_address(address)
+        self.authkey = authkey()
+        self._pid = os.getpid()
+        self._idle: List[Connection] = []
+        self._pool_lock = threading.Lock()
+
+    def _checkout(self) -> Tuple[Connection, bool]:
+        """A connection and whether it came from the pool (and so may be stale)"""
+        with self._pool_lock:
+            if self._pid != os.getpid():
+                # Connections are per process; never share the parent's after fork
+                self._pid, self._idle = os.getpid(), []
+            if self._idle:
+                return self._idle.pop(), True
+        return Client(self.address, authkey=self.authkey), False
+
+    def _checkin(self, conn: Connection) -> None:
+        with self._pool_lock:
+            self._idle.append(conn)
+
+    def _request(self, method: str, args: tuple, kwargs: Dict) -> Tuple[Connection, str, Any]:
+        """
+        Send a call and read the first reply. A pooled connection that turns
+        out dead (e.g. the inference process restarted) is replaced once.
+        """
+        for attempt in range(2):
+            conn, pooled = self._checkout()
+            try:
+                conn.send((method, args, kwargs))
+                status, value = conn.recv()
+                return conn, status, value
+            except (EOFError, OSError):
+                conn.close()
+                if not pooled or attempt:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        conn, status, value = self._request(method, args, kwargs)
+        self._checkin(conn)
+        if status == "error":
+            raise RuntimeError(value)
+        return value
+
+    def _stream(self, method: str, *args, **kwargs) -> Iterator[Any]:
+        conn, status, value = self._request(method, args, kwargs)
+        finished = False
+        try:
+            while status == "item":
+                yield value
+                status, value = conn.recv()
+            finished = True
+            if status == "error":
+                raise RuntimeError(value)
+        finally:
+            # A stream abandoned midway leaves unread items on the connection
+            if finished:
+                self._checkin(conn)
+            else:
+                conn.close()
+
+    def extract_text_from_file(self, file_path: str) -> str:
+        return FileProcessor.extract_text(file_path)
+
+    def analyze_resume(self, resume_text: str, job_description: Optional[JobInput] = None,
+                       priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> Dict:
+        return self._call("analyze_resume", resume_text, job_description, priority=priority, tenant=tenant)
+
+    def analyze_resume_iter(self, resume_text: str, job_description: Optional[JobInput] = None,
+                            priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> Iterator[Dict]:
+        return self._stream("analyze_resume_iter", resume_text, job_description, priority=priority, tenant=tenant)
+
+    def analyze_match(self, basic_info: Dict, job_description: JobInput,
+                      priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> Dict:
+        return self._call("analyze_match", basic_info, job_description, priority=priority, tenant=tenant)
+
+    def generate_questions_for_items(self, items: List[str], seniority: str, per_item: int = 2,
+                                     priority: str = DEFAULT_PRIORITY,
+                                     tenant: str = DEFAULT_TENANT) -> Dict[str, List[str]]:
+        return self._call("generate_questions_for_items", items, seniority, per_item,
+                          priority=priority, tenant=tenant)
+
+    def generate_interview_questions(self, resume_analysis: Dict, per_item: int = 2, max_items: int = 12,
+                                     priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> List[str]:
+        return self._call("generate_interview_questions", resume_analysis, per_item, max_items,
+                          priority=priority, tenant=tenant)
+
+    def scheduler_metrics(self) -> Dict:
+        return self._call("scheduler_metrics")
+
+    def match_stats(self) -> Dict:
+        return self._call("match_stats")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the dedicated inference process"""
+    from app.core.resume_analyzer import ResumeAnalyzer
+
+    parser = argparse.ArgumentParser(description="Serve the resume analyzer to API workers")
+    parser.add_argument("--address", default=os.getenv("HIREFIT_INFERENCE_ADDRESS", DEFAULT_ADDRESS),
+                        help="host:port or Unix socket path (default: $HIREFIT_INFERENCE_ADDRESS or %(default)s)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    InferenceServer(ScheduledAnalyzer(ResumeAnalyzer()), args.address).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+from typing import Dict, Optional
+import json
+
+import numpy as np
+
+from app.core.profile_store import job_hash
+from app.core.storage import SQLiteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_profiles (
+    id INTEGER PRIMARY KEY,
+    job_hash TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL,
+    required_skills TEXT NOT NULL,
+    preferred_skills TEXT NOT NULL,
+    seniority TEXT NOT NULL,
+    min_years INTEGER,
+    summary TEXT NOT NULL,
+    embedding BLOB,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _job(row) -> Dict:
+    return {
+        "id": row["id"],
+        "job_hash": row["job_hash"],
+        "title": row["title"],
+        "description": row["description"],
+        "required_skills": json.loads(row["required_skills"]),
+        "preferred_skills": json.loads(row["preferred_skills"]),
+        "seniority": row["seniority"],
+        "min_years": row["min_years"],
+        "summary": row["summary"],
+        "embedding": None if row["embedding"] is None else np.frombuffer(row["embedding"], dtype=np.float32),
+        "created_at": row["created_at"],
+    }
+
+
+class JobStore(SQLiteStore):
+    """
+    Parsed job descriptions (requirement profiles), keyed by the hash of
+    the posting so the same text is only parsed and embedded once
+    """
+
+    SCHEMA = SCHEMA
+
+    def save(self, profile: Dict) -> Dict:
+        """Store a profile from MatchScorer.job_profile; returns the stored job with its id"""
+        key = job_hash(profile["description"])
+        embedding = profile.get("embedding")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO job_profiles (job_hash, title, description, required_skills, preferred_skills, "
+                "seniority, min_years, summary, embedding) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_hash) DO NOTHING",
+                (
+                    key, profile.get("title") or "", profile["description"],
+                    json.dumps(profile["required_skills"]), json.dumps(profile["preferred_skills"]),
+                    profile["seniority"], profile.get("min_years"), profile["summary"],
+                    None if embedding is None else np.asarray(embedding, dtype=np.float32).tobytes(),
+                ),
+            )
+        return self.get_by_hash(key)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM job_profiles WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def get_by_hash(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM job_profiles WHERE job_hash = ?", (key,)).fetchone()
+        return _job(row) if row else None
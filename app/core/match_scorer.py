@@ -0,0 +1,308 @@
+from typing import Dict, Iterable, List, Optional, Set, Union
+import math
+import os
+import re
+import logging
+
+import numpy as np
+
+from app.core.experience_extractor import years_from_experience
+from app.core.rule_extractor import RuleBasedExtractor
+from app.core.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from app.utils.keywords import TOKEN_PATTERN
+from app.utils.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# Weights of the fused signals; the weight of a missing signal (semantic
+# without embeddings, experience without a years requirement) is redistributed
+SIGNAL_WEIGHTS = {"coverage": 0.5, "lexical": 0.25, "semantic": 0.25, "experience": 0.2}
+# Share of the coverage signal given to required vs preferred skills
+REQUIRED_WEIGHT = 0.75
+PREFERRED_WEIGHT = 0.25
+# Logistic calibration of the fused score; fixed so scores are reproducible
+CALIBRATION_SLOPE = 8.0
+CALIBRATION_MIDPOINT = 0.45
+# Reciprocal rank fusion constant
+RRF_K = 60
+# Shortest skill key matched in resume free text (outside the taxonomy)
+MIN_TEXT_KEY_LENGTH = 3
+
+# A job description as raw text, or its stored requirement profile (MatchScorer.job_profile)
+JobInput = Union[str, Dict]
+
+PREFERRED_MARKER = re.compile(r"nice to have|preferred|bonus|a plus|desirable|good to have", re.IGNORECASE)
+SENIORITY_PATTERNS = [
+    ("senior", re.compile(r"\b(?:senior|sr\.?|lead|principal|staff|head|manager|director|architect)\b", re.IGNORECASE)),
+    ("junior", re.compile(r"\b(?:junior|jr\.?|intern|internship|graduate|entry[- ]level|trainee|assistant)\b", re.IGNORECASE)),
+]
+# "3+ years", "5-7 yrs", "at least 2 years"; the lower bound is the requirement
+YEARS_PATTERN = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:(?:-|to)\s*\d{1,2}\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+
+
+def skill_key(skill: str) -> str:
+    """Normalised form used for exact skill comparison: "Node.js" == "nodejs" == "node js" """
+    return re.sub(r"[\s.\-_]+", "", skill.strip().lower())
+
+
+def infer_seniority(text: str) -> str:
+    """Rough seniority bucket from titles in the text: junior, mid or senior"""
+    for level, pattern in SENIORITY_PATTERNS:
+        if pattern.search(text):
+            return level
+    return "mid"
+
+
+def resume_seniority(resume_analysis: Dict) -> str:
+    """Seniority bucket from an analysis's experience entries; part of the question cache key"""
+    return infer_seniority(" ".join(str(item) for item in resume_analysis.get("experience", [])))
+
+
+def required_years(text: str) -> Optional[int]:
+    """Largest "N years" requirement stated in a job description"""
+    years = [int(match.group(1)) for match in YEARS_PATTERN.finditer(text)]
+    return max(years) if years else None
+
+
+def calibrate(raw: float) -> float:
+    """Map the fused [0, 1] signal to a calibrated [0, 1] score"""
+    def sigmoid(x: float) -> float:
+        return 1.0 / (1.0 + math.exp(-CALIBRATION_SLOPE * (x - CALIBRATION_MIDPOINT)))
+    low, high = sigmoid(0.0), sigmoid(1.0)
+    return max(0.0, min(1.0, (sigmoid(raw) - low) / (high - low)))
+
+
+class MatchScorer:
+    """
+    Deterministic resume/job match scoring that fuses skill coverage,
+    lexical similarity and embedding similarity. No LLM call is involved,
+    so a score takes milliseconds.
+    """
+
+    def __init__(self, use_embeddings: Optional[bool] = None, taxonomy: Optional[SkillTaxonomy] = None):
+        if use_embeddings is None:
+            use_embeddings = os.getenv("HIREFIT_MATCH_EMBEDDINGS", "1") == "1"
+        self.use_embeddings = use_embeddings
+        self.taxonomy = taxonomy or get_taxonomy()
+        self._rule_extractor = RuleBasedExtractor(self.taxonomy)
+
+    @staticmethod
+    def resume_text(resume: Dict) -> str:
+        return "\n".join(list(resume.get("skills", [])) + list(resume.get("experience", []))
+                         + list(resume.get("education", [])))
+
+    @staticmethod
+    def job_text(job: Dict) -> str:
+        text = f"{job.get('title', '')}\n{job.get('description', '')}\n"
+        text += "Required Skills: " + ", ".join(job.get("required_skills", []))
+        text += "\nPreferred Skills: " + ", ".join(job.get("preferred_skills", []))
+        return text
+
+    def job_from_text(self, text: str, title: str = "") -> Dict:
+        """Build a job dict from free text; skills after a "nice to have" marker count as preferred"""
+        marker = PREFERRED_MARKER.search(text)
+        split = marker.start() if marker else len(text)
+        required = self._rule_extractor.extract_skills(text[:split])
+        required_keys = {skill_key(s) for s in required}
+        preferred = [s for s in self._rule_extractor.extract_skills(text[split:]) if skill_key(s) not in required_keys]
+        return {"title": title, "description": text, "required_skills": required, "preferred_skills": preferred,
+                "min_years": required_years(text)}
+
+    def job_profile(self, text: str, title: str = "") -> Dict:
+        """
+        Requirement profile of a job description: skills split into required
+        and preferred, seniority, years of experience, a compact summary for
+        model prompts and the embedding used for semantic scoring. Computed
+        once per posting and reused for every resume matched against it.
+        """
+        job = self.job_from_text(text, title)
+        job["seniority"] = infer_seniority(f"{title}\n{text}")
+        job["summary"] = self.requirement_summary(job)
+        job["embedding"] = None
+        if self.use_embeddings:
+            try:
+                from app.core.embeddings import get_embedder
+                job["embedding"] = get_embedder().encode_one(self.job_text(job))
+            except Exception as e:
+                logger.warning(f"Embeddings unavailable, storing the job without one: {str(e)}")
+        return job
+
+    @staticmethod
+    def requirement_summary(job: Dict) -> str:
+        """Short text of the requirements, sent to the model instead of the full posting"""
+        lines = [job.get("title") or "Job"]
+        if job.get("required_skills"):
+            lines.append("Required skills: " + ", ".join(job["required_skills"]))
+        if job.get("preferred_skills"):
+            lines.append("Preferred skills: " + ", ".join(job["preferred_skills"]))
+        if job.get("seniority"):
+            lines.append(f"Seniority: {job['seniority']}")
+        if job.get("min_years"):
+            lines.append(f"Experience: {job['min_years']}+ years")
+        return "\n".join(lines)
+
+    def resume_skill_ids(self, resume: Dict, text: Optional[str] = None) -> Set[int]:
+        """Taxonomy ids the resume covers: listed and mentioned skills plus their ancestors"""
+        ids = self.taxonomy.ids(resume.get("skills", []))
+        ids.update(self.taxonomy.find_in_text(text or self.resume_text(resume), include_categories=True))
+        return self.taxonomy.expand(ids)
+
+    @staticmethod
+    def resume_skill_keys(resume: Dict, text: Optional[str] = None) -> Set[str]:
+        """
+        Skill keys the resume covers: listed skills plus words and two-word
+        phrases in its text. Keys shorter than MIN_TEXT_KEY_LENGTH only come
+        from the skills list; in free text they are mostly fragments ("R&D").
+        """
+        keys = {skill_key(s) for s in resume.get("skills", []) if s}
+        tokens = TOKEN_PATTERN.findall((text or MatchScorer.resume_text(resume)).lower())
+        text_keys = [skill_key(t) for t in tokens] + [skill_key(a + b) for a, b in zip(tokens, tokens[1:])]
+        keys.update(key for key in text_keys if len(key) >= MIN_TEXT_KEY_LENGTH)
+        return keys
+
+    @staticmethod
+    def resume_years(resume: Dict) -> Optional[float]:
+        """Years of experience: from the deterministic extractor, else from dates in the experience list"""
+        if resume.get("years_experience") is not None:
+            return float(resume["years_experience"])
+        return years_from_experience(resume.get("experience", []) or [])
+
+    @staticmethod
+    def _min_years(job: Dict) -> Optional[int]:
+        return job["min_years"] if "min_years" in job else required_years(job.get("description") or "")
+
+    @staticmethod
+    def _experience(years: Optional[float], min_years: Optional[int]) -> Optional[float]:
+        """Share of the job's years requirement the resume meets; None when either is unknown"""
+        if not min_years or years is None:
+            return None
+        return min(1.0, years / min_years)
+
+    def _coverage(self, skills: Iterable[str], covered_ids: Set[int], covered_keys: Set[str]):
+        """Taxonomy skills are compared by id; skills outside the taxonomy fall back to string keys"""
+        matching, missing = [], []
+        for skill in self.taxonomy.canonicalize(skills):
+            skill_id = self.taxonomy.lookup(skill)
+            covered = skill_id in covered_ids if skill_id is not None else skill_key(skill) in covered_keys
+            (matching if covered else missing).append(skill)
+        total = len(matching) + len(missing)
+        ratio = len(matching) / total if total else None
+        return ratio, matching, missing
+
+    def _semantic(self, resume_text: str, job_texts: List[str],
+                  job_embeddings: Optional[List[Optional[np.ndarray]]] = None) -> Optional[np.ndarray]:
+        """Cosine similarity to each job; precomputed job embeddings are used as given"""
+        if not self.use_embeddings:
+            return None
+        try:
+            from app.core.embeddings import get_embedder
+            embedder = get_embedder()
+        except Exception as e:
+            logger.warning(f"Embeddings unavailable, scoring without them: {str(e)}")
+            self.use_embeddings = False
+            return None
+        job_embeddings = job_embeddings or [None] * len(job_texts)
+        missing = [i for i, embedding in enumerate(job_embeddings) if embedding is None]
+        vectors = embedder.encode([resume_text] + [job_texts[i] for i in missing])
+        jobs = list(job_embeddings)
+        for i, vector in zip(missing, vectors[1:]):
+            jobs[i] = vector
+        return np.clip(np.stack(jobs) @ vectors[0], 0.0, 1.0)
+
+    def _fuse(self, coverage: Dict, lexical: float, semantic: Optional[float],
+              experience: Optional[float] = None) -> Dict:
+        required, preferred = coverage["required"], coverage["preferred"]
+        if required is None and preferred is None:
+            coverage_score = None
+        elif preferred is None:
+            coverage_score = required
+        elif required is None:
+            coverage_score = preferred
+        else:
+            coverage_score = REQUIRED_WEIGHT * required + PREFERRED_WEIGHT * preferred
+
+        signals = {"coverage": coverage_score, "lexical": lexical, "semantic": semantic, "experience": experience}
+        available = {name: value for name, value in signals.items() if value is not None}
+        total_weight = sum(SIGNAL_WEIGHTS[name] for name in available)
+        raw = sum(SIGNAL_WEIGHTS[name] * value for name, value in available.items()) / total_weight
+        return {
+            "match_score": round(calibrate(raw), 4),
+            "components": {
+                "required_coverage": required,
+                "preferred_coverage": preferred,
+                "lexical": round(lexical, 4),
+                "semantic": None if semantic is None else round(float(semantic), 4),
+                "experience": None if experience is None else round(experience, 4),
+                "raw": round(raw, 4),
+            },
+        }
+
+    def score_many(self, resume: Dict, jobs: List[Dict]) -> List[Dict]:
+        """
+        Score one resume against many jobs; lexical and semantic signals are
+        computed in batch, but each pair's score doesn't depend on the others
+        """
+        if not jobs:
+            return []
+        resume_text = self.resume_text(resume)
+        job_texts = [self.job_text(job) for job in jobs]
+        covered_ids = self.resume_skill_ids(resume, resume_text)
+        covered_keys = self.resume_skill_keys(resume, resume_text)
+        # Per pair, so a pair scores the same in /calculate-match-score and /rank-jobs
+        lexical = TextProcessor.pairwise_cosine(resume_text, job_texts)
+        semantic = self._semantic(resume_text, job_texts, [job.get("embedding") for job in jobs])
+        years = self.resume_years(resume)
+        skill_years = resume.get("skill_years") or {}
+
+        results = []
+        for i, job in enumerate(jobs):
+            required, matching, gaps = self._coverage(job.get("required_skills", []), covered_ids, covered_keys)
+            preferred, matching_preferred, missing_preferred = self._coverage(job.get("preferred_skills", []), covered_ids, covered_keys)
+            min_years = self._min_years(job)
+            experience = self._experience(years, min_years)
+            result = self._fuse(
+                {"required": required, "preferred": preferred},
+                float(lexical[i]),
+                None if semantic is None else float(semantic[i]),
+                experience,
+            )
+            suggestions = [f"Consider learning {skill}" for skill in gaps]
+            if experience is not None and experience < 1.0:
+                suggestions.append(f"The role asks for {min_years}+ years of experience; the resume shows {years:g}")
+            result.update({
+                "matching_skills": matching + matching_preferred,
+                "skill_gaps": gaps,
+                "missing_preferred_skills": missing_preferred,
+                "suggestions": suggestions,
+                "years_experience": years,
+                # Tenure of each matching skill, from the positions that mention it
+                "matching_skill_years": {s: skill_years[s] for s in matching + matching_preferred if s in skill_years},
+            })
+            results.append(result)
+        return results
+
+    def score(self, resume: Dict, job: Dict) -> Dict:
+        """Score one resume against one job"""
+        return self.score_many(resume, [job])[0]
+
+    def rank(self, resume: Dict, jobs: List[Dict]) -> List[Dict]:
+        """
+        Rank jobs for a resume with reciprocal rank fusion over the individual
+        signals, so one signal with a skewed scale can't dominate the order.
+        Returns score results with "index" (position in `jobs`) and "rrf" added,
+        best first.
+        """
+        results = self.score_many(resume, jobs)
+        fused = np.zeros(len(results))
+        for signal in ("required_coverage", "lexical", "semantic", "experience"):
+            values = [r["components"][signal] for r in results]
+            if all(v is None for v in values):
+                continue
+            order = np.argsort([-(v if v is not None else -1.0) for v in values], kind="stable")
+            ranks = np.empty(len(order), dtype=int)
+            ranks[order] = np.arange(1, len(order) + 1)
+            fused += 1.0 / (RRF_K + ranks)
+        for i, result in enumerate(results):
+            result["index"] = i
+            result["rrf"] = round(float(fused[i]), 6)
+        return sorted(results, key=lambda r: (-r["rrf"], -r["match_score"]))
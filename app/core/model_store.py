@@ -0,0 +1,270 @@
+from typing import Dict, List, Optional
+import argparse
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Model artifacts known to the application. sha256 may be pinned via the
+# environment; when it is not, the digest computed at download time is
+# recorded next to the file and checked on later loads.
+MODEL_ARTIFACTS = {
+    "mistral-7b-instruct": {
+        "url": "https://huggingface.co/TheBloke/Mistral-7B-Instruct-v0.1-GGUF/resolve/main/"
+               "mistral-7b-instruct-v0.1.Q4_K_M.gguf",
+        "filename": "mistral-7b-instruct-v0.1.Q4_K_M.gguf",
+        "sha256_env": "HIREFIT_MODEL_SHA256",
+    },
+}
+
+DEFAULT_CACHE_DIR = "models"
+DEFAULT_CONNECTIONS = 4
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+# Persist download progress at most this often per part
+STATE_SAVE_INTERVAL = 16 * 1024 * 1024
+
+
+class ModelStore:
+    """
+    Local cache of model artifacts shared by all workers on a host.
+
+    Downloads are split into byte ranges fetched in parallel, progress is
+    persisted so an interrupted download resumes where it stopped, the
+    result is verified with SHA-256 and only then atomically renamed to its
+    final path. A per-artifact file lock makes concurrent workers wait for a
+    single download instead of racing.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, connections: int = DEFAULT_CONNECTIONS,
+                 part_size: int = DEFAULT_PART_SIZE, timeout: float = 30.0):
+        self.cache_dir = cache_dir or os.getenv("HIREFIT_MODEL_CACHE", DEFAULT_CACHE_DIR)
+        self.connections = max(1, connections)
+        self.part_size = part_size
+        self.timeout = timeout
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path_for(self, filename: str) -> str:
+        return os.path.join(self.cache_dir, filename)
+
+    @contextmanager
+    def _locked(self, filename: str):
+        """Exclusive cross-process lock for one artifact"""
+        with open(self.path_for(filename) + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def ensure_artifact(self, name: str) -> str:
+        """Return the local path of a registered artifact, downloading it if needed"""
+        artifact = MODEL_ARTIFACTS[name]
+        sha256 = os.getenv(artifact.get("sha256_env", ""), artifact.get("sha256"))
+        return self.ensure(artifact["url"], artifact["filename"], sha256=sha256)
+
+    def ensure(self, url: str, filename: str, sha256: Optional[str] = None) -> str:
+        """Return the local path of `filename`, downloading it from `url` if needed"""
+        path = self.path_for(filename)
+        with self._locked(filename):
+            if self.is_published(path, sha256):
+                return path
+            if os.path.exists(path):
+                logger.warning(f"Cached {filename} failed verification, downloading again")
+                os.unlink(path)
+            self._download(url, path, sha256)
+        return path
+
+    @staticmethod
+    def _read_json(path: str) -> Optional[Dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: str, data: Dict) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def is_published(self, path: str, sha256: Optional[str] = None) -> bool:
+        """
+        Cheap check that `path` was published by the store: the recorded
+        size must match and, if pinned, the recorded digest too. Use
+        verify() for a full re-hash.
+        """
+        meta = self._read_json(path + ".sha256")
+        if not os.path.exists(path) or not meta:
+            return False
+        if os.path.getsize(path) != meta.get("size"):
+            return False
+        return sha256 is None or meta.get("sha256") == sha256.lower()
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def verify(self, filename: str, sha256: Optional[str] = None) -> bool:
+        """Re-hash a published artifact and compare it with the pinned or recorded digest"""
+        path = self.path_for(filename)
+        meta = self._read_json(path + ".sha256") or {}
+        expected = (sha256 or meta.get("sha256") or "").lower()
+        if not os.path.exists(path) or not expected:
+            return False
+        return self.file_sha256(path) == expected
+
+    def _probe(self, url: str) -> Dict:
+        response = requests.head(url, allow_redirects=True, timeout=self.timeout)
+        response.raise_for_status()
+        return {
+            "url": response.url,
+            "size": int(response.headers.get("content-length", 0)),
+            "etag": response.headers.get("etag"),
+            "ranges": response.headers.get("accept-ranges", "").lower() == "bytes",
+        }
+
+    def _download(self, url: str, path: str, sha256: Optional[str]) -> None:
+        part_path = path + ".part"
+        state_path = path + ".part.json"
+        remote = self._probe(url)
+        state = self._read_json(state_path)
+
+        resumable = remote["ranges"] and remote["size"] > 0
+        if not (resumable and state and os.path.exists(part_path)
+                and state.get("size") == remote["size"] and state.get("etag") == remote["etag"]):
+            # Fresh download; anything left over belongs to a different file version
+            state = {"size": remote["size"], "etag": remote["etag"], "done": {}}
+            with open(part_path, "wb") as f:
+                if resumable:
+                    f.truncate(remote["size"])
+        else:
+            done = sum(state["done"].values())
+            logger.info(f"Resuming download of {os.path.basename(path)} at {done}/{remote['size']} bytes")
+
+        if resumable:
+            self._download_ranges(remote["url"], part_path, state_path, state)
+        else:
+            self._download_stream(remote["url"], part_path)
+
+        digest = self.file_sha256(part_path)
+        if sha256 and digest != sha256.lower():
+            os.unlink(part_path)
+            if os.path.exists(state_path):
+                os.unlink(state_path)
+            raise ValueError(f"Checksum mismatch for {os.path.basename(path)}: expected {sha256}, got {digest}")
+
+        # Publish: the final path only ever holds a complete, verified file
+        os.replace(part_path, path)
+        self._write_json(path + ".sha256", {"sha256": digest, "size": os.path.getsize(path), "url": url})
+        if os.path.exists(state_path):
+            os.unlink(state_path)
+        logger.info(f"Model {os.path.basename(path)} downloaded and verified")
+
+    def _download_ranges(self, url: str, part_path: str, state_path: str, state: Dict) -> None:
+        size = state["size"]
+        parts = [(start, min(start + self.part_size, size) - 1) for start in range(0, size, self.part_size)]
+        state_lock = threading.Lock()
+
+        def fetch(part):
+            start, end = part
+            key = str(start)
+            offset = start + state["done"].get(key, 0)
+            if offset > end:
+                return
+            headers = {"Range": f"bytes={offset}-{end}"}
+            with requests.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise IOError(f"Server ignored range request for bytes {offset}-{end}")
+                fd = os.open(part_path, os.O_WRONLY)
+                try:
+                    unsaved = 0
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if not chunk:
+                            continue
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                        unsaved += len(chunk)
+                        if unsaved >= STATE_SAVE_INTERVAL or offset > end:
+                            os.fsync(fd)
+                            with state_lock:
+                                state["done"][key] = offset - start
+                                self._write_json(state_path, state)
+                            unsaved = 0
+                finally:
+                    os.close(fd)
+            if offset <= end:
+                raise IOError(f"Connection closed early for bytes {start}-{end}")
+
+        with ThreadPoolExecutor(max_workers=self.connections) as executor:
+            # list() re-raises the first failure; progress so far stays on disk
+            list(executor.map(fetch, parts))
+
+    def _download_stream(self, url: str, part_path: str) -> None:
+        """Fallback for servers without range support: a single sequential stream"""
+        with requests.get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            with open(part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Pre-fetch or verify model artifacts, e.g. at build time"""
+    parser = argparse.ArgumentParser(description="Manage the local model artifact cache")
+    parser.add_argument("command", choices=["fetch", "verify"])
+    parser.add_argument("--artifact", action="append", choices=sorted(MODEL_ARTIFACTS),
+                        help="Registered artifact to process (default: all)")
+    parser.add_argument("--url", help="Fetch an arbitrary URL instead of registered artifacts")
+    parser.add_argument("--filename", help="Cache filename for --url")
+    parser.add_argument("--sha256", help="Expected digest for --url")
+    parser.add_argument("--cache-dir", help="Cache directory (default: $HIREFIT_MODEL_CACHE or ./models)")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    store = ModelStore(cache_dir=args.cache_dir, connections=args.connections)
+
+    if args.url:
+        filename = args.filename or os.path.basename(args.url.split("?")[0])
+        targets = [(args.url, filename, args.sha256)]
+    else:
+        targets = []
+        for name in args.artifact or sorted(MODEL_ARTIFACTS):
+            artifact = MODEL_ARTIFACTS[name]
+            sha256 = os.getenv(artifact.get("sha256_env", ""), artifact.get("sha256"))
+            targets.append((artifact["url"], artifact["filename"], sha256))
+
+    ok = True
+    for url, filename, sha256 in targets:
+        if args.command == "fetch":
+            print(store.ensure(url, filename, sha256=sha256))
+        else:
+            valid = store.verify(filename, sha256=sha256)
+            print(f"{filename}: {'OK' if valid else 'FAILED'}")
+            ok = ok and valid
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import re
+
+from app.core.skill_taxonomy import get_taxonomy
+from app.core.storage import DEFAULT_PAGE_SIZE, SQLiteStore, content_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    email TEXT UNIQUE,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    candidate_id INTEGER REFERENCES candidates (id) ON DELETE SET NULL,
+    content_hash TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    text TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_documents_candidate ON documents (candidate_id);
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL UNIQUE REFERENCES documents (id) ON DELETE CASCADE,
+    skills TEXT NOT NULL,
+    experience TEXT NOT NULL,
+    education TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS profile_skills (
+    skill TEXT NOT NULL,
+    profile_id INTEGER NOT NULL REFERENCES profiles (id) ON DELETE CASCADE,
+    PRIMARY KEY (skill, profile_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_profile_skills_profile ON profile_skills (profile_id);
+CREATE TABLE IF NOT EXISTS match_results (
+    id INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles (id) ON DELETE CASCADE,
+    job_hash TEXT NOT NULL,
+    job_title TEXT,
+    match_score REAL NOT NULL,
+    result TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (profile_id, job_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_match_results_score ON match_results (profile_id, match_score DESC);
+"""
+
+_PROFILE_COLUMNS = """
+    p.id, p.document_id, d.candidate_id, d.content_hash, d.filename,
+    p.skills, p.experience, p.education, p.created_at
+"""
+
+
+def job_hash(job_description: str) -> str:
+    """Hash of a job description, ignoring case and whitespace differences"""
+    return content_hash(re.sub(r"\s+", " ", job_description).strip().lower().encode("utf-8"))
+
+
+def _profile(row) -> Dict:
+    return {
+        "id": row["id"],
+        "document_id": row["document_id"],
+        "candidate_id": row["candidate_id"],
+        "content_hash": row["content_hash"],
+        "filename": row["filename"],
+        "skills": json.loads(row["skills"]),
+        "experience": json.loads(row["experience"]),
+        "education": json.loads(row["education"]),
+        "created_at": row["created_at"],
+    }
+
+
+def _match(row) -> Dict:
+    return {
+        "profile_id": row["profile_id"],
+        "job_hash": row["job_hash"],
+        "job_title": row["job_title"],
+        "match_score": row["match_score"],
+        "result": json.loads(row["result"]),
+        "created_at": row["created_at"],
+    }
+
+
+class ProfileStore(SQLiteStore):
+    """
+    Persistent candidates, uploaded documents, extracted profiles and match
+    results. Documents are keyed by content hash, so re-uploading a resume
+    returns the stored profile instead of running the models again.
+    """
+
+    SCHEMA = SCHEMA
+
+    def add_candidate(self, name: Optional[str] = None, email: Optional[str] = None) -> int:
+        """Create a candidate, or return the existing one with the same email"""
+        with self._lock, self._conn:
+            if email:
+                row = self._conn.execute("SELECT id FROM candidates WHERE email = ?", (email,)).fetchone()
+                if row:
+                    return row["id"]
+            return self._conn.execute(
+                "INSERT INTO candidates (name, email) VALUES (?, ?)", (name, email)
+            ).lastrowid
+
+    def save_profiles(self, records: Iterable[Dict]) -> List[int]:
+        """
+        Bulk insert documents and their extracted profiles in one transaction.
+        Each record has content_hash, text, skills, experience, education and
+        optionally filename and candidate_id. Returns profile ids in order.
+        """
+        records = list(records)
+        if not records:
+            return []
+        taxonomy = get_taxonomy()
+        hashes = [record["content_hash"] for record in records]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO documents (candidate_id, content_hash, filename, text) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (content_hash) DO UPDATE SET "
+                "candidate_id = COALESCE(excluded.candidate_id, candidate_id), "
+                "filename = COALESCE(excluded.filename, filename)",
+                [(r.get("candidate_id"), r["content_hash"], r.get("filename"), r["text"]) for r in records],
+            )
+            document_ids = self._ids_by_hash(hashes)
+            self._conn.executemany(
+                "INSERT INTO profiles (document_id, skills, experience, education) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (document_id) DO UPDATE SET skills = excluded.skills, "
+                "experience = excluded.experience, education = excluded.education",
+                [
+                    (document_ids[r["content_hash"]], json.dumps(r.get("skills", [])),
+                     json.dumps(r.get("experience", [])), json.dumps(r.get("education", [])))
+                    for r in records
+                ],
+            )
+            profile_ids = dict(self._conn.execute(
+                f"SELECT document_id, id FROM profiles WHERE document_id IN ({','.join('?' * len(document_ids))})",
+                list(document_ids.values()),
+            ).fetchall())
+            ids = [profile_ids[document_ids[h]] for h in hashes]
+            self._conn.executemany("DELETE FROM profile_skills WHERE profile_id = ?", [(i,) for i in set(ids)])
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO profile_skills (skill, profile_id) VALUES (?, ?)",
+                [
+                    (taxonomy.key(skill), profile_id)
+                    for profile_id, record in zip(ids, records)
+                    for skill in record.get("skills", []) if skill and skill.strip()
+                ],
+            )
+        return ids
+
+    def _ids_by_hash(self, hashes: List[str]) -> Dict[str, int]:
+        unique = list(dict.fromkeys(hashes))
+        rows = self._conn.execute(
+            f"SELECT content_hash, id FROM documents WHERE content_hash IN ({','.join('?' * len(unique))})",
+            unique,
+        ).fetchall()
+        return {row["content_hash"]: row["id"] for row in rows}
+
+    def save_profile(self, content_hash: str, text: str, analysis: Dict, filename: Optional[str] = None,
+                     candidate_id: Optional[int] = None) -> int:
+        record = {
+            "content_hash": content_hash,
+            "text": text,
+            "filename": filename,
+            "candidate_id": candidate_id,
+            "skills": analysis.get("skills", []),
+            "experience": analysis.get("experience", []),
+            "education": analysis.get("education", []),
+        }
+        return self.save_profiles([record])[0]
+
+    def get_profile(self, profile_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_PROFILE_COLUMNS} FROM profiles p JOIN documents d ON d.id = p.document_id WHERE p.id = ?",
+                (profile_id,),
+            ).fetchone()
+        return _profile(row) if row else None
+
+    def get_profile_by_hash(self, content_hash: str) -> Optional[Dict]:
+        """Stored profile of a previously analyzed document, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_PROFILE_COLUMNS} FROM documents d JOIN profiles p ON p.document_id = d.id "
+                "WHERE d.content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+        return _profile(row) if row else None
+
+    def list_profiles(self, skills: Optional[List[str]] = None, candidate_id: Optional[int] = None,
+                      page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Profiles newest first, optionally only those having all of `skills`"""
+        query = f"SELECT {_PROFILE_COLUMNS} FROM profiles p JOIN documents d ON d.id = p.document_id"
+        conditions, params = [], []
+        keys = list(dict.fromkeys(get_taxonomy().key(skill) for skill in skills or [] if skill.strip()))
+        if keys:
+            conditions.append(
+                f"p.id IN (SELECT profile_id FROM profile_skills WHERE skill IN ({','.join('?' * len(keys))}) "
+                "GROUP BY profile_id HAVING COUNT(*) = ?)"
+            )
+            params += keys + [len(keys)]
+        if candidate_id is not None:
+            conditions.append("d.candidate_id = ?")
+            params.append(candidate_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY p.id DESC"
+        return self._paginate(query, params, page, page_size, _profile)
+
+    def get_match(self, profile_id: int, job_hash: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM match_results WHERE profile_id = ? AND job_hash = ?", (profile_id, job_hash)
+            ).fetchone()
+        return _match(row) if row else None
+
+    def save_matches(self, profile_id: int, matches: Iterable[Tuple[str, Optional[str], Dict]]) -> int:
+        """Bulk upsert (job_hash, job_title, result) match results for a profile"""
+        rows = [
+            (profile_id, job, title, float(result.get("match_score", 0.0)), json.dumps(result))
+            for job, title, result in matches
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO match_results (profile_id, job_hash, job_title, match_score, result) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (profile_id, job_hash) DO UPDATE SET "
+                "job_title = excluded.job_title, match_score = excluded.match_score, result = excluded.result",
+                rows,
+            )
+        return len(rows)
+
+    def list_matches(self, profile_id: int, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Match results of a profile, best score first"""
+        return self._paginate(
+            "SELECT * FROM match_results WHERE profile_id = ? ORDER BY match_score DESC",
+            [profile_id], page, page_size, _match,
+        )
@@ -0,0 +1,216 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import argparse
+import logging
+import os
+
+import numpy as np
+
+from app.core.embeddings import get_embedder
+from app.core.skill_taxonomy import get_taxonomy
+from app.core.storage import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_PATH = os.path.join("data", "question_bank.db")
+SENIORITY_LEVELS = ("junior", "mid", "senior")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    skill TEXT NOT NULL,
+    seniority TEXT NOT NULL,
+    text TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    UNIQUE (skill, seniority, text)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_skill ON questions (skill, seniority);
+"""
+
+
+def skill_key(skill: str) -> str:
+    """Lowercased canonical name, so "JS" and "JavaScript" share questions"""
+    return get_taxonomy().key(skill)
+
+
+# Generates questions for (items, seniority) -> {item: [questions]}
+QuestionGenerator = Callable[[List[str], str], Dict[str, List[str]]]
+
+
+class QuestionBank(SQLiteStore):
+    """
+    Precomputed interview questions indexed by skill, with an embedding per
+    question for similarity ranking against a candidate profile.
+    """
+
+    SCHEMA = SCHEMA
+
+    def __init__(self, db_path: Optional[str] = None):
+        super().__init__(db_path or os.getenv("HIREFIT_QUESTION_BANK_PATH", DEFAULT_BANK_PATH))
+
+    def add_questions(self, skill: str, seniority: str, questions: List[str]) -> int:
+        """Embed and store questions for a skill; returns the number of new rows"""
+        questions = [q.strip() for q in questions if q and q.strip()]
+        if not questions:
+            return 0
+        embeddings = get_embedder().encode(questions)
+        rows = [
+            (skill_key(skill), seniority, question, embedding.tobytes())
+            for question, embedding in zip(questions, embeddings)
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO questions (skill, seniority, text, embedding) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def known_skills(self, skills: Iterable[str]) -> set:
+        keys = list({skill_key(skill) for skill in skills})
+        if not keys:
+            return set()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT skill FROM questions WHERE skill IN ({placeholders})", keys
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def known_levels(self, skills: Iterable[str]) -> Set[Tuple[str, str]]:
+        """(skill key, seniority) pairs that already have questions"""
+        keys = list({skill_key(skill) for skill in skills})
+        if not keys:
+            return set()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT skill, seniority FROM questions WHERE skill IN ({placeholders})", keys
+            ).fetchall()
+        return {(row[0], row[1]) for row in rows}
+
+    def _lookup(self, skills: List[str], seniority: str) -> Dict[str, List[tuple]]:
+        """Questions per skill, preferring the requested seniority when it has any"""
+        placeholders = ",".join("?" * len(skills))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT skill, seniority, text, embedding FROM questions WHERE skill IN ({placeholders})",
+                skills,
+            ).fetchall()
+        by_skill: Dict[str, List[tuple]] = {}
+        for skill, level, text, embedding in rows:
+            by_skill.setdefault(skill, []).append((level, text, embedding))
+        for skill, entries in by_skill.items():
+            exact = [entry for entry in entries if entry[0] == seniority]
+            by_skill[skill] = exact or entries
+        return by_skill
+
+    def assemble(self, resume_analysis: Dict, seniority: str, limit: int = 20,
+                 generator: Optional[QuestionGenerator] = None) -> Dict:
+        """
+        Build a personalised question set: look up questions for each of the
+        candidate's skills, rank them by similarity to the profile and
+        interleave skills so the set covers as many of them as possible.
+        Skills missing from the bank are generated with `generator` (if given)
+        and written back so the next candidate gets them from the bank.
+        """
+        skills = list(dict.fromkeys(skill_key(s) for s in resume_analysis.get("skills", []) if s and s.strip()))
+        if not skills:
+            return {"questions": [], "generated": []}
+
+        generated = []
+        known = self.known_skills(skills)
+        unseen = [skill for skill in skills if skill not in known]
+        if unseen and generator is not None:
+            for skill, questions in generator(unseen, seniority).items():
+                if self.add_questions(skill, seniority, questions):
+                    generated.append(skill_key(skill))
+
+        by_skill = self._lookup(skills, seniority)
+        if not by_skill:
+            return {"questions": [], "generated": generated}
+
+        profile_text = ", ".join(resume_analysis.get("skills", []))
+        experience = resume_analysis.get("experience", [])
+        if experience:
+            profile_text += ". " + ". ".join(experience[:3])
+        profile = get_embedder().encode_one(profile_text)
+
+        ranked: Dict[str, List[tuple]] = {}
+        for skill, entries in by_skill.items():
+            matrix = np.frombuffer(b"".join(entry[2] for entry in entries), dtype=np.float32)
+            scores = matrix.reshape(len(entries), -1) @ profile
+            order = np.argsort(-scores)
+            ranked[skill] = [(float(scores[i]), entries[i][1]) for i in order]
+
+        # Round-robin over skills (in the candidate's order), best question first
+        questions = []
+        depth = 0
+        while len(questions) < limit and any(depth < len(v) for v in ranked.values()):
+            round_items = [ranked[s][depth] for s in skills if s in ranked and depth < len(ranked[s])]
+            round_items.sort(key=lambda item: -item[0])
+            questions.extend(text for _, text in round_items)
+            depth += 1
+        return {"questions": questions[:limit], "generated": generated}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+
+def build(bank: QuestionBank, skills: List[str], generator: QuestionGenerator,
+          levels: Iterable[str] = SENIORITY_LEVELS, rebuild: bool = False) -> int:
+    """
+    Populate the bank for every (skill, seniority); pairs that already have
+    questions are skipped unless rebuilding, so an interrupted build resumes
+    """
+    added = 0
+    known = set() if rebuild else bank.known_levels(skills)
+    for level in levels:
+        pending = [skill for skill in skills if (skill_key(skill), level) not in known]
+        if not pending:
+            continue
+        logger.info(f"Generating {level} questions for {len(pending)} skills")
+        for skill, questions in generator(pending, level).items():
+            added += bank.add_questions(skill, level, questions)
+    return added
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Offline build step for the interview question bank"""
+    from app.core.inference_server import RemoteAnalyzer
+    from app.core.resume_analyzer import ResumeAnalyzer
+
+    parser = argparse.ArgumentParser(description="Build the interview question bank")
+    parser.add_argument("--db", help="Bank path (default: $HIREFIT_QUESTION_BANK_PATH or data/question_bank.db)")
+    parser.add_argument("--skills-file", help="File with one skill per line (default: skills in the taxonomy)")
+    parser.add_argument("--per-skill", type=int, default=3, help="Questions per skill and seniority")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate skills already in the bank")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.skills_file:
+        with open(args.skills_file) as f:
+            skills = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    else:
+        skills = get_taxonomy().skill_names()
+
+    bank = QuestionBank(args.db)
+    inference_address = os.getenv("HIREFIT_INFERENCE_ADDRESS")
+    if inference_address:
+        # Share the running inference process, behind all interactive and batch work
+        analyzer = RemoteAnalyzer(inference_address)
+        options = {"priority": "background", "tenant": "question-bank"}
+    else:
+        analyzer = ResumeAnalyzer()
+        options = {}
+    added = build(
+        bank, skills,
+        lambda items, level: analyzer.generate_questions_for_items(items, level, per_item=args.per_skill, **options),
+        rebuild=args.rebuild,
+    )
+    print(f"Added {added} questions; bank now holds {bank.count()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,58 +1,102 @@
-from typing import Dict, List, Optional
-import PyPDF2
-from docx import Document
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from collections import OrderedDict
 import os
-from langchain_community.llms import CTransformers
 from langchain_core.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from dotenv import load_dotenv
 import json
-import requests
 from pathlib import Path
 import re
 import logging
 import traceback
+import threading
+import time
+from app.core.inference import load_llm, load_small_llm, default_threads, resolve_task_tiers, batch_sequences
+from app.core.rule_extractor import RuleBasedExtractor
+from app.core.match_scorer import JobInput, MatchScorer, resume_seniority
+from app.core.experience_extractor import ExperienceExtractor
+from app.core.resume_parser import HEADER_SECTION, ResumeDocument, ResumeParser
+from app.core.model_store import ModelStore
+from app.core.skill_taxonomy import get_taxonomy
+from app.utils.file_processor import FileProcessor
+from app.utils.limits import get_limits
 
-# Configure logging with more detail
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Items sent to the model per question generation call; keeps the JSON
+# answer within max_new_tokens
+QUESTION_BATCH_SIZE = 4
+QUESTION_CACHE_SIZE = 2048
+# Deterministic match scores at or above PASS / at or below FAIL are taken
+# as final; only the band in between is sent to the model
+MATCH_PASS_THRESHOLD = 0.8
+MATCH_FAIL_THRESHOLD = 0.3
+# Sections that carry nothing the extraction prompt asks for; the header
+# (name, contact details) is skipped too unless the resume has no headings
+EXTRACTION_SKIP_SECTIONS = {"interests", "references"}
+# Sections the one-shot match score sends to the model
+MATCH_SECTIONS = ("experience", "skills")
+
+
+def failed_match() -> Dict:
+    """
+    Placeholder match when neither the scorer nor the model produced one;
+    "method": "failed" keeps it out of the stored matches so it is retried
+    """
+    return {
+        "match_score": 0.0,
+        "skill_gaps": [],
+        "suggestions": [],
+        "matching_skills": [],
+        "relevant_experience": [],
+        "method": "failed",
+    }
+
+
 class ResumeAnalyzer:
-    def __init__(self):
+    def __init__(self, tiers: Optional[Dict[str, str]] = None):
         logger.info("Initializing ResumeAnalyzer...")
         try:
-            # Initialize model configuration
-            model_path = "models"
-            model_file = "mistral-7b-instruct-v0.1.Q4_K_M.gguf"
-            full_path = os.path.join(model_path, model_file)
+            # Route each task to a model tier (large / small / rules)
+            self.tiers = resolve_task_tiers(tiers)
+            logger.info(f"Model tiers: {self.tiers}")
 
-            # Create models directory if it doesn't exist
-            os.makedirs(model_path, exist_ok=True)
-
-            # Download model if it doesn't exist
-            if not os.path.exists(full_path):
-                logger.info("Downloading Mistral model... This might take a few minutes...")
-                self._download_model(model_file, full_path)
+            # Fetch the model into the shared artifact cache if it isn't there yet
+            full_path = ModelStore().ensure_artifact("mistral-7b-instruct")
 
             # Initialize the model with optimized settings for performance
             logger.info("Loading the model...")
-            self.llm = CTransformers(
-                model=full_path,
-                model_type="mistral",
-                config={
-                    'max_new_tokens': 256,  # Reduced for faster responses
-                    'temperature': 0.1,
-                    'context_length': 1024,  # Balanced for performance
-                    'gpu_layers': 0,
-                    'threads': max(4, os.cpu_count() - 2) if os.cpu_count() else 4,  # Optimize thread count
-                    'batch_size': 8,  # Increased for better throughput
-                    'top_k': 30,  # Added for faster sampling
-                    'top_p': 0.1  # Added for focused sampling
-                }
-            )
+            self.llm_config = {
+                'max_new_tokens': 256,  # Reduced for faster responses
+                'temperature': 0.1,
+                'context_length': 1024,  # Balanced for performance
+                'gpu_layers': 0,
+                'threads': default_threads(),  # Optimize thread count
+                'batch_size': 8,  # Increased for better throughput
+                'top_k': 30,  # Added for faster sampling
+                'top_p': 0.1,  # Added for focused sampling
+                # Keep the weights file-backed so forked workers share the pages
+                'mmap': True
+            }
+            self.llm = load_llm(full_path, config=self.llm_config)
+            # Analyses that may call the models at the same time; above 1 the
+            # models run in the batching engine, which merges their prompts
+            self.concurrency = batch_sequences()
+            self.models = {"large": self.llm}
+            if "small" in self.tiers.values():
+                logger.info("Loading the small model...")
+                self.models["small"] = load_small_llm(self.llm_config)
+            self.taxonomy = get_taxonomy()
+            self.rule_extractor = RuleBasedExtractor(self.taxonomy)
+            self.experience_extractor = ExperienceExtractor(self.taxonomy)
+            self.match_scorer = MatchScorer(taxonomy=self.taxonomy)
+            self.match_pass_threshold = float(os.getenv("HIREFIT_MATCH_PASS_THRESHOLD", MATCH_PASS_THRESHOLD))
+            self.match_fail_threshold = float(os.getenv("HIREFIT_MATCH_FAIL_THRESHOLD", MATCH_FAIL_THRESHOLD))
+            self._match_stats = {"passed": 0, "failed": 0, "model": 0}
+            self._match_stats_lock = threading.Lock()
+            # Questions per (item, seniority); shared across candidates
+            self._question_cache: "OrderedDict[Tuple[str, str], List[str]]" = OrderedDict()
+            self._question_cache_lock = threading.Lock()
             logger.info("Model loaded successfully")
             self._setup_prompts()
         except Exception as e:
@@ -120,49 +164,79 @@ Format as JSON:
 [/INST]</s>"""
         )
 
-    def _chunk_text(self, text: str, max_chunk_size: int = 800) -> List[str]:
-        """Split text into chunks while preserving semantic boundaries"""
-        # First, clean and normalize the text
-        text = re.sub(r'\s+', ' ', text).strip()  # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)    # Normalize multiple newlines
-        
-        # Split on common resume section headers
-        section_patterns = [
-            r'EDUCATION|ACADEMIC|QUALIFICATION',
-            r'EXPERIENCE|EMPLOYMENT|WORK HISTORY',
-            r'SKILLS|EXPERTISE|COMPETENCIES',
-            r'PROJECTS|ACHIEVEMENTS',
-            r'CERTIFICATIONS|CERTIFICATES',
-            r'LANGUAGES|INTERESTS'
-        ]
-        pattern = f"({('|'.join(section_patterns))})"
-        sections = re.split(f"(?i){pattern}", text)
-        
+        self.interview_questions_prompt = PromptTemplate(
+            input_variables=["items", "seniority", "per_item"],
+            template="""<s>[INST] Write {per_item} short technical interview questions for a {seniority} level candidate about each item below. One sentence per question.
+
+Items:
+{items}
+
+Format as JSON, using each item exactly as written as the key:
+{{
+    "questions": {{
+        "item1": ["question1", "question2"],
+        "item2": ["question1", "question2"]
+    }}
+}}
+[/INST]</s>"""
+        )
+
+    def _llm_for(self, task: str):
+        """Return the model serving a task, or None when it runs on the rule based path"""
+        tier = self.tiers.get(task, "large")
+        if tier == "rules":
+            return None
+        return self.models[tier]
+
+    @staticmethod
+    def _section_pieces(document: ResumeDocument, max_chunk_size: int) -> List[str]:
+        """
+        Sections to extract from, in document order. A section over
+        `max_chunk_size` words is split between entries (and an oversized
+        entry between words), each piece keeping the section heading.
+        """
+        named = any(section.name != HEADER_SECTION for section in document.sections)
+        pieces = []
+        for section in document.sections:
+            if section.name in EXTRACTION_SKIP_SECTIONS or (named and section.name == HEADER_SECTION):
+                continue
+            section_text = document.section_text(section)
+            if len(section_text.split()) <= max_chunk_size:
+                pieces.append(section_text)
+                continue
+            heading = section.heading.text if section.heading else ""
+            budget = max(1, max_chunk_size - len(heading.split()))
+            for entry in section.entries:
+                words = document.text[entry.start:entry.end].split(" ")
+                for i in range(0, len(words), budget):
+                    pieces.append(f"{heading}\n{' '.join(words[i:i + budget])}".strip())
+        return pieces
+
+    def _chunk_text(self, text: Union[str, ResumeDocument], max_chunk_size: int = 800) -> List[str]:
+        """
+        Split resume text (or its parsed document) into chunks of whole
+        sections, as parsed by ResumeParser. Line breaks, bullets and dates
+        are kept, and sections the extraction prompt doesn't need are left out.
+        """
+        document = text if isinstance(text, ResumeDocument) else ResumeParser.parse(text)
+        pieces = self._section_pieces(document, max_chunk_size)
+
         chunks = []
         current_chunk = []
         current_size = 0
-        
-        for section in sections:
-            section = section.strip()
-            if not section:
-                continue
-                
-            section_size = len(section.split())
-            
-            if current_size + section_size > max_chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [section]
-                current_size = section_size
+        for piece in pieces:
+            piece_size = len(piece.split())
+            if current_size + piece_size > max_chunk_size and current_chunk:
+                chunks.append('\n\n'.join(current_chunk))
+                current_chunk = [piece]
+                current_size = piece_size
             else:
-                current_chunk.append(section)
-                current_size += section_size
-        
+                current_chunk.append(piece)
+                current_size += piece_size
+
         if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        
-        # Ensure we don't have empty chunks
-        chunks = [chunk for chunk in chunks if chunk.strip()]
-        
+            chunks.append('\n\n'.join(current_chunk))
+
         return chunks
 
     def _merge_results(self, results: List[Dict]) -> Dict:
@@ -178,8 +252,12 @@ Format as JSON:
         if len(results) == 1:
             return merged
 
+        merge_llm = self._llm_for("merge")
+        if merge_llm is None:
+            return self.rule_extractor.merge(results)
+
         # For multiple chunks, use the summary prompt to combine them
-        summary_chain = LLMChain(llm=self.llm, prompt=self.summary_prompt)
+        summary_chain = LLMChain(llm=merge_llm, prompt=self.summary_prompt)
         
         for next_result in results[1:]:
             try:
@@ -202,23 +280,173 @@ Format as JSON:
         
         return merged
 
-    def analyze_resume(self, resume_text: str, job_description: Optional[str] = None) -> Dict:
+    def _count_match(self, outcome: str) -> None:
+        with self._match_stats_lock:
+            self._match_stats[outcome] += 1
+
+    def screen_match(self, basic_info: Dict, job_description: JobInput) -> Optional[Dict]:
+        """
+        Cheap first stage of the match: the deterministic MatchScorer score
+        and skill gaps when the score is a clear pass or fail, None when it
+        falls in the ambiguous band and the model should decide. A job with
+        no recognized skills, or a score without the semantic signal, always
+        goes to the model: the score alone can't be trusted there.
+        """
+        try:
+            if isinstance(job_description, dict):
+                job = job_description
+            else:
+                job = self.match_scorer.job_from_text(job_description)
+            result = self.match_scorer.score(basic_info, job)
+        except Exception as e:
+            logger.error(f"Error in match screening: {str(e)}")
+            return None
+        components = result["components"]
+        if components["required_coverage"] is None and components["preferred_coverage"] is None:
+            return None
+        if components["semantic"] is None:
+            return None
+        score = result["match_score"]
+        if self.match_fail_threshold < score < self.match_pass_threshold:
+            return None
+        self._count_match("passed" if score >= self.match_pass_threshold else "failed")
+        return {
+            "match_score": score,
+            "skill_gaps": result["skill_gaps"][:5],
+            "suggestions": result["suggestions"][:3],
+            "matching_skills": result["matching_skills"][:5],
+            "relevant_experience": [],
+            "method": "scorer",
+        }
+
+    def match_stats(self) -> Dict:
+        """How many matches were decided by the scorer instead of the model"""
+        with self._match_stats_lock:
+            stats = dict(self._match_stats)
+        total = sum(stats.values())
+        short_circuited = stats["passed"] + stats["failed"]
+        return {
+            "total": total,
+            "short_circuited": short_circuited,
+            "short_circuit_rate": round(short_circuited / total, 4) if total else 0.0,
+            "by_outcome": stats,
+            "thresholds": {"pass": self.match_pass_threshold, "fail": self.match_fail_threshold},
+        }
+
+    def analyze_match(self, basic_info: Dict, job_description: JobInput, screen: bool = True) -> Dict:
+        """
+        Match an extracted profile against a job description. Clear passes
+        and fails are settled by screen_match; `screen=False` skips that
+        stage when the caller already ran it.
+        """
+        if screen:
+            screened = self.screen_match(basic_info, job_description)
+            if screened is not None:
+                return screened
+        self._count_match("model")
+        match_analysis = None
+        try:
+            logger.info("Starting job description analysis")
+            match_chain = LLMChain(llm=self._llm_for("match"), prompt=self.match_analysis_prompt)
+
+            # Prepare comprehensive resume summary
+            resume_summary = {
+                "skills": basic_info.get("skills", []),
+                "experience": basic_info.get("experience", []),
+                "education": basic_info.get("education", [])
+            }
+            if basic_info.get("years_experience") is not None:
+                resume_summary["years_experience"] = basic_info["years_experience"]
+
+            # Clean and format job description; a stored profile sends its short summary instead
+            if isinstance(job_description, dict):
+                job_desc_clean = job_description["summary"]
+            else:
+                job_desc_clean = re.sub(r'\s+', ' ', job_description).strip()
+
+            match_response = match_chain.invoke({
+                "resume_text": json.dumps(resume_summary),
+                "job_description": job_desc_clean
+            })
+
+            if isinstance(match_response, dict) and 'text' in match_response:
+                match_text = match_response['text']
+            else:
+                match_text = str(match_response)
+
+            match_analysis = self._parse_llm_response(match_text)
+            if not match_analysis:
+                logger.error("Job matching returned no parseable result")
+            else:
+                # Ensure match_score is a float between 0 and 1
+                try:
+                    match_score = float(match_analysis.get("match_score", 0.0))
+                    match_score = max(0.0, min(1.0, match_score))  # Clamp between 0 and 1
+                except (ValueError, TypeError):
+                    match_score = 0.0
+
+                match_analysis = {
+                    "match_score": match_score,
+                    "skill_gaps": match_analysis.get("skill_gaps", [])[:5],
+                    "suggestions": match_analysis.get("suggestions", [])[:3],
+                    "matching_skills": match_analysis.get("matching_skills", [])[:5],
+                    "relevant_experience": match_analysis.get("relevant_experience", [])[:3],
+                    "method": "model"
+                }
+                logger.info(f"Job description analysis completed with match score: {match_analysis['match_score']}")
+        except Exception as e:
+            logger.error(f"Error in job matching: {str(e)}")
+            logger.error(traceback.format_exc())
+            match_analysis = None
+        return match_analysis or failed_match()
+
+    def analyze_resume(self, resume_text: str, job_description: Optional[JobInput] = None) -> Dict:
         """Analyze resume and return structured data"""
+        result = None
+        for event in self.analyze_resume_iter(resume_text, job_description):
+            if event["event"] == "result":
+                result = event["data"]
+        return result
+
+    def analyze_resume_iter(self, resume_text: str, job_description: Optional[JobInput] = None) -> Iterator[Dict]:
+        """
+        Analyze resume step by step, yielding events as work completes:
+            {"event": "progress", "stage": "extraction", "done": i, "total": n, "partial": {...}}
+            {"event": "progress", "stage": "match", "partial": {...}}
+            {"event": "result", "data": {"basic_info": {...}, "match_analysis": {...}}}
+        "partial" is the profile merged so far, so callers can show results early.
+        """
         try:
             logger.info("Starting resume analysis")
             
-            # Clean the resume text
-            resume_text = re.sub(r'\s+', ' ', resume_text).strip()
-            
-            # Split resume into chunks
-            chunks = self._chunk_text(resume_text)
-            logger.info(f"Split resume into {len(chunks)} chunks")
-            
-            # Process each chunk with timeout
+            document = ResumeParser.parse(resume_text)
+            limits = get_limits()
+            # Model time spent on this resume; waiting for a scheduler slot doesn't count
+            model_seconds = 0.0
             chunk_results = []
-            skill_chain = LLMChain(llm=self.llm, prompt=self.skill_extraction_prompt)
-            
+            extraction_llm = self._llm_for("extraction")
+            if extraction_llm is None:
+                # The rule based path is cheap enough to run on the whole resume at once
+                chunk_results.append(self.rule_extractor.extract(re.sub(r'\s+', ' ', resume_text).strip()))
+                chunks = []
+                yield {"event": "progress", "stage": "extraction", "done": 1, "total": 1,
+                       "partial": chunk_results[0]}
+            else:
+                # Split resume into chunks
+                chunks = self._chunk_text(document)
+                logger.info(f"Split resume into {len(chunks)} chunks")
+                # Every chunk is a model call; one oversized resume must not hold the model indefinitely
+                if len(chunks) > limits.max_chunks:
+                    logger.warning(f"Resume has {len(chunks)} chunks; analyzing the first {limits.max_chunks}")
+                    chunks = chunks[:limits.max_chunks]
+                skill_chain = LLMChain(llm=extraction_llm, prompt=self.skill_extraction_prompt)
+
+            # Process each chunk with timeout
             for i, chunk in enumerate(chunks, 1):
+                if model_seconds > limits.max_analysis_seconds:
+                    logger.warning(f"Analysis time budget spent; skipping chunks {i}-{len(chunks)}")
+                    break
+                chunk_start = time.monotonic()
                 try:
                     logger.info(f"Processing chunk {i}/{len(chunks)}")
                     response = skill_chain.invoke({"resume_text": chunk})
@@ -231,14 +459,19 @@ Format as JSON:
                     chunk_result = self._parse_llm_response(response_text)
                     if chunk_result:
                         # Remove duplicates within the chunk
-                        for key in ['skills', 'experience', 'education']:
+                        for key in ['experience', 'education']:
                             if key in chunk_result:
                                 chunk_result[key] = list(dict.fromkeys(chunk_result[key]))
+                        # "JS", "Javascript" and "JavaScript ES6" are one skill
+                        chunk_result['skills'] = self.taxonomy.canonicalize(chunk_result.get('skills', []) or [])
                         chunk_results.append(chunk_result)
                         logger.info(f"Successfully processed chunk {i}")
                 except Exception as e:
                     logger.error(f"Error processing chunk {i}: {str(e)}")
-                    continue
+                model_seconds += time.monotonic() - chunk_start
+                # Cheap rule based merge for the preview; the final merge uses the merge tier
+                yield {"event": "progress", "stage": "extraction", "done": i, "total": len(chunks),
+                       "partial": self.rule_extractor.merge(chunk_results)}
             
             # Merge results from all chunks
             basic_info = self._merge_results(chunk_results)
@@ -248,91 +481,36 @@ Format as JSON:
                     "experience": [],
                     "education": []
                 }
+            basic_info["skills"] = self.taxonomy.canonicalize(basic_info.get("skills", []) or [])
+            # Tenure and degree level by date arithmetic, whichever tier extracted the lists
+            career = self.experience_extractor.extract(document)
+            basic_info["years_experience"] = career["years_experience"]
+            basic_info["skill_years"] = career["skill_years"]
+            basic_info["highest_degree"] = career["highest_degree"]
             
             # Process job description if provided
             match_analysis = None
             if job_description:
-                try:
-                    logger.info("Starting job description analysis")
-                    match_chain = LLMChain(llm=self.llm, prompt=self.match_analysis_prompt)
-                    
-                    # Prepare comprehensive resume summary
-                    resume_summary = {
-                        "skills": basic_info.get("skills", []),
-                        "experience": basic_info.get("experience", []),
-                        "education": basic_info.get("education", [])
-                    }
-                    
-                    # Clean and format job description
-                    job_desc_clean = re.sub(r'\s+', ' ', job_description).strip()
-                    
-                    match_response = match_chain.invoke({
-                        "resume_text": json.dumps(resume_summary),
-                        "job_description": job_desc_clean
-                    })
-                    
-                    if isinstance(match_response, dict) and 'text' in match_response:
-                        match_text = match_response['text']
-                    else:
-                        match_text = str(match_response)
-                    
-                    match_analysis = self._parse_llm_response(match_text)
-                    if match_analysis:
-                        # Ensure match_score is a float between 0 and 1
-                        try:
-                            match_score = float(match_analysis.get("match_score", 0.0))
-                            match_score = max(0.0, min(1.0, match_score))  # Clamp between 0 and 1
-                        except (ValueError, TypeError):
-                            match_score = 0.0
-                            
-                        match_analysis = {
-                            "match_score": match_score,
-                            "skill_gaps": match_analysis.get("skill_gaps", [])[:5],
-                            "suggestions": match_analysis.get("suggestions", [])[:3],
-                            "matching_skills": match_analysis.get("matching_skills", [])[:5],
-                            "relevant_experience": match_analysis.get("relevant_experience", [])[:3]
-                        }
-                    logger.info(f"Job description analysis completed with match score: {match_analysis.get('match_score', 0.0)}")
-                except Exception as e:
-                    logger.error(f"Error in job matching: {str(e)}")
-                    logger.error(traceback.format_exc())
-                    match_analysis = {
-                        "match_score": 0.0,
-                        "skill_gaps": [],
-                        "suggestions": [],
-                        "matching_skills": [],
-                        "relevant_experience": []
-                    }
+                yield {"event": "progress", "stage": "match", "partial": basic_info}
+                match_analysis = self.analyze_match(basic_info, job_description)
             
             logger.info("Resume analysis completed successfully")
-            return {
+            yield {"event": "result", "data": {
                 "basic_info": basic_info,
-                "match_analysis": match_analysis if match_analysis is not None else {
-                    "match_score": 0.0,
-                    "skill_gaps": [],
-                    "suggestions": [],
-                    "matching_skills": [],
-                    "relevant_experience": []
-                }
-            }
+                "match_analysis": match_analysis if match_analysis is not None else failed_match()
+            }}
             
         except Exception as e:
             logger.error(f"Error in analyze_resume: {str(e)}")
             logger.error(traceback.format_exc())
-            return {
+            yield {"event": "result", "data": {
                 "basic_info": {
                     "skills": [],
                     "experience": [],
                     "education": []
                 },
-                "match_analysis": {
-                    "match_score": 0.0,
-                    "skill_gaps": [],
-                    "suggestions": [],
-                    "matching_skills": [],
-                    "relevant_experience": []
-                }
-            }
+                "match_analysis": failed_match()
+            }}
 
     def _parse_llm_response(self, response: str) -> Dict:
         """Parse LLM response and ensure it's a valid JSON"""
@@ -353,71 +531,105 @@ Format as JSON:
             logger.error(traceback.format_exc())
             return {}
 
-    def _download_model(self, model_file: str, full_path: str):
-        """Download the Mistral model"""
-        url = f"https://huggingface.co/TheBloke/Mistral-7B-Instruct-v0.1-GGUF/resolve/main/{model_file}"
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            total_size = int(response.headers.get('content-length', 0))
-            
-            with open(full_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            print("Model downloaded successfully!")
-        except Exception as e:
-            print(f"Error downloading model: {str(e)}")
-            raise
-
     def extract_text_from_file(self, file_path: str) -> str:
         """Extract text from PDF or DOCX file"""
-        if file_path.endswith('.pdf'):
-            return self._extract_text_from_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            return self._extract_text_from_docx(file_path)
+        return FileProcessor.extract_text(file_path)
+
+    infer_seniority = staticmethod(resume_seniority)
+
+    @staticmethod
+    def _question_items(resume_analysis: Dict, max_items: int) -> List[str]:
+        """Skills first, then the most recent experience entries"""
+        items = [str(skill).strip() for skill in resume_analysis.get("skills", [])]
+        items += [str(exp).strip() for exp in resume_analysis.get("experience", [])[:2]]
+        unique = OrderedDict((item.lower(), item) for item in items if item)
+        return list(unique.values())[:max_items]
+
+    def _cached_questions(self, key: Tuple[str, str]) -> Optional[List[str]]:
+        with self._question_cache_lock:
+            questions = self._question_cache.get(key)
+            if questions is not None:
+                self._question_cache.move_to_end(key)
+            return questions
+
+    def _cache_questions(self, key: Tuple[str, str], questions: List[str]) -> None:
+        with self._question_cache_lock:
+            self._question_cache[key] = questions
+            self._question_cache.move_to_end(key)
+            while len(self._question_cache) > QUESTION_CACHE_SIZE:
+                self._question_cache.popitem(last=False)
+
+    def _generate_question_batch(self, items: List[str], seniority: str, per_item: int) -> Dict[str, List[str]]:
+        """One model call for a batch of items; returns questions keyed by lowercased item"""
+        question_chain = LLMChain(llm=self._llm_for("questions"), prompt=self.interview_questions_prompt)
+        response = question_chain.invoke({
+            "items": "\n".join(f"- {item}" for item in items),
+            "seniority": seniority,
+            "per_item": per_item,
+        })
+        if isinstance(response, dict) and 'text' in response:
+            response_text = response['text']
         else:
-            raise ValueError("Unsupported file format")
+            response_text = str(response)
 
-    def _extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text.strip()
-        except Exception as e:
-            print(f"Error extracting PDF text: {str(e)}")
-            return ""
+        questions = self._parse_llm_response(response_text).get("questions", {})
+        if not isinstance(questions, dict):
+            return {}
+        return {
+            str(item).strip().lower(): [str(q).strip() for q in qs if str(q).strip()][:per_item]
+            for item, qs in questions.items() if isinstance(qs, list)
+        }
 
-    def _extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        try:
-            doc = Document(file_path)
-            return "\n".join([paragraph.text for paragraph in doc.paragraphs]).strip()
-        except Exception as e:
-            print(f"Error extracting DOCX text: {str(e)}")
-            return ""
+    def generate_questions_for_items(self, items: List[str], seniority: str,
+                                     per_item: int = 2) -> Dict[str, List[str]]:
+        """
+        Questions for each item at the given seniority. Questions are cached
+        per (item, seniority), so only items not seen before are sent to the
+        model, batched into as few calls as possible. Items the model failed
+        to answer are left out of the result.
+        """
+        result: Dict[str, List[str]] = {}
+        missing = []
+        for item in items:
+            cached = self._cached_questions((item.lower(), seniority))
+            if cached is not None:
+                result[item] = cached
+            else:
+                missing.append(item)
+        logger.info(f"Interview questions: {len(result)} cached, {len(missing)} to generate")
 
-    def generate_interview_questions(self, resume_analysis: Dict) -> List[str]:
-        """Generate interview questions based on resume analysis"""
-        try:
-            question_chain = LLMChain(llm=self.llm, prompt=self.interview_questions_prompt)
-            response = question_chain.invoke({"resume_analysis": json.dumps(resume_analysis)})
-            result = self._parse_llm_response(response)
-            return result.get("questions", [])
-        except Exception as e:
-            print(f"Error generating interview questions: {str(e)}")
-            return []
+        for start in range(0, len(missing), QUESTION_BATCH_SIZE):
+            batch = missing[start:start + QUESTION_BATCH_SIZE]
+            try:
+                generated = self._generate_question_batch(batch, seniority, per_item)
+            except Exception as e:
+                logger.error(f"Error generating interview questions: {str(e)}")
+                continue
+            for item in batch:
+                questions = generated.get(item.lower())
+                if questions:
+                    self._cache_questions((item.lower(), seniority), questions)
+                    result[item] = questions
+        return result
+
+    def generate_interview_questions(self, resume_analysis: Dict, per_item: int = 2,
+                                     max_items: int = 12) -> List[str]:
+        """Generate a pool of interview questions for the candidate's skills and recent experience"""
+        seniority = self.infer_seniority(resume_analysis)
+        items = self._question_items(resume_analysis, max_items)
+        pool = self.generate_questions_for_items(items, seniority, per_item)
+        questions = []
+        for item in items:
+            # Items without model output are not cached, so they get another chance next time
+            questions.extend(pool.get(item) or [f"Can you walk me through your experience with {item}?"])
+        return questions
 
     def calculate_match_score(self, resume_text: str, job_description: str) -> float:
         """Calculate match score between resume and job description"""
         try:
-            # Use only the first chunk to stay within context limits
-            chunk = self._chunk_text(resume_text)[0]
-            match_chain = LLMChain(llm=self.llm, prompt=self.match_analysis_prompt)
+            # Only the experience and skills sections, to stay within context limits
+            chunk = ResumeParser.parse(resume_text).text_of(MATCH_SECTIONS) or self._chunk_text(resume_text)[0]
+            match_chain = LLMChain(llm=self._llm_for("match"), prompt=self.match_analysis_prompt)
             response = match_chain.invoke({
                 "resume_text": chunk,
                 "job_description": job_description
@@ -0,0 +1,191 @@
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+import re
+
+from app.core.rule_extractor import DATE_RANGE_PATTERN
+
+# Canonical section name -> headings that introduce it (lowercase, without
+# trailing colon)
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "relevant experience",
+                   "employment", "employment history", "work history", "career history"),
+    "education": ("education", "academic background", "academics", "education and training",
+                  "qualifications", "academic qualifications"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "skills and tools",
+               "core competencies", "competencies", "expertise", "technologies", "tools"),
+    "projects": ("projects", "personal projects", "selected projects", "achievements", "accomplishments"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications",
+                       "certifications and licenses", "courses"),
+    "publications": ("publications", "papers"),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies", "hobbies and interests"),
+    "references": ("references",),
+}
+HEADING_NAMES = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+# Text before the first heading (name, title, contact details)
+HEADER_SECTION = "header"
+# Sections whose non-bullet lines each start an entry (a job, a degree)
+ENTRY_SECTIONS = {"experience", "education", "projects", "certifications", "publications"}
+
+# A single year dates an entry that has no range, e.g. "B.S. Physics, 2015"
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+BULLET_PATTERN = re.compile(r"^(?:[•▪●◦○■□➢►‣∙·*]|[-–—](?=\s))\s*")
+# "SKILLS: Python, Go" puts the section's first line on the heading line
+INLINE_HEADING_PATTERN = re.compile(r"^([A-Za-z][A-Za-z &/]{1,40}?)\s*:\s*(\S.*)$")
+MAX_HEADING_WORDS = 4
+
+
+@dataclass
+class Span:
+    """A piece of the document text; `start`/`end` are character offsets into ResumeDocument.text"""
+    text: str
+    start: int
+    end: int
+
+
+@dataclass
+class Entry:
+    """One item of a section: a job, degree or project with its dates and bullets"""
+    start: int
+    end: int
+    lines: List[Span] = field(default_factory=list)
+    dates: List[Span] = field(default_factory=list)
+    bullets: List[Span] = field(default_factory=list)
+
+
+@dataclass
+class Section:
+    name: str
+    start: int
+    end: int
+    heading: Optional[Span] = None
+    entries: List[Entry] = field(default_factory=list)
+
+
+@dataclass
+class ResumeDocument:
+    text: str
+    sections: List[Section] = field(default_factory=list)
+
+    def section(self, name: str) -> Optional[Section]:
+        return next((section for section in self.sections if section.name == name), None)
+
+    def section_text(self, section: Section, heading: bool = True) -> str:
+        start = section.start if heading or section.heading is None else section.heading.end
+        return self.text[start:section.end].strip()
+
+    def text_of(self, names: Iterable[str]) -> str:
+        """Text of every section with one of `names`, in document order"""
+        names = set(names)
+        return "\n\n".join(self.section_text(s) for s in self.sections if s.name in names)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ResumeParser:
+    """
+    Builds a ResumeDocument from extracted resume text in one pass over its
+    lines: section headings are matched against SECTION_HEADINGS, and within
+    a section each line is a bullet, a continuation of the previous bullet,
+    or (in ENTRY_SECTIONS) the start or header line of an entry. Needs the
+    line breaks of the extraction output (TextProcessor.clean_text with
+    preserve_lines=True).
+    """
+
+    @staticmethod
+    def heading_name(line: str) -> Optional[str]:
+        """Canonical section name if the line is a section heading"""
+        words = line.strip().rstrip(":").strip()
+        if not words or len(words.split()) > MAX_HEADING_WORDS:
+            return None
+        key = re.sub(r"\s+", " ", words.replace("&", "and")).lower()
+        return HEADING_NAMES.get(key)
+
+    @staticmethod
+    def _dates(line: str, offset: int) -> List[Span]:
+        """Date ranges in a line, or its single years when it has no range"""
+        matches = list(DATE_RANGE_PATTERN.finditer(line)) or list(YEAR_PATTERN.finditer(line))
+        return [Span(m.group(0), offset + m.start(), offset + m.end()) for m in matches]
+
+    @staticmethod
+    def parse(text: str) -> ResumeDocument:
+        document = ResumeDocument(text=text)
+        section = Section(name=HEADER_SECTION, start=0, end=0)
+        entry: Optional[Entry] = None
+        previous_bullet = False
+
+        for match in re.finditer(r"[^\n]+", text):
+            line_start, line_end = match.start(), match.end()
+            line = match.group(0)
+            stripped = line.strip()
+            if not stripped:
+                continue
+            offset = line_start + len(line) - len(line.lstrip())
+
+            name = ResumeParser.heading_name(stripped)
+            content_start = None
+            if name is None:
+                inline = INLINE_HEADING_PATTERN.match(stripped)
+                # "Languages: Python, Go" inside SKILLS is a label, not a heading
+                if (inline and ResumeParser.heading_name(inline.group(1))
+                        and (inline.group(1).isupper() or section.name == HEADER_SECTION)):
+                    name = ResumeParser.heading_name(inline.group(1))
+                    content_start = offset + inline.start(2)
+            if name is not None:
+                if section.end > section.start or section.heading is not None:
+                    document.sections.append(section)
+                heading_end = offset + len(stripped) if content_start is None else content_start
+                section = Section(name=name, start=offset, end=heading_end,
+                                  heading=Span(text[offset:heading_end].strip(), offset, heading_end))
+                entry, previous_bullet = None, False
+                if content_start is None:
+                    continue
+                offset = content_start
+                stripped = text[offset:line_end].strip()
+
+            if section.end == section.start and section.heading is None:
+                section.start = offset
+            section.end = offset + len(stripped)
+
+            bullet = BULLET_PATTERN.match(stripped)
+            if bullet:
+                # Years inside bullets ("cut costs 30% in 2021") don't date the entry
+                body_start = offset + bullet.end()
+                span = Span(text[body_start:section.end], body_start, section.end)
+                if entry is None:
+                    entry = Entry(start=offset, end=section.end)
+                    section.entries.append(entry)
+                entry.bullets.append(span)
+                entry.end = section.end
+                previous_bullet = True
+                continue
+
+            dates = ResumeParser._dates(stripped, offset)
+            if previous_bullet and entry is not None and entry.bullets and not dates and stripped[0].islower():
+                # A bullet wrapped onto the next line
+                last = entry.bullets[-1]
+                entry.bullets[-1] = Span(text[last.start:section.end], last.start, section.end)
+                entry.end = section.end
+                continue
+
+            # A new entry starts at a line after bullets, or in ENTRY_SECTIONS at
+            # a dated line when the current entry is dated already; otherwise
+            # the line is another header line (company, location) of the entry
+            new_entry = (
+                entry is None or previous_bullet
+                or section.name in ENTRY_SECTIONS and bool(entry.dates and dates)
+            )
+            if new_entry:
+                entry = Entry(start=offset, end=section.end)
+                section.entries.append(entry)
+            entry.lines.append(Span(stripped, offset, section.end))
+            entry.dates.extend(dates)
+            entry.end = section.end
+            previous_bullet = False
+
+        if section.end > section.start or section.heading is not None:
+            document.sections.append(section)
+        return document
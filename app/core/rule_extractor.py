@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+import re
+
+from app.core.skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+_MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE_PATTERN = re.compile(
+    rf"{_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|Present|Current|Now)",
+    re.IGNORECASE,
+)
+DEGREE_PATTERN = re.compile(
+    r"\b(?:B\.?S\.?|B\.?A\.?|B\.?Sc\.?|M\.?S\.?|M\.?A\.?|M\.?Sc\.?|MBA|Ph\.?D\.?|"
+    r"Bachelor(?:'s)?|Master(?:'s)?|Doctorate|Associate(?:'s)?)(?![A-Za-z])"
+    # Either up to the graduation year, or up to the end of the phrase
+    r"(?:[^;|\n•]{0,80}?\b(?:19|20)\d{2}\b|[^.;|\n•]{0,60})",
+)
+# "Title, Company" immediately before a date range, e.g. "Software Engineer, Acme Corp |"
+TITLE_COMPANY_PATTERN = re.compile(
+    r"((?:[A-Z][\w&/.+-]*\s+){0,5}[A-Z][\w&/.+-]*\s*,\s*[A-Z][\w&.'-]*(?:\s+[A-Z][\w&.'-]*){0,4})\s*[|,–—-]?\s*$"
+)
+
+class RuleBasedExtractor:
+    """Regex based skill/experience/education extraction used as the cheapest model tier"""
+
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None):
+        self.taxonomy = taxonomy or get_taxonomy()
+
+    def extract_skills(self, text: str) -> List[str]:
+        """Canonical names of taxonomy skills mentioned in the text, in order of first mention"""
+        return [self.taxonomy.name(skill_id) for skill_id in self.taxonomy.find_in_text(text)]
+
+    @staticmethod
+    def extract_experience(text: str) -> List[str]:
+        """Use the text leading up to each date range as the job entry"""
+        entries = []
+        previous_end = 0
+        for match in DATE_RANGE_PATTERN.finditer(text):
+            lead = text[max(previous_end, match.start() - 80):match.start()]
+            # Section headers are all caps; keep what follows the last one
+            lead = re.split(r"\b[A-Z]{4,}\b(?=\s)", lead)[-1]
+            title_company = TITLE_COMPANY_PATTERN.search(lead)
+            if title_company:
+                lead = title_company.group(1)
+            else:
+                # Drop anything before the last bullet or sentence break
+                lead = re.split(r"[•▪●]|\s-\s|\.\s", lead)[-1].strip(" |,-–—")
+            if lead:
+                entries.append(f"{lead} ({match.group(0)})")
+            previous_end = match.end()
+        return list(dict.fromkeys(entries))
+
+    @staticmethod
+    def extract_education(text: str) -> List[str]:
+        entries = (m.group(0).strip(" ,") for m in DEGREE_PATTERN.finditer(text))
+        return list(dict.fromkeys(entry for entry in entries if entry))
+
+    def extract(self, text: str) -> Dict:
+        """Extract the same structure the skill extraction prompt produces"""
+        return {
+            "skills": self.extract_skills(text),
+            "experience": self.extract_experience(text),
+            "education": self.extract_education(text),
+        }
+
+    def merge(self, results: List[Dict]) -> Dict:
+        """Merge chunk results: skills by canonical taxonomy id, the rest by case-insensitive union"""
+        merged = {"skills": [], "experience": [], "education": []}
+        for key in merged:
+            items = [item for result in results for item in (result.get(key, []) or [])]
+            if key == "skills":
+                merged[key] = self.taxonomy.canonicalize(items)
+                continue
+            seen = {}
+            for item in items:
+                if isinstance(item, str):
+                    seen.setdefault(item.strip().lower(), item.strip())
+            merged[key] = [value for value in seen.values() if value]
+        return merged
@@ -0,0 +1,270 @@
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+from collections import deque
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+from app.core.match_scorer import JobInput
+
+logger = logging.getLogger(__name__)
+
+# Highest priority first: a waiting interactive step always runs before
+# batch work, and batch before background jobs such as question bank builds
+PRIORITY_CLASSES = ("interactive", "batch", "background")
+DEFAULT_PRIORITY = "interactive"
+DEFAULT_TENANT = "default"
+
+
+def check_priority(priority: str) -> None:
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority '{priority}', expected one of {', '.join(PRIORITY_CLASSES)}")
+
+
+class _Ticket:
+    __slots__ = ("priority", "tenant", "job", "resumed", "enqueued", "granted")
+
+    def __init__(self, priority: str, tenant: str, job: object, resumed: bool):
+        self.priority = priority
+        self.tenant = tenant
+        self.job = job
+        self.resumed = resumed
+        self.enqueued = time.perf_counter()
+        self.granted = False
+
+
+class InferenceScheduler:
+    """
+    Admission control in front of the model. Work runs in steps, each
+    holding one of `concurrency` model slots. Waiting steps are granted by
+    priority class, and within a class fairly between tenants: the tenant
+    that has been served the fewest steps goes next (a tenant that was idle
+    starts level with the others), so one tenant's large screening run
+    can't starve another's, however many jobs it submits.
+
+    Long jobs given as iterators (ResumeAnalyzer.analyze_resume_iter yields
+    after every chunk) release their slot between steps, which lets a newly
+    arrived interactive request run before the next chunk of a batch job.
+    """
+
+    def __init__(self, concurrency: int = 1):
+        self.concurrency = max(1, concurrency)
+        self._cond = threading.Condition()
+        # Per class: tenant -> waiting tickets, steps served per tenant
+        # (virtual time) and the virtual time of the last granted step
+        self._queues: Dict[str, Dict[str, Deque[_Ticket]]] = {priority: {} for priority in PRIORITY_CLASSES}
+        self._served: Dict[str, Dict[str, int]] = {priority: {} for priority in PRIORITY_CLASSES}
+        self._clock = {priority: 0 for priority in PRIORITY_CLASSES}
+        self._running = 0
+        self._stats = {
+            priority: {"steps": 0, "wait_total": 0.0, "wait_max": 0.0} for priority in PRIORITY_CLASSES
+        }
+        self._preemptions = 0
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        waiting = self._queues[ticket.priority]
+        served = self._served[ticket.priority]
+        clock = self._clock[ticket.priority]
+        if ticket.tenant not in waiting:
+            # No credit for time spent idle
+            served[ticket.tenant] = max(served.get(ticket.tenant, 0), clock)
+            waiting[ticket.tenant] = deque()
+            if len(served) > 4 * len(waiting) + 64:
+                # Entries at or behind the clock carry no information
+                for tenant in [t for t, value in served.items() if value <= clock and t not in waiting]:
+                    del served[tenant]
+        waiting[ticket.tenant].append(ticket)
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        for priority in PRIORITY_CLASSES:
+            waiting = self._queues[priority]
+            if waiting:
+                served = self._served[priority]
+                tenant = min(waiting, key=lambda t: (served[t], waiting[t][0].enqueued))
+                ticket = waiting[tenant].popleft()
+                if not waiting[tenant]:
+                    del waiting[tenant]
+                self._clock[priority] = served[tenant]
+                served[tenant] += 1
+                return ticket
+        return None
+
+    def _preempts(self, ticket: _Ticket) -> bool:
+        """Whether granting `ticket` jumps an older ticket still waiting in a lower priority class"""
+        lower = PRIORITY_CLASSES[PRIORITY_CLASSES.index(ticket.priority) + 1:]
+        return any(tickets[0].enqueued < ticket.enqueued
+                   for priority in lower for tickets in self._queues[priority].values())
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting tickets; called with the condition held"""
+        granted = False
+        while self._running < self.concurrency:
+            ticket = self._next_ticket()
+            if ticket is None:
+                break
+            wait = time.perf_counter() - ticket.enqueued
+            stats = self._stats[ticket.priority]
+            stats["steps"] += 1
+            stats["wait_total"] += wait
+            stats["wait_max"] = max(stats["wait_max"], wait)
+            if self._preempts(ticket):
+                self._preemptions += 1
+            ticket.granted = True
+            self._running += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT,
+             job: Optional[object] = None, resumed: bool = False):
+        """Hold one model slot for the duration of the block"""
+        check_priority(priority)
+        ticket = _Ticket(priority, tenant or DEFAULT_TENANT, job if job is not None else object(), resumed)
+        with self._cond:
+            self._enqueue(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                self._cond.wait()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._dispatch()
+
+    def run(self, fn: Callable[..., Any], *args, priority: str = DEFAULT_PRIORITY,
+            tenant: str = DEFAULT_TENANT, **kwargs) -> Any:
+        """Call `fn` as a single step"""
+        with self.slot(priority, tenant):
+            return fn(*args, **kwargs)
+
+    def iterate(self, iterator: Iterator[Any], priority: str = DEFAULT_PRIORITY,
+                tenant: str = DEFAULT_TENANT) -> Iterator[Any]:
+        """
+        Advance `iterator` one item per step, giving the slot back between
+        items so higher priority work can run in between
+        """
+        check_priority(priority)
+        job = object()
+        resumed = False
+        try:
+            while True:
+                with self.slot(priority, tenant, job=job, resumed=resumed):
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                resumed = True
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def metrics(self) -> Dict:
+        """Queue depth, running steps and wait times per priority class"""
+        with self._cond:
+            classes = {}
+            for priority in PRIORITY_CLASSES:
+                stats = self._stats[priority]
+                steps = stats["steps"]
+                classes[priority] = {
+                    "queued": sum(len(tickets) for tickets in self._queues[priority].values()),
+                    "tenants_waiting": len(self._queues[priority]),
+                    "steps": steps,
+                    "wait_avg_ms": round(stats["wait_total"] / steps * 1000, 2) if steps else 0.0,
+                    "wait_max_ms": round(stats["wait_max"] * 1000, 2),
+                }
+            return {
+                "concurrency": self.concurrency,
+                "running": self._running,
+                "preemptions": self._preemptions,
+                "classes": classes,
+            }
+
+
+class ScheduledAnalyzer:
+    """
+    ResumeAnalyzer whose model calls go through an InferenceScheduler. Every
+    model method takes `priority` (one of PRIORITY_CLASSES) and `tenant`.
+    """
+
+    def __init__(self, analyzer: Any, scheduler: Optional[InferenceScheduler] = None):
+        self.analyzer = analyzer
+        # As many steps at once as the analyzer's models can batch together
+        self.scheduler = scheduler or InferenceScheduler(getattr(analyzer, "concurrency", 1))
+        self.infer_seniority = analyzer.infer_seniority
+
+    def extract_text_from_file(self, file_path: str) -> str:
+        return self.analyzer.extract_text_from_file(file_path)
+
+    def analyze_resume_iter(self, resume_text: str, job_description: Optional[JobInput] = None,
+                            priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> Iterator[Dict]:
+        check_priority(priority)
+        return self.scheduler.iterate(
+            self.analyzer.analyze_resume_iter(resume_text, job_description), priority, tenant
+        )
+
+    def analyze_resume(self, resume_text: str, job_description: Optional[JobInput] = None,
+                       priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> Dict:
+        # Runs chunk by chunk as well, so it can be preempted like the streamed variant
+        result = None
+        for event in self.analyze_resume_iter(resume_text, job_description, priority, tenant):
+            if event["event"] == "result":
+                result = event["data"]
+        return result
+
+    def analyze_match(self, basic_info: Dict, job_description: JobInput,
+                      priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> Dict:
+        # Clear passes and fails never wait for a model slot
+        screened = self.analyzer.screen_match(basic_info, job_description)
+        if screened is not None:
+            return screened
+        return self.scheduler.run(self.analyzer.analyze_match, basic_info, job_description, screen=False,
+                                  priority=priority, tenant=tenant)
+
+    def generate_questions_for_items(self, items: List[str], seniority: str, per_item: int = 2,
+                                     priority: str = DEFAULT_PRIORITY,
+                                     tenant: str = DEFAULT_TENANT) -> Dict[str, List[str]]:
+        return self.scheduler.run(self.analyzer.generate_questions_for_items, items, seniority, per_item,
+                                  priority=priority, tenant=tenant)
+
+    def generate_interview_questions(self, resume_analysis: Dict, per_item: int = 2, max_items: int = 12,
+                                     priority: str = DEFAULT_PRIORITY, tenant: str = DEFAULT_TENANT) -> List[str]:
+        return self.scheduler.run(self.analyzer.generate_interview_questions, resume_analysis, per_item,
+                                  max_items, priority=priority, tenant=tenant)
+
+    def scheduler_metrics(self) -> Dict:
+        return self.scheduler.metrics()
+
+    def match_stats(self) -> Dict:
+        return self.analyzer.match_stats()
+
+
+class LazyAnalyzer:
+    """
+    Stands in for a ScheduledAnalyzer until a request needs it: `factory`
+    builds the analyzer (importing LangChain and loading the model) on first
+    use, once. A worker that only serves health checks and stored results
+    never pays for the model.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._analyzer: Optional[Any] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._analyzer is not None
+
+    def load(self) -> Any:
+        if self._analyzer is None:
+            with self._load_lock:
+                if self._analyzer is None:
+                    self._analyzer = self._factory()
+        return self._analyzer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
@@ -0,0 +1,192 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from functools import lru_cache
+import json
+import os
+import re
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skill_taxonomy.json")
+
+# Tokens keep tech punctuation (c++, c#, node.js, ci/cd, .net)
+TOKEN_PATTERN = re.compile(r"(?<![\w.])\.?[A-Za-z0-9][A-Za-z0-9+#]*(?:[./][A-Za-z0-9+#]+)*")
+# Trailing version tokens ignored by lookup: "Python 3.10", "JavaScript ES6", "Angular v2"
+VERSION_PATTERN = re.compile(r"^(?:v?\d+(?:\.(?:\d+|x))*|es\d+|es20\d\d)$")
+
+# Aliases this short only match as standalone words: not the "R" of "R&D"
+# or the "C" of "C-level"
+SHORT_ALIAS_LENGTH = 2
+SHORT_ALIAS_GLUE = "&-'’"
+
+# Marks the end of an alias in the trie
+_TERMINAL = None
+
+
+def _token_key(token: str) -> str:
+    """Lowercase; inner dots dropped so "Node.js" == "nodejs" (a leading dot is kept for ".NET")"""
+    token = token.lower()
+    return token[0] + token[1:].replace(".", "")
+
+
+def _tokens(text: str) -> List[Tuple[str, int, int]]:
+    return [(_token_key(m.group(0)), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+
+class SkillTaxonomy:
+    """
+    In-memory skill taxonomy: canonical integer ids, aliases and parent
+    relations, with a token trie for alias lookup in free text. Skill lists
+    are turned into integer id sets so comparisons are set operations.
+
+    Entries in the taxonomy file look like:
+        {"id": 22, "name": "React", "aliases": ["reactjs"], "parents": [4, 21]}
+    "exact_aliases" (and "case_sensitive" for the name) only match in text with
+    that exact casing ("Go", "R", "ML"); "category" marks grouping nodes that
+    are not reported as extracted skills.
+    """
+
+    def __init__(self, entries: List[Dict]):
+        self._names: Dict[int, str] = {}
+        self._parents: Dict[int, Tuple[int, ...]] = {}
+        self._categories: Set[int] = set()
+        self._lookup: Dict[Tuple[str, ...], int] = {}
+        self._trie: Dict = {}
+
+        for entry in entries:
+            skill_id = int(entry["id"])
+            name = entry["name"]
+            self._names[skill_id] = name
+            self._parents[skill_id] = tuple(entry.get("parents", []))
+            if entry.get("category"):
+                self._categories.add(skill_id)
+
+            name_exact = name if entry.get("case_sensitive") else None
+            surfaces = [(name, name_exact)]
+            surfaces += [(alias, None) for alias in entry.get("aliases", [])]
+            surfaces += [(alias, alias) for alias in entry.get("exact_aliases", [])]
+            for surface, exact in surfaces:
+                key = tuple(token for token, _, _ in _tokens(surface))
+                if not key:
+                    continue
+                self._lookup.setdefault(key, skill_id)
+                node = self._trie
+                for token in key:
+                    node = node.setdefault(token, {})
+                node.setdefault(_TERMINAL, []).append((skill_id, exact))
+
+        self._ancestors = {skill_id: self._collect_ancestors(skill_id) for skill_id in self._names}
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SkillTaxonomy":
+        path = path or os.getenv("HIREFIT_SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _collect_ancestors(self, skill_id: int) -> FrozenSet[int]:
+        seen: Set[int] = set()
+        stack = list(self._parents.get(skill_id, ()))
+        while stack:
+            parent = stack.pop()
+            if parent not in seen and parent != skill_id:
+                seen.add(parent)
+                stack.extend(self._parents.get(parent, ()))
+        return frozenset(seen)
+
+    def name(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+    def skill_names(self, include_categories: bool = False) -> List[str]:
+        return [name for skill_id, name in self._names.items()
+                if include_categories or skill_id not in self._categories]
+
+    def is_category(self, skill_id: int) -> bool:
+        return skill_id in self._categories
+
+    def lookup(self, skill: str) -> Optional[int]:
+        """Canonical id of a skill name or alias, ignoring case and trailing version numbers"""
+        key = [token for token, _, _ in _tokens(skill)]
+        while len(key) > 1 and VERSION_PATTERN.match(key[-1]):
+            key.pop()
+        return self._lookup.get(tuple(key))
+
+    def key(self, skill: str) -> str:
+        """Lowercased canonical name, or the lowercased skill itself when unknown"""
+        skill_id = self.lookup(skill)
+        return " ".join((self._names[skill_id] if skill_id is not None else skill).lower().split())
+
+    @staticmethod
+    def _glued(text: str, start: int, end: int) -> bool:
+        """Whether text[start:end] is joined to a neighbouring word by punctuation"""
+        return (start > 0 and text[start - 1] in SHORT_ALIAS_GLUE
+                or end < len(text) and text[end] in SHORT_ALIAS_GLUE)
+
+    def find_in_text(self, text: str, include_categories: bool = False) -> List[int]:
+        """Ids of skills mentioned in text, in order of first mention (longest alias wins)"""
+        tokens = _tokens(text)
+        found: Dict[int, None] = {}
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            match: Optional[Tuple[int, int]] = None
+            j = i
+            while j < len(tokens) and tokens[j][0] in node:
+                node = node[tokens[j][0]]
+                j += 1
+                start, end = tokens[i][1], tokens[j - 1][2]
+                if end - start <= SHORT_ALIAS_LENGTH and self._glued(text, start, end):
+                    continue
+                for skill_id, exact in node.get(_TERMINAL, ()):
+                    surface = text[start:end]
+                    if exact is None or " ".join(surface.split()) == exact:
+                        match = (skill_id, j)
+                        break
+            if match:
+                skill_id, i = match
+                if include_categories or skill_id not in self._categories:
+                    found.setdefault(skill_id)
+            else:
+                i += 1
+        return list(found)
+
+    def ids(self, skills: Iterable[str]) -> Set[int]:
+        """Canonical ids of the known skills in a list"""
+        result = set()
+        for skill in skills:
+            skill_id = self.lookup(skill) if skill else None
+            if skill_id is not None:
+                result.add(skill_id)
+        return result
+
+    def ancestors(self, skill_id: int) -> FrozenSet[int]:
+        return self._ancestors.get(skill_id, frozenset())
+
+    def expand(self, skill_ids: Iterable[int]) -> Set[int]:
+        """Ids plus all their ancestors: knowing React implies JavaScript"""
+        expanded = set(skill_ids)
+        for skill_id in list(expanded):
+            expanded |= self._ancestors.get(skill_id, frozenset())
+        return expanded
+
+    def canonicalize(self, skills: Iterable[str]) -> List[str]:
+        """
+        Map names to canonical spelling and drop duplicates, in order. Unknown
+        skills are kept, deduplicated case-insensitively.
+        """
+        result: Dict[object, str] = {}
+        for skill in skills:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            skill = skill.strip()
+            skill_id = self.lookup(skill)
+            if skill_id is not None:
+                result.setdefault(skill_id, self._names[skill_id])
+            else:
+                result.setdefault(" ".join(skill.lower().split()), skill)
+        return list(result.values())
+
+
+@lru_cache(maxsize=1)
+def get_taxonomy() -> SkillTaxonomy:
+    """Process-wide taxonomy loaded from HIREFIT_SKILL_TAXONOMY_PATH or the bundled file"""
+    return SkillTaxonomy.load()
@@ -0,0 +1,85 @@
+from typing import Any, Callable, Dict, Optional, Sequence
+import hashlib
+import os
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH = os.path.join("data", "hirefit.db")
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite connection in WAL mode: readers don't block the writer, so
+    API workers can query while another request is saving results
+    """
+    if db_path != ":memory:":
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class SQLiteStore:
+    """
+    Base class for stores kept in the application database
+    ($HIREFIT_DB_PATH, default data/hirefit.db). Subclasses set SCHEMA.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.getenv("HIREFIT_DB_PATH", DEFAULT_DB_PATH)
+        self._open()
+        with self._lock, self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    def _open(self) -> None:
+        self._pid = os.getpid()
+        self._connection = connect(self.db_path)
+        self._thread_lock = threading.Lock()
+
+    def _check_fork(self) -> None:
+        # A connection must not be used across fork (gunicorn --preload creates
+        # the stores in the master); each worker opens its own on first use
+        if self._pid != os.getpid():
+            self._open()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        self._check_fork()
+        return self._connection
+
+    @property
+    def _lock(self) -> threading.Lock:
+        self._check_fork()
+        return self._thread_lock
+
+    def _paginate(self, query: str, params: Sequence[Any], page: int, page_size: int,
+                  to_item: Callable[[sqlite3.Row], Dict]) -> Dict:
+        """Run `query` for one page; returns items plus the total row count"""
+        page = max(1, page)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"{query} LIMIT ? OFFSET ?", list(params) + [page_size, (page - 1) * page_size]
+            ).fetchall()
+        return {
+            "items": [to_item(row) for row in rows],
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
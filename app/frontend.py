@@ -1,9 +1,11 @@
 import streamlit as st
-import requests
 import json
 from typing import Dict, Any
 import os
 from dotenv import load_dotenv
+import hashlib
+from api_client import APIError, get_client
+from ui import cards_html, show_analysis
 
 # Load environment variables
 load_dotenv()
@@ -170,20 +172,7 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# API URL
-API_URL = "http://localhost:8000"
-
-def analyze_resume(file: Any, job_description: str = None) -> Dict:
-    """Send resume to backend for analysis"""
-    files = {"file": file}
-    data = {"job_description": job_description} if job_description else {}
-    response = requests.post(f"{API_URL}/analyze-resume", files=files, data=data)
-    return response.json()
-
-def generate_interview_questions(resume_analysis: Dict) -> Dict:
-    """Generate interview questions based on resume analysis"""
-    response = requests.post(f"{API_URL}/generate-interview-questions", json=resume_analysis)
-    return response.json()
+api_client = get_client()
 
 def main():
     # Modern header with gradient
@@ -241,111 +230,29 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             
+            file_bytes = uploaded_file.getvalue()
+            analysis_key = (hashlib.sha256(file_bytes).hexdigest(), job_description or "")
             if st.button("Analyze Resume"):
-                with st.spinner("🔄 Processing your resume..."):
-                    result = analyze_resume(uploaded_file, job_description)
-                    
-                    if result["status"] == "success":
-                        data = result["data"]
-                        
-                        # Match Score with animation
-                        score = data['match_score'] * 100
-                        color = (
-                            "#10b981" if score >= 80 else
-                            "#0d6efd" if score >= 60 else
-                            "#fb923c" if score >= 40 else
-                            "#ef4444"
-                        )
-                        st.markdown(
-                            f"""
-                            <div class='match-score' style='color: {color};'>
-                                <div style='font-size: 0.6em; color: #6c757d; margin-bottom: 0.5rem;'>Match Score</div>
-                                {score:.1f}%
-                            </div>
-                            """,
-                            unsafe_allow_html=True
-                        )
-                        
-                        # Skills as tags
-                        st.markdown("""
-                            <div class='results-section'>
-                                <h3>⚙ Technical Skills</h3>
-                            """, unsafe_allow_html=True)
-                        skills_html = "".join([f"<span class='skill-tag'>{skill}</span>" for skill in data['skills']])
-                        st.markdown(f"<div style='margin: 1rem 0;'>{skills_html}</div>", unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
-                        
-                        # Experience as cards
-                        st.markdown("""
-                            <div class='results-section'>
-                                <h3>💻 Experience</h3>
-                            """, unsafe_allow_html=True)
-                        for exp in data["experience"]:
-                            st.markdown(f"""
-                                <div class='info-card'>
-                                    <div style='color: #1a1f36;'>{exp}</div>
-                                </div>
-                            """, unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
-                        
-                        # Education as cards
-                        st.markdown("""
-                            <div class='results-section'>
-                                <h3>🎓 Education</h3>
-                            """, unsafe_allow_html=True)
-                        for edu in data["education"]:
-                            st.markdown(f"""
-                                <div class='info-card'>
-                                    <div style='color: #1a1f36;'>{edu}</div>
-                                </div>
-                            """, unsafe_allow_html=True)
-                        st.markdown("</div>", unsafe_allow_html=True)
-                        
-                        # Skill Gaps and Suggestions in a grid
-                        col_gap, col_sugg = st.columns(2)
-                        
-                        with col_gap:
-                            st.markdown("""
-                                <div class='results-section'>
-                                    <h3>⚠ Skill Gaps</h3>
-                                """, unsafe_allow_html=True)
-                            for gap in data["skill_gaps"]:
-                                st.markdown(f"""
-                                    <div class='alert alert-warning'>
-                                        {gap}
-                                    </div>
-                                """, unsafe_allow_html=True)
-                            st.markdown("</div>", unsafe_allow_html=True)
-                        
-                        with col_sugg:
-                            st.markdown("""
-                                <div class='results-section'>
-                                    <h3>💡 Suggestions</h3>
-                                """, unsafe_allow_html=True)
-                            for sugg in data["improvement_suggestions"]:
-                                st.markdown(f"""
-                                    <div class='alert alert-success'>
-                                        {sugg}
-                                    </div>
-                                """, unsafe_allow_html=True)
-                            st.markdown("</div>", unsafe_allow_html=True)
-                        
-                        # Interview Questions
-                        if st.button("Generate Interview Questions"):
-                            with st.spinner("🔄 Preparing questions..."):
-                                questions = generate_interview_questions(data)
-                                if questions["status"] == "success":
-                                    st.markdown("""
-                                        <div class='results-section'>
-                                            <h3>🎯 Technical Interview Questions</h3>
-                                        """, unsafe_allow_html=True)
-                                    for i, question in enumerate(questions["questions"], 1):
-                                        st.markdown(f"""
-                                            <div class='info-card' style='border-left-color: #10b981;'>
-                                                <div style='font-weight: 500; color: #1a1f36;'>Q{i}. {question}</div>
-                                            </div>
-                                        """, unsafe_allow_html=True)
-                                    st.markdown("</div>", unsafe_allow_html=True)
+                st.session_state['analysis_key'] = analysis_key
+            
+            # Keep showing the result on later reruns (e.g. the questions button); it comes from the cache
+            if st.session_state.get('analysis_key') == analysis_key:
+                data = show_analysis(*analysis_key, uploaded_file.name, uploaded_file.type, file_bytes)
+                
+                # Interview Questions
+                if data and st.button("Generate Interview Questions"):
+                    with st.spinner("🔄 Preparing questions..."):
+                        try:
+                            questions = api_client.generate_interview_questions(data)
+                        except APIError as e:
+                            questions = {"status": "error"}
+                            st.error(f"Could not generate questions: {str(e)}")
+                        if questions["status"] == "success":
+                            st.markdown(
+                                cards_html("🎯 Technical Interview Questions", questions["questions"],
+                                           border_color="#10b981", numbered=True),
+                                unsafe_allow_html=True
+                            )
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,17 +1,47 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import os
-from typing import List, Optional
+import json
+import logging
+from typing import Dict, Iterator, List, Optional
+from datetime import date
 from dotenv import load_dotenv
-from app.core.resume_analyzer import ResumeAnalyzer
+from app.core.inference_server import RemoteAnalyzer
+from app.core.scheduler import DEFAULT_PRIORITY, LazyAnalyzer, ScheduledAnalyzer, check_priority
+from app.core.question_bank import QuestionBank
+from app.core.match_scorer import JobInput, MatchScorer, resume_seniority
+from app.core.profile_store import ProfileStore, job_hash
+from app.core.application_store import ApplicationStore
+from app.core.job_store import JobStore
+from app.core.experience_extractor import highest_degree, years_from_experience
+from app.core.storage import content_hash
 from app.utils.file_processor import FileProcessor
 from app.utils.text_processor import TextProcessor
+from app.utils.compression import CompressionMiddleware
+from app.utils.limits import LimitExceeded, RequestLimitMiddleware, get_limits, usage_stats
+from app.utils.parse_pool import ParseFailed, ParsePool
+from app.schemas import (
+    AnalysisData, AnalysisResponse, Application, ApplicationPage, ApplicationResponse, ApplicationStats,
+    JobProfileResponse, MatchPage, MatchScoreResponse, Profile, ProfilePage, ProfileResponse, RankedJob,
+    RankJobsResponse, StoredMatch, compact_response
+)
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="HireFit AI API")
+# Configure logging for the API process; library modules only create loggers
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+app = FastAPI(title="HireFit AI API", default_response_class=ORJSONResponse)
+
+# Compress responses with brotli or gzip, as negotiated by Accept-Encoding
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+# Refuse oversized request bodies with 413 while they stream in
+app.add_middleware(RequestLimitMiddleware, max_body_bytes=get_limits().max_upload_bytes)
 
 # Configure CORS
 app.add_middleware(
@@ -22,9 +52,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize analyzers
-resume_analyzer = ResumeAnalyzer()
+# Initialize analyzers. The model is loaded in this process unless
+# HIREFIT_INFERENCE_ADDRESS points to a dedicated inference process
+# (python -m app.core.inference_server) shared by all API workers. Either
+# way model calls are queued by priority class and tenant. A local model is
+# loaded on first use, so the worker starts without importing LangChain.
+def _local_analyzer() -> ScheduledAnalyzer:
+    from app.core.resume_analyzer import ResumeAnalyzer
+
+    return ScheduledAnalyzer(ResumeAnalyzer())
+
+inference_address = os.getenv("HIREFIT_INFERENCE_ADDRESS")
+resume_analyzer = RemoteAnalyzer(inference_address) if inference_address else LazyAnalyzer(_local_analyzer)
 text_processor = TextProcessor()
+question_bank = QuestionBank()
+match_scorer = MatchScorer()
+profile_store = ProfileStore()
+application_store = ApplicationStore()
+job_store = JobStore()
+# Uploaded documents are parsed in sandboxed worker processes
+parse_pool = ParsePool.from_env()
+# Match results from the deterministic scorer or the model; anything else
+# ("failed") is returned but not stored
+STORED_MATCH_METHODS = {"scorer", "model"}
 
 class ResumeAnalysis(BaseModel):
     skills: List[str]
@@ -33,6 +83,8 @@ class ResumeAnalysis(BaseModel):
     match_score: float
     skill_gaps: List[str]
     improvement_suggestions: List[str]
+    years_experience: Optional[float] = None
+    skill_years: Dict[str, float] = {}
 
 class JobDescription(BaseModel):
     title: str
@@ -40,51 +92,232 @@ class JobDescription(BaseModel):
     required_skills: List[str]
     preferred_skills: List[str]
 
-@app.post("/analyze-resume")
-async def analyze_resume(file: UploadFile = File(...), job_description: Optional[str] = None):
+class JobPosting(BaseModel):
+    title: str = ""
+    description: str
+
+class ApplicationCreate(BaseModel):
+    company: str
+    position: str
+    applied_on: date
+    status: str = "Applied"
+    notes: str = ""
+
+class ApplicationUpdate(BaseModel):
+    company: Optional[str] = None
+    position: Optional[str] = None
+    applied_on: Optional[date] = None
+    status: Optional[str] = None
+    notes: Optional[str] = None
+
+@app.get("/health")
+async def health():
+    """
+    Liveness check; cheap enough for load balancers and client warm-up
+    """
+    return {"status": "ok"}
+
+def _model_loaded() -> bool:
+    """False until a request has loaded the local model; metrics must not load it"""
+    return not isinstance(resume_analyzer, LazyAnalyzer) or resume_analyzer.loaded
+
+@app.get("/scheduler/metrics")
+async def scheduler_metrics():
+    """
+    Inference queue depth, running steps and wait times per priority class
+    """
+    if not _model_loaded():
+        return {"status": "success", "model_loaded": False}
+    try:
+        metrics = await run_in_threadpool(resume_analyzer.scheduler_metrics)
+        return {"status": "success", **metrics}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/limits")
+async def resource_limits():
+    """
+    Configured per-request resource limits, rejections per limit, the
+    largest request body and duration seen by this worker, and the parser
+    sandbox counters (timeouts, recycled workers)
+    """
+    return {
+        "status": "success",
+        "limits": get_limits().as_dict(),
+        "usage": usage_stats.snapshot(),
+        "parse_pool": parse_pool.stats()
+    }
+
+@app.get("/match/stats")
+async def match_stats():
+    """
+    Match analyses settled by the deterministic scorer vs. sent to the model
+    """
+    if not _model_loaded():
+        return {"status": "success", "model_loaded": False}
+    try:
+        stats = await run_in_threadpool(resume_analyzer.match_stats)
+        return {"status": "success", **stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _schedule(request: Request, priority: str, tenant: Optional[str]) -> Dict:
+    """Scheduler arguments for a model call; the tenant defaults to the client address"""
+    try:
+        check_priority(priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"priority": priority, "tenant": tenant or (request.client.host if request.client else "default")}
+
+def _analysis_response(profile_id: Optional[int], basic_info: Dict, match_analysis: Dict) -> Dict:
+    return {
+        "profile_id": profile_id,
+        "skills": basic_info.get("skills", []),
+        "experience": basic_info.get("experience", []),
+        "education": basic_info.get("education", []),
+        # Stored profiles keep only the lists; their dates still give the tenure
+        "years_experience": basic_info["years_experience"] if "years_experience" in basic_info
+        else years_from_experience(basic_info.get("experience", [])),
+        "highest_degree": basic_info["highest_degree"] if "highest_degree" in basic_info
+        else highest_degree(basic_info.get("education", [])),
+        "match_score": match_analysis.get("match_score", 0.0),
+        "skill_gaps": match_analysis.get("skill_gaps", []),
+        "improvement_suggestions": match_analysis.get("suggestions", [])
+    }
+
+def _resolve_job(job_description: Optional[str], jd_id: Optional[int]) -> Optional[JobInput]:
+    """The stored requirement profile for `jd_id`, else the raw job description text"""
+    if jd_id is None:
+        return job_description
+    job = job_store.get(jd_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return job
+
+def _job_key(job: JobInput) -> str:
+    """Match cache key; a stored profile and its original text share results"""
+    return job["job_hash"] if isinstance(job, dict) else job_hash(job)
+
+def _job_title(job: JobInput) -> Optional[str]:
+    return (job["title"] or None) if isinstance(job, dict) else None
+
+def _storable_match(match_analysis: Dict) -> bool:
+    """Only real results are stored; a failed match must be retried next time"""
+    return match_analysis.get("method") in STORED_MATCH_METHODS
+
+def _cached_analysis(resume_hash: str, job_description: Optional[JobInput], schedule: Dict) -> Optional[Dict]:
+    """Response data for a previously analyzed file; only the job match may need computing"""
+    profile = profile_store.get_profile_by_hash(resume_hash)
+    if profile is None:
+        return None
+    match_analysis = {}
+    if job_description:
+        stored_match = profile_store.get_match(profile["id"], _job_key(job_description))
+        if stored_match:
+            match_analysis = stored_match["result"]
+        else:
+            match_analysis = resume_analyzer.analyze_match(profile, job_description, **schedule)
+            if _storable_match(match_analysis):
+                profile_store.save_matches(
+                    profile["id"], [(_job_key(job_description), _job_title(job_description), match_analysis)]
+                )
+    return _analysis_response(profile["id"], profile, match_analysis)
+
+def _store_analysis(resume_hash: str, resume_text: str, analysis_result: Dict, filename: Optional[str],
+                    candidate_id: Optional[int], job_description: Optional[JobInput]) -> Dict:
+    """Persist a fresh analysis and return the response data"""
+    basic_info = analysis_result.get("basic_info", {})
+    match_analysis = analysis_result.get("match_analysis", {})
+    profile_id = None
+    # Empty results mean the analysis failed; don't cache them
+    if any(basic_info.get(key) for key in ("skills", "experience", "education")):
+        profile_id = profile_store.save_profile(
+            resume_hash, resume_text, basic_info, filename=filename, candidate_id=candidate_id
+        )
+        if job_description and _storable_match(match_analysis):
+            profile_store.save_matches(
+                profile_id, [(_job_key(job_description), _job_title(job_description), match_analysis)]
+            )
+    return _analysis_response(profile_id, basic_info, match_analysis)
+
+def _too_large(error: LimitExceeded) -> HTTPException:
+    usage_stats.record_rejection(error.reason)
+    return HTTPException(status_code=413, detail=str(error))
+
+async def _save_upload(file: UploadFile) -> str:
+    """Path of the upload saved to a temporary file"""
+    try:
+        temp_file_path = await FileProcessor.save_upload_file(file, get_limits().max_upload_bytes)
+    except LimitExceeded as e:
+        raise _too_large(e)
+    if not temp_file_path:
+        raise HTTPException(status_code=400, detail="Failed to process uploaded file")
+    return temp_file_path
+
+def _extract_resume_text(temp_file_path: str) -> str:
+    """Cleaned text of an uploaded resume"""
+    try:
+        resume_text = parse_pool.extract_text(temp_file_path, get_limits())
+    except LimitExceeded as e:
+        raise _too_large(e)
+    except ParseFailed as e:
+        usage_stats.record_rejection(f"parse_{e.reason}")
+        raise HTTPException(status_code=422, detail=str(e))
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Could not extract text from the file")
+    # Line breaks carry the resume's sections and entries
+    return text_processor.clean_text(resume_text, preserve_lines=True)
+
+def _analyze_file(temp_file_path: str, filename: Optional[str], job_description: Optional[JobInput],
+                  candidate_id: Optional[int], schedule: Dict):
+    """Cached or fresh analysis of a saved upload; returns (response data, cached)"""
+    with open(temp_file_path, "rb") as f:
+        resume_hash = content_hash(f.read())
+    response_data = _cached_analysis(resume_hash, job_description, schedule)
+    if response_data is not None:
+        return response_data, True
+
+    resume_text = _extract_resume_text(temp_file_path)
+
+    # Analyze resume
+    analysis_result = resume_analyzer.analyze_resume(resume_text, job_description, **schedule)
+
+    if not analysis_result or not isinstance(analysis_result, dict):
+        raise HTTPException(status_code=500, detail="Failed to analyze resume")
+
+    response_data = _store_analysis(
+        resume_hash, resume_text, analysis_result, filename, candidate_id, job_description
+    )
+    return response_data, False
+
+@app.post("/analyze-resume", response_model=AnalysisResponse)
+async def analyze_resume(request: Request, file: UploadFile = File(...), job_description: Optional[str] = Form(None),
+                         jd_id: Optional[int] = Form(None), candidate_id: Optional[int] = Form(None),
+                         priority: str = Form(DEFAULT_PRIORITY), fields: Optional[str] = None,
+                         x_tenant_id: Optional[str] = Header(None)):
     """
-    Analyze a resume and provide insights
+    Analyze a resume and provide insights. Results are stored by content
+    hash, so uploading the same file again skips the analysis.
+    `fields` (e.g. "skills,match_score") limits the returned data fields.
+    Bulk screening should send priority=batch so interactive requests go
+    first; X-Tenant-ID groups requests for fair queueing. `jd_id` matches
+    against a job description stored with POST /job-descriptions.
     """
+    schedule = _schedule(request, priority, x_tenant_id)
+    job = _resolve_job(job_description, jd_id)
     try:
         # Save uploaded file
-        temp_file_path = await FileProcessor.save_upload_file(file)
-        if not temp_file_path:
-            raise HTTPException(status_code=400, detail="Failed to process uploaded file")
+        temp_file_path = await _save_upload(file)
 
         try:
-            # Extract text from resume
-            resume_text = resume_analyzer.extract_text_from_file(temp_file_path)
-            if not resume_text:
-                raise HTTPException(status_code=400, detail="Could not extract text from the file")
-            
-            # Clean the text
-            resume_text = text_processor.clean_text(resume_text)
-            
-            # Analyze resume
-            analysis_result = resume_analyzer.analyze_resume(resume_text, job_description)
-            
-            if not analysis_result or not isinstance(analysis_result, dict):
-                raise HTTPException(status_code=500, detail="Failed to analyze resume")
-            
-            # Extract the analysis results
-            basic_info = analysis_result.get("basic_info", {})
-            match_analysis = analysis_result.get("match_analysis", {})
-            
-            # Prepare response
-            response_data = {
-                "skills": basic_info.get("skills", []),
-                "experience": basic_info.get("experience", []),
-                "education": basic_info.get("education", []),
-                "match_score": match_analysis.get("match_score", 0.0),
-                "skill_gaps": match_analysis.get("skill_gaps", []),
-                "improvement_suggestions": match_analysis.get("suggestions", [])
-            }
-
-            return {
-                "status": "success",
-                "message": "Resume analysis completed",
-                "data": response_data
-            }
+            # Off the event loop, so other requests are served while this one waits for the model
+            response_data, cached = await run_in_threadpool(
+                _analyze_file, temp_file_path, file.filename, job, candidate_id, schedule
+            )
+
+            return compact_response(
+                AnalysisResponse(cached=cached, data=AnalysisData(**response_data)), "data", fields, AnalysisData
+            )
 
         except HTTPException:
             raise
@@ -99,50 +332,313 @@ async def analyze_resume(file: UploadFile = File(...), job_description: Optional
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
+@app.post("/analyze-resume/stream")
+async def analyze_resume_stream(request: Request, file: UploadFile = File(...),
+                                job_description: Optional[str] = Form(None), jd_id: Optional[int] = Form(None),
+                                candidate_id: Optional[int] = Form(None), priority: str = Form(DEFAULT_PRIORITY),
+                                x_tenant_id: Optional[str] = Header(None)):
+    """
+    Same as /analyze-resume, streamed as newline-delimited JSON events:
+    "progress" events with the partial profile as each chunk is processed,
+    then one "result" (or "error") event with the response data
+    """
+    schedule = _schedule(request, priority, x_tenant_id)
+    job = _resolve_job(job_description, jd_id)
+    temp_file_path = await _save_upload(file)
+
+    def events() -> Iterator[str]:
+        try:
+            with open(temp_file_path, "rb") as f:
+                resume_hash = content_hash(f.read())
+            response_data = _cached_analysis(resume_hash, job, schedule)
+            if response_data is not None:
+                yield json.dumps({"event": "result", "cached": True, "data": response_data}) + "\n"
+                return
+
+            resume_text = _extract_resume_text(temp_file_path)
+            for event in resume_analyzer.analyze_resume_iter(resume_text, job, **schedule):
+                if event["event"] == "result":
+                    response_data = _store_analysis(
+                        resume_hash, resume_text, event["data"], file.filename, candidate_id, job
+                    )
+                    event = {"event": "result", "cached": False, "data": response_data}
+                yield json.dumps(event) + "\n"
+        except HTTPException as e:
+            yield json.dumps({"event": "error", "detail": e.detail}) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "detail": f"Error processing resume: {str(e)}"}) + "\n"
+        finally:
+            # Clean up temporary file
+            FileProcessor.cleanup_file(temp_file_path)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+def _job_response(job: Dict) -> Dict:
+    return {key: value for key, value in job.items() if key != "embedding"}
+
+@app.post("/job-descriptions", response_model=JobProfileResponse)
+async def create_job_description(posting: JobPosting):
+    """
+    Parse a job description once into a requirement profile (skills,
+    seniority, years, embedding) and store it; analysis requests can then
+    pass its id as `jd_id`. Posting the same text again returns the stored profile.
+    """
+    if not posting.description.strip():
+        raise HTTPException(status_code=400, detail="Job description is empty")
+    try:
+        job = job_store.get_by_hash(_job_key(posting.description))
+        if job is None:
+            profile = await run_in_threadpool(match_scorer.job_profile, posting.description, posting.title)
+            job = job_store.save(profile)
+        
+        return {
+            "status": "success",
+            "job": _job_response(job)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/job-descriptions/{jd_id}", response_model=JobProfileResponse)
+async def get_job_description(jd_id: int):
+    """
+    Get a stored job requirement profile
+    """
+    job = job_store.get(jd_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return {
+        "status": "success",
+        "job": _job_response(job)
+    }
+
+@app.get("/profiles", response_model=ProfilePage)
+async def list_profiles(skills: List[str] = Query(default=[]), candidate_id: Optional[int] = None,
+                        page: int = 1, page_size: int = 20, fields: Optional[str] = None):
+    """
+    List stored profiles, newest first; `skills` keeps profiles having all of them
+    """
+    try:
+        result = profile_store.list_profiles(skills, candidate_id=candidate_id, page=page, page_size=page_size)
+        
+        return compact_response(ProfilePage(**result), "items", fields, Profile)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/profiles/{profile_id}", response_model=ProfileResponse)
+async def get_profile(profile_id: int):
+    """
+    Get a stored profile
+    """
+    profile = profile_store.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {
+        "status": "success",
+        "profile": profile
+    }
+
+@app.get("/profiles/{profile_id}/matches", response_model=MatchPage)
+async def list_profile_matches(profile_id: int, page: int = 1, page_size: int = 20, fields: Optional[str] = None):
+    """
+    List stored match results of a profile, best score first
+    """
+    try:
+        result = profile_store.list_matches(profile_id, page=page, page_size=page_size)
+        
+        return compact_response(MatchPage(**result), "items", fields, StoredMatch)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/generate-interview-questions")
-async def generate_interview_questions(resume_analysis: ResumeAnalysis):
+async def generate_interview_questions(request: Request, resume_analysis: ResumeAnalysis,
+                                       priority: str = DEFAULT_PRIORITY, x_tenant_id: Optional[str] = Header(None)):
     """
     Generate interview questions based on resume analysis
     """
+    schedule = _schedule(request, priority, x_tenant_id)
     try:
-        questions = resume_analyzer.generate_interview_questions(resume_analysis.dict())
-        questions_data = text_processor.extract_json_from_text(questions)
+        questions = await run_in_threadpool(
+            resume_analyzer.generate_interview_questions, resume_analysis.dict(), **schedule
+        )
         
         return {
             "status": "success",
-            "questions": questions_data.get("questions", [])
+            "questions": questions
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/calculate-match-score")
-async def calculate_match_score(resume_analysis: ResumeAnalysis, job_description: JobDescription):
+@app.post("/interview-questions")
+async def interview_questions(request: Request, resume_analysis: ResumeAnalysis, limit: int = 20,
+                              priority: str = DEFAULT_PRIORITY, x_tenant_id: Optional[str] = Header(None)):
     """
-    Calculate match score between resume and job description
+    Assemble a personalized question set from the precomputed question bank,
+    generating questions only for skills the bank has not seen yet
     """
+    schedule = _schedule(request, priority, x_tenant_id)
     try:
-        # Convert job description to text
-        job_text = f"{job_description.title}\n{job_description.description}\n"
-        job_text += "Required Skills: " + ", ".join(job_description.required_skills)
-        job_text += "\nPreferred Skills: " + ", ".join(job_description.preferred_skills)
-        
-        # Calculate match score
-        match_score = resume_analyzer.calculate_match_score(
-            "\n".join(resume_analysis.experience + resume_analysis.skills),
-            job_text
+        analysis = resume_analysis.dict()
+        result = await run_in_threadpool(
+            question_bank.assemble,
+            analysis,
+            seniority=resume_seniority(analysis),
+            limit=limit,
+            generator=lambda items, seniority: resume_analyzer.generate_questions_for_items(
+                items, seniority, **schedule
+            ),
         )
         
         return {
             "status": "success",
-            "match_score": match_score,
-            "skill_gaps": [skill for skill in job_description.required_skills 
-                         if skill.lower() not in [s.lower() for s in resume_analysis.skills]],
-            "suggestions": [f"Consider learning {skill}" for skill in job_description.required_skills 
-                          if skill.lower() not in [s.lower() for s in resume_analysis.skills]]
+            "questions": result["questions"],
+            "generated_skills": result["generated"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/calculate-match-score", response_model=MatchScoreResponse)
+async def calculate_match_score(resume_analysis: ResumeAnalysis, job_description: Optional[JobDescription] = None,
+                                jd_id: Optional[int] = None):
+    """
+    Calculate match score between resume and job description, given
+    inline or as the id of a stored job description
+    """
+    if job_description is None and jd_id is None:
+        raise HTTPException(status_code=400, detail="Provide job_description or jd_id")
+    job = _resolve_job(None, jd_id) if jd_id is not None else job_description.dict()
+    try:
+        result = await run_in_threadpool(match_scorer.score, resume_analysis.dict(), job)
+        
+        return {
+            "status": "success",
+            "match_score": result["match_score"],
+            "skill_gaps": result["skill_gaps"],
+            "suggestions": result["suggestions"],
+            "matching_skills": result["matching_skills"],
+            "components": result["components"],
+            "years_experience": result["years_experience"],
+            "matching_skill_years": result["matching_skill_years"]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/rank-jobs", response_model=RankJobsResponse)
+async def rank_jobs(resume_analysis: ResumeAnalysis, jobs: List[JobDescription], profile_id: Optional[int] = None,
+                    fields: Optional[str] = None):
+    """
+    Rank job descriptions for a resume by fused match signals; with
+    `profile_id` the results are also stored for that profile
+    """
+    if profile_id is not None and profile_store.get_profile(profile_id) is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    try:
+        ranked = await run_in_threadpool(match_scorer.rank, resume_analysis.dict(), [job.dict() for job in jobs])
+        if profile_id is not None:
+            profile_store.save_matches(profile_id, [
+                (_job_key(jobs[r["index"]].description), jobs[r["index"]].title, r)
+                for r in ranked
+            ])
+        
+        return compact_response(RankJobsResponse(results=ranked), "results", fields, RankedJob)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/applications", response_model=ApplicationResponse)
+async def create_application(application: ApplicationCreate, user_id: str):
+    """
+    Track a job application
+    """
+    try:
+        fields = application.dict()
+        fields["applied_on"] = application.applied_on.isoformat()
+        created = application_store.create(user_id, **fields)
+        
+        return {
+            "status": "success",
+            "application": created
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/applications", response_model=ApplicationPage)
+async def list_applications(user_id: str, status: Optional[str] = None, page: int = 1, page_size: int = 20,
+                            fields: Optional[str] = None):
+    """
+    List tracked applications, newest first
+    """
+    try:
+        result = application_store.list(user_id, status=status, page=page, page_size=page_size)
+        
+        return compact_response(ApplicationPage(**result), "items", fields, Application)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/applications/stats", response_model=ApplicationStats)
+async def application_stats(user_id: str):
+    """
+    Application counts in total and per status
+    """
+    try:
+        return {
+            "status": "success",
+            **application_store.stats(user_id)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/applications/{application_id}", response_model=ApplicationResponse)
+async def get_application(application_id: int, user_id: str):
+    """
+    Get a tracked application
+    """
+    application = application_store.get(user_id, application_id)
+    if application is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return {
+        "status": "success",
+        "application": application
+    }
+
+@app.patch("/applications/{application_id}", response_model=ApplicationResponse)
+async def update_application(application_id: int, changes: ApplicationUpdate, user_id: str):
+    """
+    Update fields of a tracked application
+    """
+    try:
+        fields = changes.dict(exclude_unset=True)
+        if changes.applied_on is not None:
+            fields["applied_on"] = changes.applied_on.isoformat()
+        application = application_store.update(user_id, application_id, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if application is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return {
+        "status": "success",
+        "application": application
+    }
+
+@app.delete("/applications/{application_id}")
+async def delete_application(application_id: int, user_id: str):
+    """
+    Stop tracking an application
+    """
+    if not application_store.delete(user_id, application_id):
+        raise HTTPException(status_code=404, detail="Application not found")
+    return {
+        "status": "success"
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
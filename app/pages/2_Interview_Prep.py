@@ -1,16 +1,14 @@
 import streamlit as st
-import requests
 from typing import Dict, List
 import json
-import os
+import random
+from api_client import APIError, get_client
 
-# API URL from environment variable
-API_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+api_client = get_client()
 
-def generate_interview_questions(resume_analysis: Dict) -> Dict:
-    """Generate interview questions based on resume analysis"""
-    response = requests.post(f"{API_URL}/generate-interview-questions", json=resume_analysis)
-    return response.json()
+# Questions shown per round, and size of the pool they are drawn from
+QUESTIONS_PER_ROUND = 5
+QUESTION_POOL_SIZE = 30
 
 st.markdown("""
     <div style='text-align: center; padding: 2rem 0; background: linear-gradient(135deg, #0d6efd 0%, #0a58ca 100%); border-radius: 12px; margin-bottom: 2rem;'>
@@ -35,11 +33,28 @@ else:
         </div>
     """, unsafe_allow_html=True)
     
+    # The backend returns a pool of questions for the whole profile once;
+    # "Generate New Questions" then just draws a fresh sample from it
+    if st.session_state.get('question_pool_source') != st.session_state.resume_analysis:
+        st.session_state.pop('question_pool', None)
+        st.session_state.pop('interview_questions', None)
+
     if st.button("Generate New Questions"):
-        with st.spinner("🔄 Preparing questions..."):
-            questions = generate_interview_questions(st.session_state.resume_analysis)
-            if questions["status"] == "success":
-                st.session_state.interview_questions = questions["questions"]
+        if not st.session_state.get('question_pool'):
+            with st.spinner("🔄 Preparing questions..."):
+                try:
+                    questions = api_client.generate_interview_questions(
+                        st.session_state.resume_analysis, limit=QUESTION_POOL_SIZE
+                    )
+                except APIError as e:
+                    questions = {"status": "error"}
+                    st.error(f"Could not generate questions: {str(e)}")
+                if questions["status"] == "success":
+                    st.session_state.question_pool = questions["questions"]
+                    st.session_state.question_pool_source = st.session_state.resume_analysis
+        pool = st.session_state.get('question_pool', [])
+        if pool:
+            st.session_state.interview_questions = random.sample(pool, min(QUESTIONS_PER_ROUND, len(pool)))
     
     # Display questions and allow practice
     if 'interview_questions' in st.session_state:
@@ -1,12 +1,23 @@
+import html
 import streamlit as st
-import requests
 from typing import Dict, List
 import json
 from datetime import datetime
-import os
+import uuid
+from api_client import APIError, get_client
 
-# API URL from environment variable
-API_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+api_client = get_client()
+APPLICATIONS_PAGE_SIZE = 20
+APPLICATION_STATUSES = ["Applied", "Phone Screen", "Interview", "Offer", "Rejected"]
+
+def get_user_id() -> str:
+    """Tracker owner id, kept in the URL so applications survive a reload"""
+    params = st.experimental_get_query_params()
+    user_id = params.get("user_id", [None])[0]
+    if not user_id:
+        user_id = uuid.uuid4().hex
+        st.experimental_set_query_params(user_id=user_id)
+    return user_id
 
 st.markdown("""
     <div style='text-align: center; padding: 2rem 0; background: linear-gradient(135deg, #0d6efd 0%, #0a58ca 100%); border-radius: 12px; margin-bottom: 2rem;'>
@@ -17,9 +28,9 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-# Initialize session state for job tracking
-if 'tracked_jobs' not in st.session_state:
-    st.session_state.tracked_jobs = []
+user_id = get_user_id()
+if 'applications_page' not in st.session_state:
+    st.session_state.applications_page = 1
 
 # Job Search Section
 st.markdown("""
@@ -125,58 +136,91 @@ with st.expander("➕ Add New Application"):
         new_job = {
             "company": new_company,
             "position": new_position,
-            "date": new_date.strftime("%Y-%m-%d"),
+            "applied_on": new_date.strftime("%Y-%m-%d"),
             "status": new_status,
             "notes": ""
         }
-        st.session_state.tracked_jobs.append(new_job)
-        st.success("Application added successfully!")
+        try:
+            api_client.add_application(user_id, new_job)
+            st.session_state.applications_page = 1
+            st.success("Application added successfully!")
+        except APIError as e:
+            st.error(f"Could not save the application: {str(e)}")
 
 # Display Tracked Applications
-if st.session_state.tracked_jobs:
-    # Status counts for metrics
-    status_counts = {
-        "Applied": 0,
-        "Interview": 0,
-        "Offer": 0
-    }
-    for job in st.session_state.tracked_jobs:
-        if job["status"] in status_counts:
-            status_counts[job["status"]] += 1
-    
+try:
+    stats = api_client.get_application_stats(user_id)
+except APIError as e:
+    stats = None
+    st.error(f"Could not load applications: {str(e)}")
+
+if stats and stats["total"]:
     # Metrics
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Applications", len(st.session_state.tracked_jobs))
+        st.metric("Total Applications", stats["total"])
     with col2:
-        st.metric("Active Interviews", status_counts["Interview"])
+        st.metric("Active Interviews", stats["by_status"].get("Interview", 0))
     with col3:
-        st.metric("Offers", status_counts["Offer"])
+        st.metric("Offers", stats["by_status"].get("Offer", 0))
+    
+    status_filter = st.selectbox(
+        "Filter by status",
+        ["All"] + APPLICATION_STATUSES,
+        on_change=lambda: st.session_state.update(applications_page=1)
+    )
+    try:
+        applications = api_client.list_applications(
+            user_id,
+            status=None if status_filter == "All" else status_filter,
+            page=st.session_state.applications_page,
+            page_size=APPLICATIONS_PAGE_SIZE
+        )
+    except APIError as e:
+        applications = {"items": [], "total": 0, "page": 1}
+        st.error(f"Could not load applications: {str(e)}")
+    
+    status_color = {
+        "Applied": "#6c757d",
+        "Phone Screen": "#0d6efd",
+        "Interview": "#fb923c",
+        "Offer": "#10b981",
+        "Rejected": "#ef4444"
+    }
     
     # Applications table
-    for job in st.session_state.tracked_jobs:
-        status_color = {
-            "Applied": "#6c757d",
-            "Phone Screen": "#0d6efd",
-            "Interview": "#fb923c",
-            "Offer": "#10b981",
-            "Rejected": "#ef4444"
-        }
-        
+    for job in applications["items"]:
+        color = status_color.get(job["status"], "#6c757d")
         st.markdown(f"""
             <div class='info-card'>
                 <div style='display: flex; justify-content: space-between; align-items: center;'>
                     <div>
-                        <h4 style='margin: 0; color: #1a1f36;'>{job['position']}</h4>
-                        <p style='margin: 4px 0; color: #6c757d;'>{job['company']}</p>
-                        <p style='margin: 0; color: #6c757d; font-size: 0.9em;'>Applied: {job['date']}</p>
+                        <h4 style='margin: 0; color: #1a1f36;'>{html.escape(job['position'])}</h4>
+                        <p style='margin: 4px 0; color: #6c757d;'>{html.escape(job['company'])}</p>
+                        <p style='margin: 0; color: #6c757d; font-size: 0.9em;'>Applied: {html.escape(str(job['applied_on']))}</p>
                     </div>
-                    <div style='background: {status_color.get(job["status"], "#6c757d")}1a; padding: 8px 16px; border-radius: 20px;'>
-                        <span style='color: {status_color.get(job["status"], "#6c757d")}; font-weight: 500;'>{job['status']}</span>
+                    <div style='background: {color}1a; padding: 8px 16px; border-radius: 20px;'>
+                        <span style='color: {color}; font-weight: 500;'>{html.escape(job['status'])}</span>
                     </div>
                 </div>
             </div>
         """, unsafe_allow_html=True)
+    
+    # Pagination
+    pages = max(1, -(-applications["total"] // APPLICATIONS_PAGE_SIZE))
+    if pages > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("← Previous", disabled=applications["page"] <= 1):
+                st.session_state.applications_page = applications["page"] - 1
+                st.rerun()
+        with col2:
+            st.markdown(f"<p style='text-align: center; color: #6c757d;'>Page {applications['page']} of {pages}</p>",
+                        unsafe_allow_html=True)
+        with col3:
+            if st.button("Next →", disabled=applications["page"] >= pages):
+                st.session_state.applications_page = applications["page"] + 1
+                st.rerun()
 
 # Job Search Tips
 with st.expander("💡 Job Search Tips"):
@@ -0,0 +1,175 @@
+from typing import Any, Dict, List, Optional, Set, Type
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# Response models. Endpoints returning lists accept ?fields=a,b to keep only
+# those fields of each item, which keeps large result sets small.
+
+
+class AnalysisData(BaseModel):
+    profile_id: Optional[int] = None
+    skills: List[str]
+    experience: List[str]
+    education: List[str]
+    years_experience: Optional[float] = None
+    highest_degree: Optional[str] = None
+    match_score: float
+    skill_gaps: List[str]
+    improvement_suggestions: List[str]
+
+
+class AnalysisResponse(BaseModel):
+    status: str = "success"
+    message: str = "Resume analysis completed"
+    cached: bool = False
+    data: AnalysisData
+
+
+class Profile(BaseModel):
+    id: int
+    document_id: int
+    candidate_id: Optional[int] = None
+    content_hash: str
+    filename: Optional[str] = None
+    skills: List[str]
+    experience: List[str]
+    education: List[str]
+    created_at: str
+
+
+class ProfileResponse(BaseModel):
+    status: str = "success"
+    profile: Profile
+
+
+class ProfilePage(BaseModel):
+    status: str = "success"
+    items: List[Profile]
+    page: int
+    page_size: int
+    total: int
+
+
+class JobProfile(BaseModel):
+    id: int
+    job_hash: str
+    title: str
+    description: str
+    required_skills: List[str]
+    preferred_skills: List[str]
+    seniority: str
+    min_years: Optional[int] = None
+    summary: str
+    created_at: str
+
+
+class JobProfileResponse(BaseModel):
+    status: str = "success"
+    job: JobProfile
+
+
+class StoredMatch(BaseModel):
+    profile_id: int
+    job_hash: str
+    job_title: Optional[str] = None
+    match_score: float
+    result: Dict[str, Any]
+    created_at: str
+
+
+class MatchPage(BaseModel):
+    status: str = "success"
+    items: List[StoredMatch]
+    page: int
+    page_size: int
+    total: int
+
+
+class MatchScoreResponse(BaseModel):
+    status: str = "success"
+    match_score: float
+    skill_gaps: List[str]
+    suggestions: List[str]
+    matching_skills: List[str]
+    components: Dict[str, Optional[float]]
+    years_experience: Optional[float] = None
+    matching_skill_years: Dict[str, float] = {}
+
+
+class RankedJob(BaseModel):
+    index: int
+    rrf: float
+    match_score: float
+    components: Dict[str, Optional[float]]
+    years_experience: Optional[float] = None
+    matching_skills: List[str]
+    skill_gaps: List[str]
+    missing_preferred_skills: List[str]
+    suggestions: List[str]
+
+
+class RankJobsResponse(BaseModel):
+    status: str = "success"
+    results: List[RankedJob]
+
+
+class Application(BaseModel):
+    id: int
+    company: str
+    position: str
+    status: str
+    applied_on: str
+    notes: str
+    created_at: str
+    updated_at: str
+
+
+class ApplicationResponse(BaseModel):
+    status: str = "success"
+    application: Application
+
+
+class ApplicationPage(BaseModel):
+    status: str = "success"
+    items: List[Application]
+    page: int
+    page_size: int
+    total: int
+
+
+class ApplicationStats(BaseModel):
+    status: str = "success"
+    total: int
+    by_status: Dict[str, int]
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Set[str]]:
+    """Field names from a ?fields= value; None selects every field"""
+    if not fields:
+        return None
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(model.model_fields)}"
+        )
+    return selected
+
+
+def compact_response(response: BaseModel, payload: Optional[str] = None, fields: Optional[str] = None,
+                     item_model: Optional[Type[BaseModel]] = None) -> ORJSONResponse:
+    """
+    Serialize a response model with orjson, keeping only `fields` of the
+    `payload` attribute (a model or a list of models of type `item_model`)
+    """
+    include = None
+    if payload is not None and item_model is not None:
+        selected = parse_fields(fields, item_model)
+        if selected is not None:
+            include = {name: True for name in type(response).model_fields if name != payload}
+            is_list = isinstance(getattr(response, payload), list)
+            include[payload] = {"__all__": selected} if is_list else selected
+    return ORJSONResponse(response.model_dump(include=include))
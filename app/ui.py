@@ -0,0 +1,128 @@
+import html
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+from api_client import APIError, get_client
+
+# Each section is rendered as one HTML block into its own placeholder, so
+# updates replace the section instead of appending dozens of elements
+
+
+def score_color(score: float) -> str:
+    return (
+        "#10b981" if score >= 80 else
+        "#0d6efd" if score >= 60 else
+        "#fb923c" if score >= 40 else
+        "#ef4444"
+    )
+
+
+def match_score_html(match_score: float) -> str:
+    score = match_score * 100
+    return f"""
+        <div class='match-score' style='color: {score_color(score)};'>
+            <div style='font-size: 0.6em; color: #6c757d; margin-bottom: 0.5rem;'>Match Score</div>
+            {score:.1f}%
+        </div>
+    """
+
+
+def tags_html(title: str, items: List[str]) -> str:
+    tags = "".join(f"<span class='skill-tag'>{html.escape(item)}</span>" for item in items)
+    return f"<div class='results-section'><h3>{title}</h3><div style='margin: 1rem 0;'>{tags}</div></div>"
+
+
+def cards_html(title: str, items: List[str], border_color: Optional[str] = None, numbered: bool = False) -> str:
+    style = f" style='border-left-color: {border_color};'" if border_color else ""
+    weight = "font-weight: 500; " if numbered else ""
+    cards = "".join(
+        f"<div class='info-card'{style}><div style='{weight}color: #1a1f36;'>"
+        f"{f'Q{i}. ' if numbered else ''}{html.escape(item)}</div></div>"
+        for i, item in enumerate(items, 1)
+    )
+    return f"<div class='results-section'><h3>{title}</h3>{cards}</div>"
+
+
+def alerts_html(title: str, items: List[str], kind: str) -> str:
+    alerts = "".join(f"<div class='alert alert-{kind}'>{html.escape(item)}</div>" for item in items)
+    return f"<div class='results-section'><h3>{title}</h3>{alerts}</div>"
+
+
+class AnalysisView:
+    """Placeholders for the analysis sections, filled in as results arrive"""
+
+    def __init__(self):
+        self.status = st.empty()
+        self.score = st.empty()
+        self.skills = st.empty()
+        self.experience = st.empty()
+        self.education = st.empty()
+        col_gap, col_sugg = st.columns(2)
+        with col_gap:
+            self.gaps = st.empty()
+        with col_sugg:
+            self.suggestions = st.empty()
+
+    def on_event(self, event: Dict) -> None:
+        """Show progress and the partial profile from an analysis stream event"""
+        if event.get("stage") == "extraction":
+            self.status.progress(
+                event["done"] / max(event["total"], 1),
+                text=f"🔄 Reading your resume ({event['done']}/{event['total']})..."
+            )
+        elif event.get("stage") == "match":
+            self.status.progress(1.0, text="🔄 Matching against the job description...")
+        if event.get("partial"):
+            self.show_profile(event["partial"])
+
+    def show_profile(self, profile: Dict) -> None:
+        self.skills.markdown(tags_html("⚙ Technical Skills", profile.get("skills", [])), unsafe_allow_html=True)
+        self.experience.markdown(cards_html("💻 Experience", profile.get("experience", [])), unsafe_allow_html=True)
+        self.education.markdown(cards_html("🎓 Education", profile.get("education", [])), unsafe_allow_html=True)
+
+    def show(self, data: Dict) -> None:
+        self.status.empty()
+        self.score.markdown(match_score_html(data["match_score"]), unsafe_allow_html=True)
+        self.show_profile(data)
+        self.gaps.markdown(alerts_html("⚠ Skill Gaps", data["skill_gaps"], "warning"), unsafe_allow_html=True)
+        self.suggestions.markdown(
+            alerts_html("💡 Suggestions", data["improvement_suggestions"], "success"), unsafe_allow_html=True
+        )
+
+    def clear(self) -> None:
+        for placeholder in (self.status, self.score, self.skills, self.experience, self.education,
+                            self.gaps, self.suggestions):
+            placeholder.empty()
+
+
+# Finished analyses by (file hash, job description), kept in the session so
+# reruns show them again without uploading the file. Not st.cache_data: the
+# streamed progress writes to placeholders outside the cached call, which
+# Streamlit can't replay on a cache hit.
+ANALYSIS_RESULTS_KEY = "analysis_results"
+MAX_ANALYSIS_RESULTS = 32
+
+
+def show_analysis(file_hash: str, job_description: str, file_name: str, file_type: Optional[str],
+                  file_bytes: bytes) -> Optional[Dict]:
+    """Render the analysis of an upload, streaming partial results the first time"""
+    results = st.session_state.setdefault(ANALYSIS_RESULTS_KEY, {})
+    key = (file_hash, job_description)
+    view = AnalysisView()
+    data = results.get(key)
+    if data is None:
+        view.status.progress(0.0, text="🔄 Processing your resume...")
+        try:
+            data = get_client().analyze_resume_stream(
+                file_name, file_bytes, file_type, job_description or None, on_event=view.on_event
+            )
+        except APIError as e:
+            view.clear()
+            st.error(f"Analysis failed: {str(e)}")
+            return None
+        if len(results) >= MAX_ANALYSIS_RESULTS:
+            results.pop(next(iter(results)))
+        results[key] = data
+    view.show(data)
+    return data
@@ -1,24 +1,48 @@
 import os
 import tempfile
+import zipfile
 from typing import Optional
 from fastapi import UploadFile
 
+from app.utils.limits import LimitExceeded, ResourceLimits, get_limits
+
+# Uploads are copied to disk in pieces of this size
+UPLOAD_READ_SIZE = 1024 * 1024
+# Archive members smaller than this are not checked for their compression ratio
+DOCX_RATIO_MIN_BYTES = 1024 * 1024
+
 class FileProcessor:
     @staticmethod
-    async def save_upload_file(upload_file: UploadFile) -> Optional[str]:
+    async def save_upload_file(upload_file: UploadFile, max_bytes: Optional[int] = None) -> Optional[str]:
         """
-        Save uploaded file to temporary directory and return its path
+        Save uploaded file to temporary directory and return its path. The
+        file is copied in pieces, so memory use doesn't grow with its size;
+        raises LimitExceeded once it is over `max_bytes`.
         """
+        max_bytes = max_bytes or get_limits().max_upload_bytes
+        temp_path = None
         try:
             # Create a temporary file
             suffix = os.path.splitext(upload_file.filename)[1]
             with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-                # Write the uploaded file's content to the temporary file
-                content = await upload_file.read()
-                temp_file.write(content)
-                return temp_file.name
+                temp_path = temp_file.name
+                size = 0
+                while True:
+                    piece = await upload_file.read(UPLOAD_READ_SIZE)
+                    if not piece:
+                        break
+                    size += len(piece)
+                    if size > max_bytes:
+                        raise LimitExceeded("upload_bytes", f"File exceeds {max_bytes} bytes")
+                    temp_file.write(piece)
+                return temp_path
+        except LimitExceeded:
+            FileProcessor.cleanup_file(temp_path)
+            raise
         except Exception as e:
             print(f"Error saving file: {e}")
+            if temp_path:
+                FileProcessor.cleanup_file(temp_path)
             return None
 
     @staticmethod
@@ -45,4 +69,97 @@ class FileProcessor:
         Check if file format is supported
         """
         supported_extensions = {'.pdf', '.docx'}
-        return FileProcessor.get_file_extension(filename) in supported_extensions 
\ No newline at end of file
+        return FileProcessor.get_file_extension(filename) in supported_extensions
+
+    @staticmethod
+    def extract_text(file_path: str, limits: Optional[ResourceLimits] = None) -> str:
+        """
+        Extract text from PDF or DOCX file. Runs in the API worker, so a
+        separate inference process only ever receives plain text. Raises
+        LimitExceeded for files over the page, size or character limits.
+        """
+        limits = limits or get_limits()
+        if file_path.endswith('.pdf'):
+            return FileProcessor._extract_text_from_pdf(file_path, limits)
+        elif file_path.endswith('.docx'):
+            return FileProcessor._extract_text_from_docx(file_path, limits)
+        else:
+            raise ValueError("Unsupported file format")
+
+    @staticmethod
+    def _check_text_length(length: int, limits: ResourceLimits) -> None:
+        if length > limits.max_text_chars:
+            raise LimitExceeded("text_chars", f"Document text exceeds {limits.max_text_chars} characters")
+
+    @staticmethod
+    def _extract_text_from_pdf(file_path: str, limits: ResourceLimits) -> str:
+        """
+        Extract text from PDF file, stopping as soon as a limit is exceeded.
+        Pages without a text layer (scans) are read by OCR when available.
+        """
+        # Imported here: only the parse workers need the PDF and OCR libraries
+        import PyPDF2
+        from app.utils.ocr import get_ocr
+
+        try:
+            with open(file_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                if len(pdf_reader.pages) > limits.max_pdf_pages:
+                    raise LimitExceeded(
+                        "pdf_pages", f"PDF has {len(pdf_reader.pages)} pages; the limit is {limits.max_pdf_pages}"
+                    )
+                pages = []
+                length = 0
+                for page in pdf_reader.pages:
+                    pages.append(page.extract_text() or "")
+                    length += len(pages[-1])
+                    FileProcessor._check_text_length(length, limits)
+                scanned = [i for i, text in enumerate(pages) if not text.strip()]
+                ocr = get_ocr() if scanned else None
+                if ocr is not None:
+                    for i, text in zip(scanned, ocr.read_pages([pdf_reader.pages[i] for i in scanned])):
+                        pages[i] = text
+                        length += len(text)
+                    FileProcessor._check_text_length(length, limits)
+                # Pages on their own lines, so a heading at the top of a page stays a heading
+                return "\n".join(pages).strip()
+        except (LimitExceeded, MemoryError):
+            raise
+        except Exception as e:
+            print(f"Error extracting PDF text: {str(e)}")
+            return ""
+
+    @staticmethod
+    def _check_docx_archive(file_path: str, limits: ResourceLimits) -> None:
+        """
+        Refuse decompression bombs before python-docx inflates the archive:
+        DOCX files are zips, and their declared sizes are checked up front
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            members = archive.infolist()
+        total = sum(member.file_size for member in members)
+        if total > limits.max_docx_bytes:
+            raise LimitExceeded("docx_bytes", f"DOCX expands to {total} bytes; the limit is {limits.max_docx_bytes}")
+        for member in members:
+            if (member.file_size > DOCX_RATIO_MIN_BYTES
+                    and member.file_size > limits.max_docx_ratio * max(member.compress_size, 1)):
+                raise LimitExceeded("docx_ratio", f"DOCX member {member.filename} is compressed suspiciously well")
+
+    @staticmethod
+    def _extract_text_from_docx(file_path: str, limits: ResourceLimits) -> str:
+        """
+        Extract text from DOCX file
+        """
+        from docx import Document
+
+        try:
+            FileProcessor._check_docx_archive(file_path, limits)
+            doc = Document(file_path)
+            text = "\n".join([paragraph.text for paragraph in doc.paragraphs]).strip()
+            FileProcessor._check_text_length(len(text), limits)
+            return text
+        except (LimitExceeded, MemoryError):
+            raise
+        except Exception as e:
+            print(f"Error extracting DOCX text: {str(e)}")
+            return ""
@@ -0,0 +1,132 @@
+from typing import Counter as CounterType, Dict, List, Optional, Tuple
+from collections import Counter
+from functools import lru_cache
+import re
+import sys
+import threading
+
+import numpy as np
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own per same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up upon us very via was we were what when where
+which while who whom why will with within without would you your yours yourself yourselves
+ability able across along among around based including include includes using use used well
+""".split())
+
+# Words with tech punctuation kept intact: c++, c#, node.js, ci/cd
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*")
+
+# (suffix, replacement), checked in order; the first match wins
+_SUFFIX_RULES = (
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"), ("iveness", "ive"),
+    ("sses", "ss"), ("ies", "y"), ("ments", "ment"), ("ings", ""), ("ing", ""),
+    ("edly", ""), ("ed", ""), ("ly", ""), ("s", ""),
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer: engineers/engineering -> engineer, libraries -> library"""
+    if len(word) <= 4 or not word.isalpha():
+        return word
+    for suffix, replacement in _SUFFIX_RULES:
+        if not word.endswith(suffix):
+            continue
+        base = word[:-len(suffix)] + replacement
+        if len(base) < 3:
+            return word
+        if suffix == "s" and word.endswith(("ss", "us", "is")):
+            return word
+        # running -> runn -> run, but keep "install" -> "install"
+        if suffix in ("ing", "ings", "ed") and len(base) > 3 and base[-1] == base[-2] and base[-1] not in "lsz":
+            base = base[:-1]
+        return base
+    return word
+
+
+class Vocabulary:
+    """
+    Shared term <-> integer id mapping so documents can be stored and compared
+    as small integer arrays instead of string lists. Terms are interned. Once
+    `max_size` terms are known, new terms share hashed overflow ids so memory
+    stays bounded in long-running processes.
+    """
+
+    def __init__(self, max_size: int = 1_000_000, overflow_buckets: int = 65536):
+        self.max_size = max_size
+        self.overflow_buckets = overflow_buckets
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def id(self, term: str) -> int:
+        term_id = self._ids.get(term)
+        if term_id is not None:
+            return term_id
+        with self._lock:
+            term_id = self._ids.get(term)
+            if term_id is None:
+                if len(self._terms) >= self.max_size:
+                    return self.max_size + hash(term) % self.overflow_buckets
+                term = sys.intern(term)
+                term_id = len(self._terms)
+                self._ids[term] = term_id
+                self._terms.append(term)
+            return term_id
+
+    def term(self, term_id: int) -> Optional[str]:
+        return self._terms[term_id] if 0 <= term_id < len(self._terms) else None
+
+
+class KeywordExtractor:
+    """
+    Keyword engine: lowercase tokens, stopwords dropped, light stemming, and
+    two-word phrases ("machine learning") from adjacent non-stopword tokens.
+    """
+
+    def __init__(self, vocabulary: Optional[Vocabulary] = None, min_length: int = 2,
+                 phrases: bool = True):
+        self.vocabulary = vocabulary if vocabulary is not None else default_vocabulary
+        self.min_length = min_length
+        self.phrases = phrases
+
+    def tokens(self, text: str) -> List[Optional[str]]:
+        """Stemmed tokens; stopwords become None so they still break phrases"""
+        result = []
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            if token in STOPWORDS or len(token) < self.min_length or token.isdigit():
+                result.append(None)
+            else:
+                result.append(stem(token))
+        return result
+
+    def terms(self, text: str) -> List[str]:
+        """All keyword terms in order, duplicates included (unigrams then phrases)"""
+        tokens = self.tokens(text)
+        terms = [token for token in tokens if token]
+        if self.phrases:
+            terms.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]) if a and b)
+        return terms
+
+    def counts(self, text: str) -> CounterType[str]:
+        return Counter(self.terms(text))
+
+    def encode(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted unique term ids and their counts as int32 arrays"""
+        ids = np.fromiter((self.vocabulary.id(term) for term in self.terms(text)), dtype=np.int32)
+        if not ids.size:
+            return ids, ids
+        unique, counts = np.unique(ids, return_counts=True)
+        return unique.astype(np.int32), counts.astype(np.int32)
+
+
+default_vocabulary = Vocabulary()
+keyword_extractor = KeywordExtractor()
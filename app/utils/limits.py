@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is then omitted
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Environment variable -> default. Every limit bounds the work one upload
+# can cause: bytes read, pages walked, characters parsed, model calls made.
+LIMIT_DEFAULTS = {
+    "HIREFIT_MAX_UPLOAD_BYTES": 10 * 1024 * 1024,
+    "HIREFIT_MAX_PDF_PAGES": 20,
+    "HIREFIT_MAX_TEXT_CHARS": 60_000,
+    "HIREFIT_MAX_CHUNKS": 8,
+    "HIREFIT_MAX_ANALYSIS_SECONDS": 300,
+    "HIREFIT_MAX_DOCX_BYTES": 50 * 1024 * 1024,
+    "HIREFIT_MAX_DOCX_RATIO": 100,
+}
+# Requests slower than this are logged with their resource usage
+SLOW_REQUEST_SECONDS = 10.0
+
+
+class LimitExceeded(Exception):
+    """An upload over one of the resource limits; the API answers 413"""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class ResourceLimits:
+    def __init__(self, max_upload_bytes: int, max_pdf_pages: int, max_text_chars: int, max_chunks: int,
+                 max_analysis_seconds: float, max_docx_bytes: int, max_docx_ratio: float):
+        self.max_upload_bytes = max_upload_bytes
+        self.max_pdf_pages = max_pdf_pages
+        self.max_text_chars = max_text_chars
+        self.max_chunks = max_chunks
+        # Chunks not started within this many seconds are skipped
+        self.max_analysis_seconds = max_analysis_seconds
+        # Total uncompressed size and compression ratio of a DOCX (zip) archive
+        self.max_docx_bytes = max_docx_bytes
+        self.max_docx_ratio = max_docx_ratio
+
+    @classmethod
+    def from_env(cls) -> "ResourceLimits":
+        values = {name: float(os.getenv(name, default)) for name, default in LIMIT_DEFAULTS.items()}
+        return cls(
+            max_upload_bytes=int(values["HIREFIT_MAX_UPLOAD_BYTES"]),
+            max_pdf_pages=int(values["HIREFIT_MAX_PDF_PAGES"]),
+            max_text_chars=int(values["HIREFIT_MAX_TEXT_CHARS"]),
+            max_chunks=int(values["HIREFIT_MAX_CHUNKS"]),
+            max_analysis_seconds=values["HIREFIT_MAX_ANALYSIS_SECONDS"],
+            max_docx_bytes=int(values["HIREFIT_MAX_DOCX_BYTES"]),
+            max_docx_ratio=values["HIREFIT_MAX_DOCX_RATIO"],
+        )
+
+    def as_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+_limits: Optional[ResourceLimits] = None
+
+
+def get_limits() -> ResourceLimits:
+    """Process-wide limits, read from the environment once"""
+    global _limits
+    if _limits is None:
+        _limits = ResourceLimits.from_env()
+    return _limits
+
+
+class UsageStats:
+    """Per-request resource accounting, aggregated for GET /limits"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.body_bytes_max = 0
+        self.seconds_max = 0.0
+        self.rejected: Dict[str, int] = {}
+
+    def record_request(self, body_bytes: int, seconds: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.body_bytes_max = max(self.body_bytes_max, body_bytes)
+            self.seconds_max = max(self.seconds_max, seconds)
+
+    def record_rejection(self, reason: str) -> None:
+        with self._lock:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stats = {
+                "requests": self.requests,
+                "body_bytes_max": self.body_bytes_max,
+                "seconds_max": round(self.seconds_max, 3),
+                "rejected": dict(self.rejected),
+            }
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux
+            stats["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return stats
+
+
+usage_stats = UsageStats()
+
+
+class RequestLimitMiddleware:
+    """
+    Caps request bodies at `max_body_bytes` while they stream in: a larger
+    Content-Length is refused before anything is read, and a body that
+    grows past the cap (chunked uploads) is cut off and answered with 413
+    instead of the handler's response. Records the body size and duration
+    of every request in usage_stats.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: Optional[int] = None):
+        self.app = app
+        self.max_body_bytes = max_body_bytes or get_limits().max_upload_bytes
+
+    async def _reject(self, send: Send) -> None:
+        usage_stats.record_rejection("upload_bytes")
+        body = json.dumps({"detail": f"Request body exceeds {self.max_body_bytes} bytes"}).encode()
+        await send({"type": "http.response.start", "status": 413, "headers": [
+            (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            await self._reject(send)
+            return
+
+        start = time.perf_counter()
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    exceeded = True
+                    # Ends body parsing; the handler's error response is replaced below
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message: Message) -> None:
+            nonlocal started
+            if exceeded:
+                if not started:
+                    started = True
+                    await self._reject(send)
+                return
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except Exception:
+            # A handler failing on the cut-off body still gets the 413
+            if not exceeded:
+                raise
+        finally:
+            elapsed = time.perf_counter() - start
+            usage_stats.record_request(received, elapsed)
+            if elapsed > SLOW_REQUEST_SECONDS:
+                logger.info(f"{scope.get('method')} {scope.get('path')}: {received} body bytes, {elapsed:.1f}s")
+        if exceeded and not started:
+            await self._reject(send)
@@ -0,0 +1,146 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from app.core.storage import SQLiteStore, content_hash
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:  # OCR is optional; image-only PDFs then yield no text
+    pytesseract = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANG = "eng"
+MAX_DEFAULT_WORKERS = 4
+
+
+class OcrCache(SQLiteStore):
+    """Recognized text of page images, keyed by the hash of the image bytes"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS ocr_pages (
+        image_hash TEXT NOT NULL,
+        lang TEXT NOT NULL,
+        text TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (image_hash, lang)
+    );
+    """
+
+    def get_many(self, hashes: Sequence[str], lang: str) -> Dict[str, str]:
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT image_hash, text FROM ocr_pages WHERE lang = ? AND image_hash IN ({placeholders})",
+                [lang, *hashes],
+            ).fetchall()
+        return {row["image_hash"]: row["text"] for row in rows}
+
+    def put_many(self, texts: Dict[str, str], lang: str) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ocr_pages (image_hash, lang, text) VALUES (?, ?, ?)",
+                [(image_hash, lang, text) for image_hash, text in texts.items()],
+            )
+
+
+def page_images(page) -> List[bytes]:
+    """Encoded images of a PyPDF2 page, in page order; a scan is usually one per page"""
+    try:
+        return [image.data for image in page.images]
+    except Exception as e:
+        logger.warning(f"Could not read page images: {str(e)}")
+        return []
+
+
+class PageOcr:
+    """
+    Text for PDF pages without a text layer (scanned resumes), read by a
+    local Tesseract engine on the CPU. Each image runs in its own tesseract
+    process, `workers` at a time, so pages are recognized in parallel; the
+    threads here only wait on those processes. Results are cached by image
+    hash, so a resume uploaded again is not recognized again.
+    """
+
+    def __init__(self, workers: int = MAX_DEFAULT_WORKERS, lang: str = DEFAULT_LANG,
+                 cache: Optional[OcrCache] = None):
+        self.workers = max(1, workers)
+        self.lang = lang
+        self.cache = cache
+        # One engine thread per tesseract process; parallelism comes from the pages
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+    @staticmethod
+    def available() -> bool:
+        if pytesseract is None:
+            return False
+        try:
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def from_env(cls) -> Optional["PageOcr"]:
+        """
+        None when OCR is switched off ($HIREFIT_OCR=0) or pytesseract, Pillow
+        or the tesseract binary is missing
+        """
+        if os.getenv("HIREFIT_OCR", "auto").lower() in ("0", "false", "off"):
+            return None
+        if not cls.available():
+            logger.info("OCR unavailable (needs pytesseract, Pillow and tesseract); scanned PDFs yield no text")
+            return None
+        workers = int(os.getenv("HIREFIT_OCR_WORKERS", min(MAX_DEFAULT_WORKERS, os.cpu_count() or 1)))
+        return cls(workers=workers, lang=os.getenv("HIREFIT_OCR_LANG", DEFAULT_LANG), cache=OcrCache())
+
+    def _recognize(self, data: bytes) -> str:
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                return pytesseract.image_to_string(image, lang=self.lang).strip()
+        except MemoryError:
+            raise
+        except Exception as e:
+            logger.warning(f"OCR failed for a page image: {str(e)}")
+            return ""
+
+    def read_images(self, images: Sequence[bytes]) -> List[str]:
+        """Text of each image, from the cache or recognized in parallel"""
+        hashes = [content_hash(data) for data in images]
+        known = self.cache.get_many(sorted(set(hashes)), self.lang) if self.cache else {}
+        missing = {h: data for h, data in zip(hashes, images) if h not in known}
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as executor:
+                texts = dict(zip(missing, executor.map(self._recognize, missing.values())))
+            if self.cache:
+                self.cache.put_many({h: text for h, text in texts.items() if text}, self.lang)
+            known.update(texts)
+        return [known[h] for h in hashes]
+
+    def read_pages(self, pages: Sequence) -> List[str]:
+        """Text of each PyPDF2 page from its images, all pages' images at once"""
+        page_data = [page_images(page) for page in pages]
+        texts = iter(self.read_images([data for images in page_data for data in images]))
+        return ["\n".join(t for t in (next(texts) for _ in images) if t) for images in page_data]
+
+
+_ocr: Optional[PageOcr] = None
+_ocr_loaded = False
+_ocr_lock = threading.Lock()
+
+
+def get_ocr() -> Optional[PageOcr]:
+    """Process-wide OCR engine, or None when OCR is off or not installed"""
+    global _ocr, _ocr_loaded
+    with _ocr_lock:
+        if not _ocr_loaded:
+            _ocr, _ocr_loaded = PageOcr.from_env(), True
+    return _ocr
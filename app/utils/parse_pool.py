@@ -0,0 +1,197 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional
+
+from app.utils.file_processor import FileProcessor
+from app.utils.limits import LimitExceeded, ResourceLimits, get_limits
+
+try:
+    import resource
+except ImportError:  # no rlimits on Windows; timeouts still apply
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MEMORY_MB = 1024
+DEFAULT_MAX_DOCUMENTS = 100
+
+
+class ParseFailed(Exception):
+    """A document the sandbox gave up on: "timeout", "memory" or "crashed" """
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+def _serve(conn: Connection, memory_bytes: int) -> None:
+    """Worker process: extract text for one path at a time until the pipe closes"""
+    if memory_bytes and resource is not None:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not limit parser memory: {str(e)}")
+    while True:
+        try:
+            file_path, limits = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send(("ok", FileProcessor.extract_text(file_path, limits)))
+        except LimitExceeded as e:
+            conn.send(("limit", e.reason, str(e)))
+        except MemoryError:
+            conn.send(("memory", "Parsing the document ran out of memory"))
+            return  # the heap may be in a bad state; the pool starts a fresh worker
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _Worker:
+    def __init__(self, context, memory_bytes: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn, memory_bytes), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.documents = 0
+
+    def stop(self, kill: bool = False) -> None:
+        self.conn.close()
+        if kill:
+            self.process.kill()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class ParsePool:
+    """
+    Extracts document text in a pool of worker processes, so a malformed
+    PDF that makes PyPDF2 spin or balloon can be killed without holding the
+    API process's GIL or memory. Each document gets a hard wall-clock
+    timeout, workers run under an address space rlimit, and a worker is
+    replaced after `max_documents` documents. Workers start lazily, with
+    the spawn method so they never inherit a loaded model or held locks.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT,
+                 memory_mb: int = DEFAULT_MEMORY_MB, max_documents: int = DEFAULT_MAX_DOCUMENTS):
+        self.size = workers
+        self.timeout = timeout
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self.max_documents = max_documents
+        self._context = multiprocessing.get_context("spawn")
+        self._cond = threading.Condition()
+        self._idle: List[_Worker] = []
+        self._alive = 0
+        self._pid = os.getpid()
+        self._stats = {"documents": 0, "timeouts": 0, "memory_errors": 0, "crashes": 0, "recycles": 0}
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls) -> "ParsePool":
+        return cls(
+            workers=int(os.getenv("HIREFIT_PARSE_WORKERS", DEFAULT_WORKERS)),
+            timeout=float(os.getenv("HIREFIT_PARSE_TIMEOUT", DEFAULT_TIMEOUT)),
+            memory_mb=int(os.getenv("HIREFIT_PARSE_MEMORY_MB", DEFAULT_MEMORY_MB)),
+            max_documents=int(os.getenv("HIREFIT_PARSE_MAX_DOCUMENTS", DEFAULT_MAX_DOCUMENTS)),
+        )
+
+    def _count(self, key: str) -> None:
+        with self._cond:
+            self._stats[key] += 1
+
+    def _checkout(self) -> _Worker:
+        with self._cond:
+            if self._pid != os.getpid():
+                # Workers belong to the process that started them; never share them after fork
+                self._pid, self._idle, self._alive = os.getpid(), [], 0
+            while True:
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.process.is_alive():
+                        return worker
+                    self._alive -= 1  # died while idle
+                if self._alive < self.size:
+                    break
+                self._cond.wait()
+            self._alive += 1
+        try:
+            return _Worker(self._context, self.memory_bytes)
+        except BaseException:
+            self._release(None)
+            raise
+
+    def _release(self, worker: Optional[_Worker], kill: bool = False) -> None:
+        """Return a worker to the pool, or stop it (`worker` None: it never started)"""
+        recycle = worker is not None and not kill and worker.documents >= self.max_documents
+        with self._cond:
+            if worker is not None and not kill and not recycle:
+                self._idle.append(worker)
+            else:
+                self._alive -= 1
+                if recycle:
+                    self._stats["recycles"] += 1
+            self._cond.notify()
+        if worker is not None and (kill or recycle):
+            worker.stop(kill=kill)
+
+    def extract_text(self, file_path: str, limits: Optional[ResourceLimits] = None) -> str:
+        """
+        FileProcessor.extract_text in a worker process. Raises LimitExceeded
+        like the in-process call, and ParseFailed when the worker times out,
+        runs out of memory or dies.
+        """
+        limits = limits or get_limits()
+        if self.size <= 0:
+            return FileProcessor.extract_text(file_path, limits)
+
+        worker = self._checkout()
+        self._count("documents")
+        try:
+            worker.documents += 1
+            worker.conn.send((file_path, limits))
+            if not worker.conn.poll(self.timeout):
+                self._count("timeouts")
+                self._release(worker, kill=True)
+                logger.warning(f"Parsing {file_path} took over {self.timeout}s; worker killed")
+                raise ParseFailed("timeout", f"Parsing the document took longer than {self.timeout:g} seconds")
+            reply = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died mid-document, e.g. killed by the kernel at the rlimit
+            self._count("crashes")
+            self._release(worker, kill=True)
+            raise ParseFailed("crashed", "The document parser crashed on this file")
+
+        status = reply[0]
+        if status == "memory":
+            self._count("memory_errors")
+            self._release(worker, kill=True)
+            raise ParseFailed("memory", reply[1])
+        self._release(worker)
+        if status == "limit":
+            raise LimitExceeded(reply[1], reply[2])
+        if status == "error":
+            raise RuntimeError(reply[1])
+        return reply[1]
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {**self._stats, "workers": self._alive, "idle": len(self._idle), "size": self.size,
+                    "timeout": self.timeout, "max_documents": self.max_documents}
+
+    def close(self) -> None:
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+            idle, self._idle = self._idle, []
+            self._alive -= len(idle)
+        for worker in idle:
+            worker.stop()
@@ -1,13 +1,25 @@
 import re
-from typing import List, Dict
+from typing import List, Dict, Iterable
 import json
+import numpy as np
+from scipy import sparse
+from app.utils.keywords import STOPWORDS, keyword_extractor
+
+SIMILARITY_METRICS = ("jaccard", "cosine", "bm25")
 
 class TextProcessor:
     @staticmethod
-    def clean_text(text: str) -> str:
+    def clean_text(text: str, preserve_lines: bool = False) -> str:
         """
-        Clean and normalize text
+        Clean and normalize text. With preserve_lines, only whitespace within
+        lines is normalized, keeping the line breaks, bullets and date dashes
+        that ResumeParser reads sections and entries from.
         """
+        if preserve_lines:
+            text = re.sub(r'[\x00-\x08\x0b-\x1f\x7f]', '', text)
+            lines = (re.sub(r'[^\S\n]+', ' ', line).strip() for line in text.split('\n'))
+            # Keep single blank lines; they often separate entries
+            return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
         # Remove extra whitespace
         text = re.sub(r'\s+', ' ', text)
         # Remove special characters but keep basic punctuation
@@ -41,24 +53,157 @@ class TextProcessor:
     @staticmethod
     def extract_keywords(text: str, min_length: int = 3) -> List[str]:
         """
-        Extract keywords from text
+        Extract unique keywords from text, in order of first appearance
         """
         # Remove common words and short words
         words = re.findall(r'\b\w+\b', text.lower())
-        return [word for word in words if len(word) >= min_length]
+        return list(dict.fromkeys(
+            word for word in words if len(word) >= min_length and word not in STOPWORDS
+        ))
 
     @staticmethod
     def calculate_similarity(text1: str, text2: str) -> float:
         """
-        Calculate basic text similarity using word overlap
+        Calculate basic text similarity using keyword overlap
         """
-        words1 = set(TextProcessor.extract_keywords(text1))
-        words2 = set(TextProcessor.extract_keywords(text2))
+        ids1, _ = keyword_extractor.encode(text1)
+        ids2, _ = keyword_extractor.encode(text2)
         
-        if not words1 or not words2:
+        if not ids1.size or not ids2.size:
             return 0.0
             
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
+        intersection = np.intersect1d(ids1, ids2, assume_unique=True).size
+        union = ids1.size + ids2.size - intersection
         
-        return intersection / union if union > 0 else 0.0 
\ No newline at end of file
+        return intersection / union if union > 0 else 0.0
+
+    @staticmethod
+    def vectorize(texts: List[str]) -> sparse.csr_matrix:
+        """
+        Tokenize each text once into a sparse term-count matrix (one row per text),
+        with columns indexed by the shared keyword vocabulary
+        """
+        encoded = [keyword_extractor.encode(text) for text in texts]
+        vocabulary = keyword_extractor.vocabulary
+        n_features = vocabulary.max_size + vocabulary.overflow_buckets
+        indptr = np.cumsum([0] + [ids.size for ids, _ in encoded])
+        if encoded:
+            indices = np.concatenate([ids for ids, _ in encoded])
+            data = np.concatenate([counts for _, counts in encoded])
+        else:
+            indices = data = np.zeros(0, dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(texts), n_features))
+
+    @staticmethod
+    def _compact(*matrices: sparse.csr_matrix) -> List[sparse.csr_matrix]:
+        """Re-index columns to only the terms present, keeping per-call arrays small"""
+        used = np.unique(np.concatenate([m.indices for m in matrices]))
+        compacted = []
+        for m in matrices:
+            indices = np.searchsorted(used, m.indices).astype(np.int32)
+            compacted.append(sparse.csr_matrix((m.data, indices, m.indptr), shape=(m.shape[0], used.size)))
+        return compacted
+
+    @staticmethod
+    def _binary(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        binary = matrix.copy()
+        binary.data = np.ones_like(binary.data)
+        return binary
+
+    @staticmethod
+    def _l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Rows scaled to unit length (all-zero rows stay zero)"""
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ matrix
+
+    @staticmethod
+    def _document_frequency(*matrices: sparse.csr_matrix) -> np.ndarray:
+        n_features = matrices[0].shape[1]
+        return sum(np.bincount(m.indices, minlength=n_features) for m in matrices)
+
+    @staticmethod
+    def pairwise_cosine(query: str, documents: List[str]) -> np.ndarray:
+        """
+        TF-IDF cosine of `query` against each document, with the IDF of each
+        pair computed over that pair alone: the same as batch_similarity on
+        ([query], [document]) one document at a time, so a pair scores the
+        same whatever other documents are scored with it. Vectorized: over
+        two texts a term has IDF 1 when both contain it and log(3/2) + 1
+        otherwise, which makes every pair's norms a correction of the
+        plain ones.
+        """
+        if not documents:
+            return np.zeros(0)
+        q_counts, d_counts = TextProcessor._compact(
+            TextProcessor.vectorize([query]), TextProcessor.vectorize(documents)
+        )
+        q = q_counts.toarray().ravel().astype(np.float64)
+        d_counts = d_counts.astype(np.float64)
+        d_binary = TextProcessor._binary(d_counts)
+        d_squared = d_counts.multiply(d_counts).tocsr()
+        unshared_idf_sq = (np.log(1.5) + 1.0) ** 2
+        # Shared terms have IDF 1, so they contribute the raw count products
+        dot = d_counts @ q
+        q_norm_sq = unshared_idf_sq * (q ** 2).sum() - (unshared_idf_sq - 1) * (d_binary @ q ** 2)
+        d_norm_sq = (unshared_idf_sq * np.asarray(d_squared.sum(axis=1)).ravel()
+                     - (unshared_idf_sq - 1) * (d_squared @ (q > 0).astype(np.float64)))
+        norms = np.sqrt(np.maximum(q_norm_sq, 0.0) * np.maximum(d_norm_sq, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(norms > 0, dot / norms, 0.0)
+
+    @staticmethod
+    def batch_similarity(queries: List[str], documents: List[str],
+                         metrics: Iterable[str] = SIMILARITY_METRICS,
+                         k1: float = 1.5, b: float = 0.75) -> Dict[str, np.ndarray]:
+        """
+        Score every query against every document as sparse matrix operations.
+
+        Returns a dict of dense (len(queries), len(documents)) arrays:
+        - jaccard: keyword set overlap, same as calculate_similarity
+        - cosine: TF-IDF cosine, IDF computed over queries and documents
+        - bm25: Okapi BM25 of each query's keywords against the documents
+        """
+        metrics = set(metrics)
+        unknown = metrics - set(SIMILARITY_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown similarity metrics: {sorted(unknown)}")
+
+        q_counts, d_counts = TextProcessor._compact(
+            TextProcessor.vectorize(queries), TextProcessor.vectorize(documents)
+        )
+        q_binary = TextProcessor._binary(q_counts)
+        d_binary = TextProcessor._binary(d_counts)
+        results = {}
+
+        if "jaccard" in metrics:
+            intersection = (q_binary @ d_binary.T).toarray()
+            q_sizes = np.asarray(q_binary.sum(axis=1)).ravel()
+            d_sizes = np.asarray(d_binary.sum(axis=1)).ravel()
+            union = q_sizes[:, None] + d_sizes[None, :] - intersection
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results["jaccard"] = np.where(union > 0, intersection / union, 0.0)
+
+        if "cosine" in metrics:
+            n_docs = q_counts.shape[0] + d_counts.shape[0]
+            df = TextProcessor._document_frequency(q_binary, d_binary)
+            idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+            q_tfidf = TextProcessor._l2_normalize(q_counts.multiply(idf).tocsr())
+            d_tfidf = TextProcessor._l2_normalize(d_counts.multiply(idf).tocsr())
+            results["cosine"] = (q_tfidf @ d_tfidf.T).toarray()
+
+        if "bm25" in metrics:
+            n_docs = d_counts.shape[0]
+            df = TextProcessor._document_frequency(d_binary)
+            idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            lengths = np.asarray(d_counts.sum(axis=1)).ravel()
+            avg_length = lengths.mean() if n_docs else 0.0
+            # Saturated term frequency, computed on the non-zero entries only
+            weights = d_counts.astype(np.float64)
+            row_of_entry = np.repeat(np.arange(n_docs), np.diff(weights.indptr))
+            norm = k1 * (1 - b + b * lengths[row_of_entry] / (avg_length or 1.0))
+            tf = weights.data
+            weights.data = tf * (k1 + 1) / (tf + norm) * idf[weights.indices]
+            results["bm25"] = (q_binary @ weights.T).toarray()
+
+        return results
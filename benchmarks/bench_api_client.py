@@ -0,0 +1,57 @@
+"""
+Per-call overhead of a fresh connection per request vs the pooled frontend
+API client.
+
+Calls the backend's /health endpoint, so the numbers are connection and
+request overhead rather than model time. Point --url at the deployed
+backend to include TLS handshakes and network latency.
+
+Usage:
+    python -m benchmarks.bench_api_client [--url https://hirefit-backend.onrender.com] [--calls 50]
+"""
+import argparse
+import statistics
+import time
+
+import requests
+
+from app.api_client import API_URL, APIClient
+
+
+def timed(call, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=API_URL, help="Backend URL (default: $BACKEND_URL)")
+    parser.add_argument("--calls", type=int, default=50, help="Requests per client")
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+    client = APIClient(url)
+    # Wake the backend and open the pooled connection before timing
+    client.health()
+
+    results = {
+        "fresh connection (requests.get)": timed(lambda: requests.get(f"{url}/health", timeout=30).json(), args.calls),
+        "pooled session (APIClient)": timed(client.health, args.calls),
+    }
+
+    print(f"{args.calls} calls to {url}/health")
+    for label, latencies in results.items():
+        latencies = sorted(latencies)
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        print(f"{label:<34} mean {statistics.mean(latencies) * 1000:8.1f}ms  "
+              f"p50 {statistics.median(latencies) * 1000:8.1f}ms  p95 {p95 * 1000:8.1f}ms")
+    fresh, pooled = (statistics.mean(v) for v in results.values())
+    print(f"{'saved per call':<34} {(fresh - pooled) * 1000:8.1f}ms ({fresh / pooled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
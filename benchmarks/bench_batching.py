@@ -0,0 +1,92 @@
+"""
+Aggregate generation throughput of the continuous batching engine at
+several numbers of concurrent users.
+
+Each user sends skill extraction prompts for the fixed resume set one
+after another; all users share one BatchedEngine, so their prompts are
+decoded together. At 1 user the engine decodes a single sequence, which
+is the unbatched baseline.
+
+Usage:
+    python -m benchmarks.bench_batching --model models/mistral-7b-instruct-v0.1.Q4_K_M.gguf \
+        [--users 1 4 16] [--requests-per-user 2]
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+from app.core.inference import BatchedEngine
+from app.core.resume_analyzer import ResumeAnalyzer
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "resumes.json")
+
+
+def run_users(engine: BatchedEngine, prompts, users: int, requests_per_user: int, max_new_tokens: int):
+    """Run `users` threads; returns (generated tokens, elapsed seconds, request latencies)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def user(index: int):
+        for n in range(requests_per_user):
+            prompt = prompts[(index * requests_per_user + n) % len(prompts)]
+            start = time.perf_counter()
+            engine.generate(prompt, max_new_tokens=max_new_tokens)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    before = engine.stats["generated"]
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return engine.stats["generated"] - before, time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Path to the GGUF model")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests-per-user", type=int, default=2)
+    parser.add_argument("--max-new-tokens", type=int, default=256)
+    parser.add_argument("--n-ctx", type=int, default=1024, help="Context per sequence")
+    parser.add_argument("--data", default=DATA_FILE, help="JSON file with the fixed resume set")
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        resumes = json.load(f)
+
+    # Only the prompt templates and chunking are needed, not a loaded model
+    analyzer = ResumeAnalyzer.__new__(ResumeAnalyzer)
+    analyzer._setup_prompts()
+    prompts = [
+        analyzer.skill_extraction_prompt.format(resume_text=chunk)
+        for resume in resumes
+        for chunk in analyzer._chunk_text(resume["text"])
+    ]
+
+    # Greedy decoding, so every level generates the same tokens per prompt
+    engine = BatchedEngine(args.model, n_ctx=args.n_ctx, max_sequences=max(args.users))
+
+    print(f"{'users':>5} {'tokens':>7} {'seconds':>8} {'tok/s':>8} {'speedup':>8} {'avg batch':>10} {'p50 s':>7}")
+    baseline = None
+    for users in args.users:
+        steps, batched = engine.stats["steps"], engine.stats["sequences_per_step"]
+        tokens, elapsed, latencies = run_users(
+            engine, prompts, users, args.requests_per_user, args.max_new_tokens
+        )
+        steps = engine.stats["steps"] - steps
+        avg_batch = (engine.stats["sequences_per_step"] - batched) / steps if steps else 0.0
+        throughput = tokens / elapsed
+        baseline = baseline or throughput
+        speedup = throughput / baseline if baseline else 0.0
+        print(f"{users:>5} {tokens:>7} {elapsed:>8.1f} {throughput:>8.2f} {speedup:>7.2f}x "
+              f"{avg_batch:>10.2f} {statistics.median(latencies):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Import cost of the API process, from `python -X importtime`.
+
+Imports a module (app.main by default) in a fresh interpreter, then reports
+the wall time, the slowest top-level imports and which heavy libraries got
+loaded. A worker that serves health checks and stored results should not
+import the model stack, and should start in under --budget seconds.
+
+Usage:
+    python -m benchmarks.bench_import_time [--module app.main] [--top 15] [--budget 1.0]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+# Libraries only the code paths that need them should import
+HEAVY_MODULES = ("langchain", "langchain_community", "langchain_core", "ctransformers", "llama_cpp", "torch",
+                 "transformers", "sentence_transformers", "sklearn", "PyPDF2", "docx", "pytesseract", "PIL")
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile(module, runs):
+    """Best wall time over `runs` fresh interpreters, plus the -X importtime rows of the last"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    check = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    with tempfile.TemporaryDirectory() as tmp:
+        # Stores created at import go to a scratch database
+        env = {**os.environ, "HIREFIT_DB_PATH": os.path.join(tmp, "hirefit.db"),
+               "HIREFIT_QUESTION_BANK_PATH": os.path.join(tmp, "question_bank.db")}
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, "-X", "importtime", "-c", check], cwd=root, env=env,
+                                    capture_output=True, text=True, check=True)
+            best = min(best, time.perf_counter() - start)
+    baseline = min(_wall([sys.executable, "-c", "pass"]) for _ in range(runs))
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return best, baseline, rows, loaded
+
+
+def _wall(command):
+    start = time.perf_counter()
+    subprocess.run(command, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list")
+    parser.add_argument("--runs", type=int, default=3, help="Interpreters to start; the fastest counts")
+    parser.add_argument("--budget", type=float, default=1.0, help="Exit 1 when the import takes longer (seconds)")
+    args = parser.parse_args()
+
+    wall, baseline, rows, loaded = profile(args.module, args.runs)
+    # Depth 0 is the module itself and whatever imports it triggers directly at top level
+    top_level = sorted((r for r in rows if r[1] <= 1), key=lambda r: r[3], reverse=True)
+    print(f"import {args.module}: {wall:.3f}s wall ({baseline:.3f}s of it interpreter start-up)")
+    print(f"{'module':<45} {'self ms':>9} {'cumulative ms':>14}")
+    for name, depth, self_us, cumulative_us in top_level[:args.top]:
+        print(f"{'  ' * depth + name:<45} {self_us / 1000:9.1f} {cumulative_us / 1000:14.1f}")
+    print(f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+    if wall > args.budget:
+        print(f"over budget: {wall:.3f}s > {args.budget:.3f}s")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
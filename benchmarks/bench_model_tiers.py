@@ -0,0 +1,79 @@
+"""
+Quality/latency report for analyzer model tier configurations.
+
+Runs the labeled resume set through ResumeAnalyzer once per tier
+configuration and reports skill extraction precision/recall, match
+classification accuracy and wall-clock latency.
+
+Usage:
+    python -m benchmarks.bench_model_tiers [--threshold 0.5]
+
+Set HIREFIT_SMALL_MODEL_PATH to include the small-model configurations.
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List
+
+from app.core.inference import resolve_task_tiers
+from app.core.resume_analyzer import ResumeAnalyzer
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "resumes.json")
+
+CONFIGURATIONS = {
+    "all-large": {"extraction": "large", "merge": "large", "match": "large", "questions": "large"},
+    "rules-extraction": {"extraction": "rules", "merge": "rules", "match": "large", "questions": "large"},
+    "small-extraction": {"extraction": "small", "merge": "rules", "match": "large", "questions": "small"},
+}
+
+
+def skill_scores(predicted: List[str], expected: List[str]) -> Dict[str, float]:
+    predicted_set = {s.strip().lower() for s in predicted}
+    expected_set = {s.strip().lower() for s in expected}
+    hits = len(predicted_set & expected_set)
+    precision = hits / len(predicted_set) if predicted_set else 0.0
+    recall = hits / len(expected_set) if expected_set else 0.0
+    return {"precision": precision, "recall": recall}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=DATA_FILE, help="JSON file with the labeled resume set")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Match score counted as a match")
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        resumes = json.load(f)
+
+    # Load each model once (the small one only if configured) and switch the
+    # routing table between runs
+    analyzer = ResumeAnalyzer(tiers={"questions": "small"})
+
+    print(f"{'configuration':<18} {'precision':>9} {'recall':>7} {'match acc':>9} {'avg s':>7} {'p95 s':>7}")
+    for name, tiers in CONFIGURATIONS.items():
+        if "small" in tiers.values() and "small" not in analyzer.models:
+            print(f"{name:<18} skipped (no small model configured)")
+            continue
+        analyzer.tiers = resolve_task_tiers(tiers)
+
+        latencies, precisions, recalls, correct = [], [], [], 0
+        for resume in resumes:
+            start = time.perf_counter()
+            result = analyzer.analyze_resume(resume["text"], resume["job_description"])
+            latencies.append(time.perf_counter() - start)
+
+            scores = skill_scores(result["basic_info"].get("skills", []), resume["expected_skills"])
+            precisions.append(scores["precision"])
+            recalls.append(scores["recall"])
+            predicted_match = result["match_analysis"]["match_score"] >= args.threshold
+            correct += int(predicted_match == resume["expected_match"])
+
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+        print(f"{name:<18} {sum(precisions) / len(precisions):>9.2f} {sum(recalls) / len(recalls):>7.2f} "
+              f"{correct / len(resumes):>9.2f} {sum(latencies) / len(latencies):>7.2f} {p95:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
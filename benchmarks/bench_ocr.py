@@ -0,0 +1,81 @@
+"""
+OCR throughput for scanned resumes, in pages per second.
+
+Renders the fixture resumes as image-only PDF pages (no text layer, like a
+scan), then reads them with PageOcr at each worker count, and once more
+from a warm cache. Needs pytesseract, Pillow and the tesseract binary.
+
+Usage:
+    python -m benchmarks.bench_ocr [--pages 16] [--workers 1 2 4]
+"""
+import argparse
+import json
+import os
+import tempfile
+import textwrap
+import time
+
+import PyPDF2
+
+from app.utils.ocr import Image, OcrCache, PageOcr
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "resumes.json")
+# US letter at 150 dpi
+PAGE_SIZE = (1275, 1650)
+
+
+def scanned_pdf(resumes, count, path):
+    """A PDF of `count` pages, each one image of a resume's text"""
+    from PIL import ImageDraw
+
+    pages = []
+    for i in range(count):
+        # Different text per page, so no two page images share a cache entry
+        text = f"Page {i + 1}\n\n" + resumes[i % len(resumes)]["text"]
+        image = Image.new("L", PAGE_SIZE, 255)
+        draw = ImageDraw.Draw(image)
+        lines = [wrapped for line in text.splitlines() for wrapped in textwrap.wrap(line, 90) or [""]]
+        draw.multiline_text((80, 80), "\n".join(lines), fill=0, spacing=8)
+        pages.append(image)
+    pages[0].save(path, save_all=True, append_images=pages[1:], resolution=150)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=16, help="Number of scanned pages")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--lang", default="eng")
+    parser.add_argument("--data", default=DATA_FILE)
+    args = parser.parse_args()
+
+    if not PageOcr.available():
+        raise SystemExit("OCR needs pytesseract, Pillow and the tesseract binary")
+    with open(args.data) as f:
+        resumes = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "scanned.pdf")
+        scanned_pdf(resumes, args.pages, pdf_path)
+        pages = PyPDF2.PdfReader(pdf_path).pages
+        print(f"{len(pages)} image-only pages, {os.path.getsize(pdf_path)} bytes, {os.cpu_count()} CPUs")
+
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            texts = PageOcr(workers=workers, lang=args.lang).read_pages(pages)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            chars = sum(len(t) for t in texts)
+            print(f"{f'{workers} worker(s)':<20} {elapsed:8.2f}s {len(pages) / elapsed:8.2f} pages/s "
+                  f"{baseline / elapsed:6.1f}x  ({chars} chars)")
+
+        ocr = PageOcr(workers=max(args.workers), lang=args.lang, cache=OcrCache(os.path.join(tmp, "ocr.db")))
+        ocr.read_pages(pages)
+        start = time.perf_counter()
+        ocr.read_pages(pages)
+        elapsed = time.perf_counter() - start
+        print(f"{'cached':<20} {elapsed:8.2f}s {len(pages) / elapsed:8.2f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Serialization cost and payload size of large profile listings.
+
+Compares FastAPI's default path (jsonable_encoder + json) with the typed
+response models serialized by orjson, with and without ?fields= selection,
+and the size after gzip and brotli.
+
+Usage:
+    python -m benchmarks.bench_serialization [--profiles 5000]
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.rule_extractor import RuleBasedExtractor
+from app.schemas import Profile, ProfilePage, compact_response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "resumes.json")
+
+
+def synthetic_page(resumes, count):
+    extractor = RuleBasedExtractor()
+    extracted = [extractor.extract(r["text"]) for r in resumes]
+    items = [
+        dict(
+            id=i, document_id=i, candidate_id=None, content_hash=f"{i:064x}", filename=f"resume_{i}.pdf",
+            created_at="2024-01-01 00:00:00", **extracted[i % len(extracted)],
+        )
+        for i in range(count)
+    ]
+    return {"items": items, "page": 1, "page_size": count, "total": count}
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=5000, help="Profiles in the listing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data", default=DATA_FILE)
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        resumes = json.load(f)
+    page = synthetic_page(resumes, args.profiles)
+
+    variants = {
+        "default (jsonable_encoder+json)": lambda: json.dumps(jsonable_encoder({"status": "success", **page})).encode(),
+        "typed + orjson": lambda: compact_response(ProfilePage(**page), "items", None, Profile).body,
+        "typed + orjson, fields=id,skills": lambda: compact_response(ProfilePage(**page), "items", "id,skills", Profile).body,
+    }
+
+    print(f"{args.profiles} profiles, best of {args.repeat}")
+    print(f"{'variant':<36} {'serialize':>10} {'raw':>10} {'gzip':>10} {'brotli':>10}")
+    for label, serialize in variants.items():
+        elapsed, body = timed(serialize, args.repeat)
+        gzip_size = len(gzip.compress(body, compresslevel=6))
+        brotli_size = f"{len(brotli.compress(body, quality=4)) / 1024:9.1f}K" if brotli else f"{'n/a':>10}"
+        print(f"{label:<36} {elapsed * 1000:8.1f}ms {len(body) / 1024:9.1f}K {gzip_size / 1024:9.1f}K {brotli_size}")
+
+
+if __name__ == "__main__":
+    main()
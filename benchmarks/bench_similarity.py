@@ -0,0 +1,63 @@
+"""
+Per-pair TextProcessor.calculate_similarity loop vs the sparse batch API.
+
+Scores each fixture resume against N synthetic job descriptions built from
+the fixture vocabulary.
+
+Usage:
+    python -m benchmarks.bench_similarity [--jobs 5000]
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from app.utils.text_processor import TextProcessor
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "resumes.json")
+
+
+def synthetic_jobs(resumes, count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = sorted({word for r in resumes for word in (r["text"] + " " + r["job_description"]).split()})
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(80, 250))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=5000, help="Number of synthetic job descriptions")
+    parser.add_argument("--data", default=DATA_FILE)
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        resumes = json.load(f)
+    resume_texts = [r["text"] for r in resumes]
+    jobs = synthetic_jobs(resumes, args.jobs)
+    pairs = len(resume_texts) * len(jobs)
+
+    start = time.perf_counter()
+    loop_scores = np.array([[TextProcessor.calculate_similarity(r, j) for j in jobs] for r in resume_texts])
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = TextProcessor.batch_similarity(resume_texts, jobs, metrics=["jaccard"])
+    jaccard_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TextProcessor.batch_similarity(resume_texts, jobs)
+    all_time = time.perf_counter() - start
+
+    print(f"{len(resume_texts)} resumes x {len(jobs)} jobs = {pairs} pairs")
+    for label, elapsed in [("per-pair loop (jaccard)", loop_time),
+                           ("batch (jaccard)", jaccard_time),
+                           ("batch (jaccard+cosine+bm25)", all_time)]:
+        print(f"{label:<30} {elapsed:8.3f}s {pairs / elapsed:12.0f} pairs/s")
+    print(f"{'speedup (jaccard)':<30} {loop_time / jaccard_time:8.1f}x")
+    print(f"{'max |loop - batch| jaccard':<30} {np.abs(loop_scores - batch['jaccard']).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare plain greedy decoding against draft-model speculative decoding.
+
+Usage:
+    python -m benchmarks.bench_speculative --target models/mistral-7b-instruct-v0.1.Q4_K_M.gguf \
+        --draft models/<draft>.gguf [--draft-tokens 4]
+"""
+import argparse
+import json
+import os
+import time
+
+from app.core.inference import SpeculativeDecoder, DEFAULT_DRAFT_TOKENS
+from app.core.resume_analyzer import ResumeAnalyzer
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "resumes.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", required=True, help="Path to the target GGUF model")
+    parser.add_argument("--draft", required=True, help="Path to the draft GGUF model")
+    parser.add_argument("--draft-tokens", type=int, default=DEFAULT_DRAFT_TOKENS)
+    parser.add_argument("--max-new-tokens", type=int, default=256)
+    parser.add_argument("--data", default=DATA_FILE, help="JSON file with the fixed resume set")
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        resumes = json.load(f)
+
+    # Only the prompt templates are needed, not a loaded model
+    analyzer = ResumeAnalyzer.__new__(ResumeAnalyzer)
+    analyzer._setup_prompts()
+
+    decoder = SpeculativeDecoder(args.target, args.draft, num_draft_tokens=args.draft_tokens)
+
+    print(f"{'resume':<18} {'plain tok/s':>12} {'spec tok/s':>12} {'speedup':>8} {'equal':>6}")
+    totals = {"plain_time": 0.0, "spec_time": 0.0, "tokens": 0, "equal": 0}
+    for resume in resumes:
+        prompt = analyzer.skill_extraction_prompt.format(resume_text=resume["text"])
+
+        start = time.perf_counter()
+        plain = decoder.generate_plain(prompt, max_new_tokens=args.max_new_tokens)
+        plain_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        spec = decoder.generate(prompt, max_new_tokens=args.max_new_tokens)
+        spec_time = time.perf_counter() - start
+
+        n_tokens = len(decoder.target.tokenize(plain.encode("utf-8"), add_bos=False))
+        equal = plain == spec
+        totals["plain_time"] += plain_time
+        totals["spec_time"] += spec_time
+        totals["tokens"] += n_tokens
+        totals["equal"] += int(equal)
+        print(f"{resume['id']:<18} {n_tokens / plain_time:>12.2f} {n_tokens / spec_time:>12.2f} "
+              f"{plain_time / spec_time:>7.2f}x {str(equal):>6}")
+
+    print()
+    print(f"Aggregate plain:        {totals['tokens'] / totals['plain_time']:.2f} tok/s")
+    print(f"Aggregate speculative:  {totals['tokens'] / totals['spec_time']:.2f} tok/s")
+    print(f"Speedup:                {totals['plain_time'] / totals['spec_time']:.2f}x")
+    print(f"Draft acceptance rate:  {decoder.acceptance_rate():.2%}")
+    print(f"Identical outputs:      {totals['equal']}/{len(resumes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# Multi-process serving: gunicorn -c gunicorn.conf.py app.main:app
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", min(4, multiprocessing.cpu_count())))
+
+# Import app.main once in the master before forking. Without a dedicated
+# inference process (HIREFIT_INFERENCE_ADDRESS) when_ready also loads the
+# model in the master: the GGUF weights are mmap'd and every worker shares
+# those pages, together with the rest of the master's heap, copy-on-write.
+preload_app = True
+
+# The continuous batching engine serves the concurrent requests of one
+# process; forked workers would each hold a copy with its own KV cache.
+# Batching runs in the dedicated inference process instead.
+if int(os.getenv("HIREFIT_BATCH_SEQUENCES", "1")) > 1 and not os.getenv("HIREFIT_INFERENCE_ADDRESS"):
+    raise RuntimeError(
+        "HIREFIT_BATCH_SEQUENCES > 1 needs the dedicated inference process: "
+        "run python -m app.core.inference_server and set HIREFIT_INFERENCE_ADDRESS"
+    )
+
+# Analysis runs the model on CPU and can take minutes
+timeout = int(os.getenv("HIREFIT_WORKER_TIMEOUT", "600"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    # app.main loads a local model lazily; load it here, before the fork,
+    # rather than once in every worker
+    from app.main import resume_analyzer
+    from app.core.scheduler import LazyAnalyzer
+
+    if isinstance(resume_analyzer, LazyAnalyzer):
+        resume_analyzer.load()
+    # Move the preloaded objects out of the GC's reach so collections in the
+    # workers don't write to (and thereby copy) the shared pages
+    gc.freeze()